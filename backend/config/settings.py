@@ -131,6 +131,19 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Simulation
+# Worker processes for batch sims (defaults to the machine's cores) and the
+# batch size below which games are simulated in-process.
+SIM_MAX_WORKERS = int(os.getenv("SIM_MAX_WORKERS", "0")) or os.cpu_count() or 1
+SIM_PARALLEL_MIN_GAMES = int(os.getenv("SIM_PARALLEL_MIN_GAMES", "256"))
+# Games committed per transaction by week/season sims; a rerun resumes after the last committed chunk.
+SIM_CHUNK_SIZE = int(os.getenv("SIM_CHUNK_SIZE", "32"))
+# Seconds a replayed play-by-play (games simulated without stored PlayLog rows) stays cached.
+SIM_PLAY_LOG_CACHE_SECONDS = int(os.getenv("SIM_PLAY_LOG_CACHE_SECONDS", "3600"))
+# Monte Carlo season projections: default iterations and how long a result may be reused.
+SIM_PROJECTION_ITERATIONS = int(os.getenv("SIM_PROJECTION_ITERATIONS", "10000"))
+SIM_PROJECTION_CACHE_SECONDS = int(os.getenv("SIM_PROJECTION_CACHE_SECONDS", "86400"))
+
 # Test settings
 TEST_NON_SERIALIZED_APPS = ["league"]
 
@@ -0,0 +1,156 @@
+"""
+Simulation benchmarks.
+
+``run_benchmarks`` builds synthetic leagues and measures, per league size:
+
+    simulate_game_games_per_sec     one simulate_game call per game
+    simulate_games_games_per_sec    the whole week through simulate_games
+    persist_ms_per_game             persist_sim_result, one game at a time
+    persist_queries_per_game
+    persist_batch_ms                persist_sim_results for the whole week
+    persist_batch_queries
+    week_view_ms                    WeekSimulateView POST, end to end
+    week_view_queries
+
+Timings are the best of ``repeat`` runs. ``compare_results`` flags metrics that
+moved the wrong way against a stored baseline: query counts on any increase,
+timings by more than the tolerance. Only query counts gate: they are the same
+on every machine, while timings depend on the hardware and load the baseline
+was recorded under, so timing changes are reported but don't fail a run.
+"""
+import platform
+import time
+from typing import Dict, Iterable, List
+
+import django
+import numpy as np
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from league.benchmarks.synthetic import build_synthetic_league
+from league.models import Game
+from league.services.simulator import persist_sim_result, persist_sim_results, simulate_game, simulate_games
+from league.views import WeekSimulateView
+
+DEFAULT_SIZES = (8, 16, 32)
+
+HIGHER_IS_BETTER = {"simulate_game_games_per_sec", "simulate_games_games_per_sec"}
+EXACT_METRICS = {"persist_queries_per_game", "persist_batch_queries", "week_view_queries"}
+
+
+def _best_of(repeat: int, func) -> float:
+    best = None
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _reset(week):
+    Game.objects.filter(week=week).update(status="scheduled", home_score=0, away_score=0, winner=None, loser=None)
+
+
+def benchmark_league(team_count: int, repeat: int = 3, seed: int = 0) -> Dict:
+    data = build_synthetic_league(team_count, seed=seed)
+    week, games = data["week"], list(Game.objects.filter(week=data["week"]).select_related("home_team", "away_team"))
+    # Warm the rating snapshots so every run measures steady state
+    simulate_games(games)
+    n_games = len(games)
+    metrics: Dict[str, float] = {"games": n_games}
+
+    elapsed = _best_of(repeat, lambda: [simulate_game(game) for game in games])
+    metrics["simulate_game_games_per_sec"] = round(n_games / elapsed, 1)
+    elapsed = _best_of(repeat, lambda: simulate_games(games))
+    metrics["simulate_games_games_per_sec"] = round(n_games / elapsed, 1)
+
+    results = simulate_games(games)
+    with CaptureQueriesContext(connection) as ctx:
+        elapsed = _best_of(1, lambda: [persist_sim_result(game, result) for game, result in zip(games, results)])
+    metrics["persist_ms_per_game"] = round(elapsed * 1000 / n_games, 3)
+    metrics["persist_queries_per_game"] = round(len(ctx.captured_queries) / n_games, 2)
+
+    pairs = list(zip(games, results))
+    elapsed = _best_of(repeat, lambda: persist_sim_results(pairs))
+    with CaptureQueriesContext(connection) as ctx:
+        persist_sim_results(pairs)
+    metrics["persist_batch_ms"] = round(elapsed * 1000, 3)
+    metrics["persist_batch_queries"] = len(ctx.captured_queries)
+
+    factory = APIRequestFactory()
+    view = WeekSimulateView.as_view()
+    league, season = data["league"], data["season"]
+
+    def post_week() -> float:
+        _reset(week)
+        request = factory.post("/", {}, format="json")
+        force_authenticate(request, user=data["user"])
+        started = time.perf_counter()
+        response = view(request, league_id=league.id, year=season.year, week_number=week.number)
+        elapsed = time.perf_counter() - started
+        assert response.status_code == 200, response.data
+        return elapsed
+
+    metrics["week_view_ms"] = round(min(post_week() for _ in range(max(1, repeat))) * 1000, 3)
+    with CaptureQueriesContext(connection) as ctx:
+        post_week()
+    # The reset UPDATE is not part of the view
+    metrics["week_view_queries"] = len(ctx.captured_queries) - 1
+    return metrics
+
+
+def run_benchmarks(sizes: Iterable[int] = DEFAULT_SIZES, repeat: int = 3, seed: int = 0) -> Dict:
+    """
+    Benchmark each league size. Callers own the transaction (the management
+    command rolls it back so nothing is left behind).
+    """
+    return {
+        "meta": {
+            "created_at": timezone.now().isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "numpy": np.__version__,
+            "database": connection.vendor,
+            "machine": platform.machine(),
+            "repeat": repeat,
+        },
+        "results": {str(size): benchmark_league(size, repeat=repeat, seed=seed) for size in sizes},
+    }
+
+
+def compare_results(current: Dict, baseline: Dict, tolerance: float = 0.25) -> List[Dict]:
+    """
+    Regressions of ``current`` against ``baseline``: rows of size, metric, baseline, current and
+    change, plus ``gating`` (True for query counts, which should fail a run; False for timings).
+    """
+    regressions = []
+    for size, metrics in current.get("results", {}).items():
+        base_metrics = baseline.get("results", {}).get(size)
+        if not base_metrics:
+            continue
+        for metric, value in metrics.items():
+            base = base_metrics.get(metric)
+            if base is None or metric == "games":
+                continue
+            if metric in EXACT_METRICS:
+                regressed = value > base
+            elif metric in HIGHER_IS_BETTER:
+                regressed = value < base * (1 - tolerance)
+            else:
+                regressed = value > base * (1 + tolerance)
+            if regressed:
+                change = (value - base) / base if base else float("inf")
+                regressions.append(
+                    {
+                        "size": size,
+                        "metric": metric,
+                        "baseline": base,
+                        "current": value,
+                        "change": round(change, 3),
+                        "gating": metric in EXACT_METRICS,
+                    }
+                )
+    return regressions
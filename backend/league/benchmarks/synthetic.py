@@ -0,0 +1,74 @@
+"""
+Synthetic leagues for benchmarks: 2 conferences, 4 divisions each, full
+template rosters with seeded ratings and one regular-season week where every
+team plays.
+"""
+import random
+from typing import Dict
+
+from django.contrib.auth import get_user_model
+
+from league.models import Conference, Division, Game, League, Player, Season, Team
+from league.services.ratings import COMPOSITE_FIELDS
+from league.services.rosters import POSITION_BANDS, ROSTER_TEMPLATE
+
+User = get_user_model()
+
+
+def build_synthetic_league(team_count: int, seed: int = 0, year: int = 2025) -> Dict:
+    """
+    Returns {"user", "league", "season", "week", "teams", "games"}; team_count must be even.
+    """
+    if team_count < 2 or team_count % 2:
+        raise ValueError("team_count must be an even number of at least 2")
+    rng = random.Random(seed)
+    user = User.objects.create_user(
+        email=f"bench-{team_count}-{seed}@example.com", password="password123", is_commissioner=True
+    )
+    league = League.objects.create(name=f"Benchmark {team_count}", created_by=user)
+    divisions = []
+    for conf_index in range(2):
+        conference = Conference.objects.create(league=league, name=f"Conference {conf_index + 1}", order=conf_index)
+        for div_index in range(4):
+            divisions.append(
+                Division.objects.create(conference=conference, name=f"Division {div_index + 1}", order=div_index)
+            )
+    teams = [
+        Team.objects.create(
+            league=league,
+            conference=divisions[idx % len(divisions)].conference,
+            division=divisions[idx % len(divisions)],
+            name=f"Bench {idx}",
+            city=f"City {idx}",
+            nickname=f"Nick {idx}",
+            abbreviation=f"B{idx}",
+        )
+        for idx in range(team_count)
+    ]
+    players = []
+    for team in teams:
+        for position, count in ROSTER_TEMPLATE:
+            low, high = POSITION_BANDS.get(position, (60, 80))
+            for slot in range(count):
+                overall = rng.randint(low, high)
+                players.append(
+                    Player(
+                        league=league,
+                        team=team,
+                        first_name=position,
+                        last_name=f"{team.abbreviation}-{slot}",
+                        position=position,
+                        age=rng.randint(22, 32),
+                        overall_rating=overall,
+                        potential_rating=min(95, overall + rng.randint(5, 18)),
+                        **{field: rng.randint(50, 90) for field in COMPOSITE_FIELDS[1:]},
+                    )
+                )
+    Player.objects.bulk_create(players)
+    season = Season.objects.create(league=league, year=year)
+    week = season.weeks.create(number=1, is_playoffs=False)
+    games = Game.objects.bulk_create(
+        [Game(week=week, home_team=teams[idx], away_team=teams[idx + 1]) for idx in range(0, team_count, 2)]
+    )
+    return {"user": user, "league": league, "season": season, "week": week, "teams": teams, "games": games}
+
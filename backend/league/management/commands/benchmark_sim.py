@@ -0,0 +1,61 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from league.benchmarks.runner import DEFAULT_SIZES, compare_results, run_benchmarks
+
+BASELINE_PATH = Path(__file__).resolve().parents[2] / "benchmarks" / "baseline.json"
+
+
+class Command(BaseCommand):
+    help = "Benchmark the simulator on synthetic leagues and compare against the stored baseline"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="League sizes (teams)")
+        parser.add_argument("--repeat", type=int, default=3, help="Runs per timing; the best is kept")
+        parser.add_argument("--output", help="Write results JSON to this path")
+        parser.add_argument("--baseline", default=str(BASELINE_PATH), help="Baseline JSON to compare against")
+        parser.add_argument("--tolerance", type=float, default=0.25, help="Slowdown (fraction) worth reporting")
+        parser.add_argument(
+            "--gate-timings",
+            action="store_true",
+            help="Also fail on timing regressions (only meaningful against a baseline from this machine)",
+        )
+        parser.add_argument("--update-baseline", action="store_true", help="Overwrite the baseline with these results")
+
+    def handle(self, *args, **options):
+        # Everything the benchmark creates is rolled back
+        with transaction.atomic():
+            results = run_benchmarks(options["sizes"], repeat=options["repeat"])
+            transaction.set_rollback(True)
+
+        payload = json.dumps(results, indent=2, sort_keys=True)
+        if options.get("output"):
+            Path(options["output"]).write_text(payload + "\n")
+        for size, metrics in results["results"].items():
+            summary = ", ".join(f"{name}={value}" for name, value in metrics.items())
+            self.stdout.write(f"{size} teams: {summary}")
+
+        baseline_path = Path(options["baseline"])
+        if options.get("update_baseline"):
+            baseline_path.write_text(payload + "\n")
+            self.stdout.write(self.style.SUCCESS(f"Baseline written to {baseline_path}"))
+            return
+        if not baseline_path.exists():
+            self.stdout.write(f"No baseline at {baseline_path}; skipping comparison.")
+            return
+        rows = compare_results(results, json.loads(baseline_path.read_text()), options["tolerance"])
+        regressions = [row for row in rows if row["gating"] or options["gate_timings"]]
+        for row in rows:
+            label, style = ("REGRESSION", self.style.ERROR) if row in regressions else ("SLOWER", self.style.WARNING)
+            self.stdout.write(
+                style(
+                    f"{label} {row['size']} teams {row['metric']}: {row['baseline']} -> {row['current']}"
+                    f" ({row['change']:+.0%})"
+                )
+            )
+        if regressions:
+            raise CommandError(f"{len(regressions)} benchmark regressions against {baseline_path}")
+        self.stdout.write(self.style.SUCCESS("No regressions against baseline"))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from league.models import Season
+from league.services.stats import rebuild_season_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute player and team season stat totals from game stat lines (run after migrating existing leagues)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--league", type=int, help="Only rebuild seasons of this league id")
+        parser.add_argument("--year", type=int, help="Only rebuild seasons of this year")
+
+    def handle(self, *args, **options):
+        seasons = Season.objects.all()
+        if options.get("league"):
+            seasons = seasons.filter(league_id=options["league"])
+        if options.get("year"):
+            seasons = seasons.filter(year=options["year"])
+        total = 0
+        for season in seasons.order_by("league_id", "year"):
+            total += rebuild_season_stats(season)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {total} season stat totals across {seasons.count()} seasons"))
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from league.services.jobs import HEARTBEAT_SECONDS, claim_next, default_worker_id, requeue_stale, run_job
+
+
+class Command(BaseCommand):
+    help = "Run queued league jobs; start several of these for parallel workers"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--worker-id", help="Name recorded on claimed jobs (defaults to host:pid)")
+        parser.add_argument("--once", action="store_true", help="Exit once the queue is empty instead of polling")
+        parser.add_argument("--max-jobs", type=int, help="Exit after running this many jobs")
+        parser.add_argument("--poll", type=float, default=2.0, help="Seconds to sleep when the queue is empty")
+
+    def handle(self, *args, **options):
+        worker_id = options.get("worker_id") or default_worker_id()
+        max_jobs = options.get("max_jobs")
+        ran = 0
+        self.stdout.write(f"Worker {worker_id} started")
+        while max_jobs is None or ran < max_jobs:
+            requeue_stale()
+            job = claim_next(worker_id)
+            if job is None:
+                if options.get("once"):
+                    break
+                time.sleep(options["poll"])
+                continue
+            started = time.perf_counter()
+            job = run_job(job, heartbeat_seconds=HEARTBEAT_SECONDS)
+            ran += 1
+            self.stdout.write(
+                f"{job.kind} job {job.id}: {job.status} in {time.perf_counter() - started:.2f}s"
+                + (f" ({job.error})" if job.error else "")
+            )
+        self.stdout.write(self.style.SUCCESS(f"Worker {worker_id} ran {ran} jobs"))
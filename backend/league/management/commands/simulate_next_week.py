@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from league.models import Season
+from league.services.season_sim import next_regular_weeks, simulate_weeks
+
+
+class Command(BaseCommand):
+    help = "Simulate the next pending regular-season week of every season (or one league) in one parallel batch"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--league", type=int, help="Only sim seasons of this league id")
+        parser.add_argument("--year", type=int, help="Only sim seasons of this year")
+        parser.add_argument("--workers", type=int, help="Worker processes (defaults to SIM_MAX_WORKERS)")
+        parser.add_argument(
+            "--skip-plays",
+            action="store_true",
+            help="Store only scores and stats; play-by-play is replayed from each game's seed on demand",
+        )
+
+    def handle(self, *args, **options):
+        seasons = Season.objects.all()
+        if options.get("league"):
+            seasons = seasons.filter(league_id=options["league"])
+        if options.get("year"):
+            seasons = seasons.filter(year=options["year"])
+        weeks = next_regular_weeks(seasons.order_by("league_id", "year"))
+        if not weeks:
+            self.stdout.write("No scheduled regular-season weeks to simulate.")
+            return
+        started = time.perf_counter()
+        games = simulate_weeks(
+            weeks, max_workers=options.get("workers"), store_plays=not options.get("skip_plays")
+        )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Simulated {len(games)} games across {len(weeks)} weeks in {elapsed:.2f}s"
+            )
+        )
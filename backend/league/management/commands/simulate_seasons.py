@@ -0,0 +1,51 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from league.models import League
+from league.services.season_pipeline import simulate_seasons
+from league.services.sim_engine import DETAIL_LEVELS
+
+
+class Command(BaseCommand):
+    help = "Simulate whole seasons back to back (schedule, regular season, playoffs, rollover) for one league"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--league", type=int, required=True, help="League id")
+        parser.add_argument("--seasons", type=int, default=1, help="Number of seasons to simulate")
+        parser.add_argument("--start-year", type=int, help="First year (defaults to the year after the latest season)")
+        parser.add_argument(
+            "--detail-level",
+            choices=DETAIL_LEVELS,
+            default="full",
+            help="full: plays and stats; stats: box scores only; score: final scores only",
+        )
+        parser.add_argument("--store-plays", action="store_true", help="Store play-by-play instead of replaying it from seeds")
+
+    def handle(self, *args, **options):
+        league = League.objects.filter(pk=options["league"]).first()
+        if league is None:
+            raise CommandError(f"League {options['league']} does not exist")
+        if options["seasons"] < 1:
+            raise CommandError("--seasons must be at least 1")
+
+        def report(season, seconds):
+            self.stdout.write(f"Season {season.year} done in {seconds:.2f}s")
+
+        started = time.perf_counter()
+        try:
+            seasons = simulate_seasons(
+                league,
+                options["seasons"],
+                start_year=options.get("start_year"),
+                store_plays=options.get("store_plays", False),
+                detail_level=options["detail_level"],
+                on_season=report,
+            )
+        except (RuntimeError, ValueError) as exc:
+            raise CommandError(str(exc))
+        elapsed = time.perf_counter() - started
+        rate = len(seasons) / elapsed * 60 if elapsed else 0.0
+        self.stdout.write(
+            self.style.SUCCESS(f"Simulated {len(seasons)} seasons in {elapsed:.2f}s ({rate:.1f} seasons/min)")
+        )
@@ -0,0 +1,44 @@
+# Generated by Django 5.0.6 on 2026-10-17 07:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0020_tradeitem_pick_cash_nullable'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerGameStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.CharField(default='', max_length=5)),
+                ('pass_att', models.IntegerField(default=0)),
+                ('pass_cmp', models.IntegerField(default=0)),
+                ('pass_yds', models.IntegerField(default=0)),
+                ('pass_td', models.IntegerField(default=0)),
+                ('pass_int', models.IntegerField(default=0)),
+                ('rush_att', models.IntegerField(default=0)),
+                ('rush_yds', models.IntegerField(default=0)),
+                ('rush_td', models.IntegerField(default=0)),
+                ('rec', models.IntegerField(default=0)),
+                ('rec_yds', models.IntegerField(default=0)),
+                ('rec_td', models.IntegerField(default=0)),
+                ('tackles', models.IntegerField(default=0)),
+                ('sacks', models.IntegerField(default=0)),
+                ('interceptions', models.IntegerField(default=0)),
+                ('fumbles', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('game', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='player_stats', to='league.game')),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='game_stats', to='league.player')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='player_game_stats', to='league.team')),
+            ],
+            options={
+                'ordering': ['game_id', 'player_id'],
+                'unique_together': {('game', 'player')},
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.0.6 on 2026-10-17 07:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0021_playergamestat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamRatingSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('power', models.FloatField(default=60.0)),
+                ('player_ratings', models.JSONField(blank=True, default=dict)),
+                ('top_players', models.JSONField(blank=True, default=dict)),
+                ('version', models.PositiveIntegerField(default=0)),
+                ('is_stale', models.BooleanField(default=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('team', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='rating_snapshot', to='league.team')),
+            ],
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.0.6 on 2026-10-17 07:12
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0022_teamratingsnapshot'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeasonSimulation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('through_week', models.PositiveIntegerField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='running', max_length=20)),
+                ('weeks_total', models.PositiveIntegerField(default=0)),
+                ('weeks_done', models.PositiveIntegerField(default=0)),
+                ('games_done', models.PositiveIntegerField(default=0)),
+                ('current_week', models.PositiveIntegerField(blank=True, null=True)),
+                ('elapsed_ms', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True, default='')),
+                ('started_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+                ('season', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='simulations', to='league.season')),
+            ],
+            options={
+                'ordering': ['-started_at', '-id'],
+            },
+        ),
+    ]
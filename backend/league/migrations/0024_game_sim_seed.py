@@ -0,0 +1,28 @@
+# Generated by Django 5.0.6 on 2026-10-17 07:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0023_seasonsimulation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='sim_away_power',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='sim_home_power',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='sim_seed',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.0.6 on 2026-10-17 07:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0024_game_sim_seed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='league',
+            name='play_log_format',
+            field=models.CharField(choices=[('rows', 'One row per play'), ('packed', 'Packed per game')], default='rows', max_length=10),
+        ),
+        migrations.CreateModel(
+            name='PackedPlayLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('play_count', models.PositiveIntegerField(default=0)),
+                ('data', models.BinaryField()),
+                ('game', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='packed_plays', to='league.game')),
+            ],
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.0.6 on 2026-10-17 07:26
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0026_job'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(choices=[('game', 'Game'), ('week', 'Week'), ('batch', 'Batch'), ('season', 'Season')], max_length=20)),
+                ('games', models.PositiveIntegerField(default=0)),
+                ('load_ms', models.FloatField(default=0)),
+                ('simulate_ms', models.FloatField(default=0)),
+                ('persist_ms', models.FloatField(default=0)),
+                ('total_ms', models.FloatField(default=0)),
+                ('load_queries', models.PositiveIntegerField(default=0)),
+                ('simulate_queries', models.PositiveIntegerField(default=0)),
+                ('persist_queries', models.PositiveIntegerField(default=0)),
+                ('total_queries', models.PositiveIntegerField(default=0)),
+                ('rows_written', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('league', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='sim_runs', to='league.league')),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+                ('season', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='sim_runs', to='league.season')),
+            ],
+            options={
+                'ordering': ['-created_at', '-id'],
+            },
+        ),
+    ]
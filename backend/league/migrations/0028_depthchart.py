@@ -0,0 +1,30 @@
+# Generated by Django 5.0.6 on 2026-10-17 07:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0027_simrun'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DepthChart',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.CharField(choices=[('QB', 'Quarterback'), ('RB', 'Running Back'), ('WR', 'Wide Receiver'), ('TE', 'Tight End'), ('OL', 'Offensive Line'), ('DL', 'Defensive Line'), ('LB', 'Linebacker'), ('CB', 'Cornerback'), ('S', 'Safety'), ('K', 'Kicker'), ('P', 'Punter')], max_length=3)),
+                ('player_ids', models.JSONField(blank=True, default=list)),
+                ('is_custom', models.BooleanField(default=False)),
+                ('is_stale', models.BooleanField(default=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='depth_charts', to='league.team')),
+            ],
+            options={
+                'ordering': ['team_id', 'position'],
+                'unique_together': {('team', 'position')},
+            },
+        ),
+    ]
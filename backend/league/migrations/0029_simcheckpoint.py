@@ -0,0 +1,33 @@
+# Generated by Django 5.0.6 on 2026-10-17 07:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0028_depthchart'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='running', max_length=20)),
+                ('chunk_size', models.PositiveIntegerField(default=0)),
+                ('games_total', models.PositiveIntegerField(default=0)),
+                ('games_done', models.PositiveIntegerField(default=0)),
+                ('done_game_ids', models.JSONField(blank=True, default=list)),
+                ('attempts', models.PositiveIntegerField(default=1)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('week', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sim_checkpoints', to='league.week')),
+            ],
+            options={
+                'ordering': ['-created_at', '-id'],
+            },
+        ),
+    ]
@@ -0,0 +1,82 @@
+# Generated by Django 5.0.6 on 2026-10-17 07:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def rebuild_records(apps, schema_editor):
+    # Existing results would otherwise read as empty standings until rebuild_standings ran. Uses the
+    # historical models (the same rules as services.standings, frozen here) so later schema changes
+    # can't break it.
+    Game = apps.get_model("league", "Game")
+    Team = apps.get_model("league", "Team")
+    TeamSeasonRecord = apps.get_model("league", "TeamSeasonRecord")
+
+    teams = {
+        team_id: (division_id, conference_id)
+        for team_id, division_id, conference_id in Team.objects.values_list("id", "division_id", "conference_id")
+    }
+    records = {}
+    games = Game.objects.filter(week__is_playoffs=False, status="completed").values_list(
+        "week__season_id", "home_team_id", "away_team_id", "home_score", "away_score"
+    )
+    for season_id, home, away, home_score, away_score in games.iterator():
+        home_score, away_score = home_score or 0, away_score or 0
+        same_division = teams[home][0] == teams[away][0]
+        same_conference = teams[home][1] == teams[away][1]
+        sides = ((home, "home", home_score, away_score), (away, "away", away_score, home_score))
+        for team_id, side, scored, allowed in sides:
+            outcome = "wins" if scored > allowed else "losses" if scored < allowed else "ties"
+            record = records.get((season_id, team_id))
+            if record is None:
+                record = records[(season_id, team_id)] = TeamSeasonRecord(season_id=season_id, team_id=team_id)
+            for field in (outcome, f"{side}_{outcome}"):
+                setattr(record, field, getattr(record, field) + 1)
+            record.points_for += scored
+            record.points_against += allowed
+            if same_division:
+                setattr(record, f"division_{outcome}", getattr(record, f"division_{outcome}") + 1)
+            if same_conference:
+                setattr(record, f"conference_{outcome}", getattr(record, f"conference_{outcome}") + 1)
+    TeamSeasonRecord.objects.bulk_create(records.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0029_simcheckpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamSeasonRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('wins', models.PositiveIntegerField(default=0)),
+                ('losses', models.PositiveIntegerField(default=0)),
+                ('ties', models.PositiveIntegerField(default=0)),
+                ('points_for', models.PositiveIntegerField(default=0)),
+                ('points_against', models.PositiveIntegerField(default=0)),
+                ('home_wins', models.PositiveIntegerField(default=0)),
+                ('home_losses', models.PositiveIntegerField(default=0)),
+                ('home_ties', models.PositiveIntegerField(default=0)),
+                ('away_wins', models.PositiveIntegerField(default=0)),
+                ('away_losses', models.PositiveIntegerField(default=0)),
+                ('away_ties', models.PositiveIntegerField(default=0)),
+                ('division_wins', models.PositiveIntegerField(default=0)),
+                ('division_losses', models.PositiveIntegerField(default=0)),
+                ('division_ties', models.PositiveIntegerField(default=0)),
+                ('conference_wins', models.PositiveIntegerField(default=0)),
+                ('conference_losses', models.PositiveIntegerField(default=0)),
+                ('conference_ties', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('season', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='team_records', to='league.season')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='season_records', to='league.team')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['season', 'wins', 'points_for'], name='league_team_season__090b33_idx')],
+                'unique_together': {('season', 'team')},
+            },
+        ),
+        migrations.RunPython(rebuild_records, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.0.6 on 2026-10-17 08:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0030_teamseasonrecord'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayoffSeed',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('conference', models.CharField(blank=True, default='', max_length=100)),
+                ('seed', models.PositiveSmallIntegerField()),
+                ('wins', models.PositiveIntegerField(default=0)),
+                ('losses', models.PositiveIntegerField(default=0)),
+                ('ties', models.PositiveIntegerField(default=0)),
+                ('points_for', models.PositiveIntegerField(default=0)),
+                ('points_against', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('season', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='playoff_seeds', to='league.season')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='playoff_seeds', to='league.team')),
+            ],
+            options={
+                'ordering': ['conference', 'seed'],
+                'unique_together': {('season', 'conference', 'seed'), ('season', 'team')},
+            },
+        ),
+        migrations.CreateModel(
+            name='PlayoffMatchup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('round', models.PositiveSmallIntegerField()),
+                ('round_name', models.CharField(max_length=30)),
+                ('conference', models.CharField(blank=True, default='', max_length=100)),
+                ('slot', models.PositiveSmallIntegerField(default=0)),
+                ('status', models.CharField(choices=[('scheduled', 'Scheduled'), ('completed', 'Completed'), ('bye', 'Bye')], default='scheduled', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('game', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='playoff_matchup', to='league.game')),
+                ('season', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='playoff_matchups', to='league.season')),
+                ('higher_seed', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='league.playoffseed')),
+                ('lower_seed', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='league.playoffseed')),
+                ('winner', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='league.playoffseed')),
+            ],
+            options={
+                'ordering': ['round', 'conference', 'slot'],
+                'unique_together': {('season', 'round', 'conference', 'slot')},
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.0.6 on 2026-10-17 08:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0031_playoff_bracket'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='league',
+            name='playoff_format',
+            field=models.CharField(choices=[('conference-6', '6 seeds per conference'), ('conference-7', '7 seeds per conference'), ('conference-8', '8 seeds per conference'), ('league-12', '12 seeds league-wide'), ('custom', 'Custom')], default='conference-7', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='league',
+            name='playoff_format_options',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='season',
+            name='playoff_plan',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,125 @@
+# Generated by Django 5.0.6 on 2026-10-17 08:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, F, Max, Sum, Window
+
+
+TEAM_STAT_FIELDS = ["total_yards", "pass_yards", "rush_yards", "turnovers"]
+PLAYER_STAT_FIELDS = [
+    "pass_att",
+    "pass_cmp",
+    "pass_yds",
+    "pass_td",
+    "pass_int",
+    "rush_att",
+    "rush_yds",
+    "rush_td",
+    "rec",
+    "rec_yds",
+    "rec_td",
+    "tackles",
+    "sacks",
+    "interceptions",
+    "fumbles",
+]
+
+
+def rebuild_totals(apps, schema_editor):
+    # Existing game stat lines would otherwise be missing from the season totals. Uses the historical
+    # models (the same rules as services.stats, frozen here) so later schema changes can't break it.
+    TeamGameStat = apps.get_model("league", "TeamGameStat")
+    PlayerGameStat = apps.get_model("league", "PlayerGameStat")
+    TeamSeasonStat = apps.get_model("league", "TeamSeasonStat")
+    PlayerSeasonStat = apps.get_model("league", "PlayerSeasonStat")
+
+    season = F("game__week__season_id")
+    team_rows = (
+        TeamGameStat.objects.values("team_id", season_id=season)
+        .order_by()
+        .annotate(games=Count("id"), **{field: Sum(field) for field in TEAM_STAT_FIELDS})
+    )
+    TeamSeasonStat.objects.bulk_create((TeamSeasonStat(**row) for row in team_rows), batch_size=500)
+
+    # A player's total carries the position from their latest game's line (highest game id)
+    positions = {
+        (row["season_id"], row["player_id"], row["team_id"]): row["position"]
+        for row in PlayerGameStat.objects.annotate(
+            season_id=season,
+            latest_game=Window(Max("game_id"), partition_by=[F("player_id"), F("team_id"), F("season_id")]),
+        )
+        .filter(game_id=F("latest_game"))
+        .values("season_id", "player_id", "team_id", "position")
+    }
+    player_rows = (
+        PlayerGameStat.objects.values("player_id", "team_id", season_id=season)
+        .order_by()
+        .annotate(games=Count("id"), **{field: Sum(field) for field in PLAYER_STAT_FIELDS})
+    )
+    PlayerSeasonStat.objects.bulk_create(
+        (
+            PlayerSeasonStat(position=positions.get((row["season_id"], row["player_id"], row["team_id"]), ""), **row)
+            for row in player_rows
+        ),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0032_playoff_formats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerSeasonStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.CharField(default='', max_length=5)),
+                ('games', models.PositiveIntegerField(default=0)),
+                ('pass_att', models.IntegerField(default=0)),
+                ('pass_cmp', models.IntegerField(default=0)),
+                ('pass_yds', models.IntegerField(default=0)),
+                ('pass_td', models.IntegerField(default=0)),
+                ('pass_int', models.IntegerField(default=0)),
+                ('rush_att', models.IntegerField(default=0)),
+                ('rush_yds', models.IntegerField(default=0)),
+                ('rush_td', models.IntegerField(default=0)),
+                ('rec', models.IntegerField(default=0)),
+                ('rec_yds', models.IntegerField(default=0)),
+                ('rec_td', models.IntegerField(default=0)),
+                ('tackles', models.IntegerField(default=0)),
+                ('sacks', models.IntegerField(default=0)),
+                ('interceptions', models.IntegerField(default=0)),
+                ('fumbles', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='season_stats', to='league.player')),
+                ('season', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='player_stat_totals', to='league.season')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='player_season_stats', to='league.team')),
+            ],
+            options={
+                'ordering': ['season_id', 'player_id', 'team_id'],
+                'unique_together': {('season', 'player', 'team')},
+            },
+        ),
+        migrations.CreateModel(
+            name='TeamSeasonStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('games', models.PositiveIntegerField(default=0)),
+                ('total_yards', models.IntegerField(default=0)),
+                ('pass_yards', models.IntegerField(default=0)),
+                ('rush_yards', models.IntegerField(default=0)),
+                ('turnovers', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('season', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='team_stat_totals', to='league.season')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='season_stats', to='league.team')),
+            ],
+            options={
+                'ordering': ['season_id', 'team_id'],
+                'unique_together': {('season', 'team')},
+            },
+        ),
+        migrations.RunPython(rebuild_totals, migrations.RunPython.noop),
+    ]
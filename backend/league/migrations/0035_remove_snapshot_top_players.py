@@ -0,0 +1,17 @@
+# Generated by Django 5.0.6 on 2026-10-17 08:30
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0034_job_heartbeat'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='teamratingsnapshot',
+            name='top_players',
+        ),
+    ]
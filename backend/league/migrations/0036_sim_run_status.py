@@ -0,0 +1,23 @@
+# Generated by Django 5.0.6 on 2026-10-17 09:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0035_remove_snapshot_top_players'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='simrun',
+            name='error',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='simrun',
+            name='status',
+            field=models.CharField(choices=[('completed', 'Completed'), ('failed', 'Failed')], default='completed', max_length=20),
+        ),
+    ]
@@ -21,6 +21,24 @@ class League(models.Model):
     allow_cap_growth = models.BooleanField(default=False)
     allow_playoff_expansion = models.BooleanField(default=False)
     enable_realignment = models.BooleanField(default=True)
+    play_log_format = models.CharField(
+        max_length=10,
+        choices=[("rows", "One row per play"), ("packed", "Packed per game")],
+        default="rows",
+    )
+    playoff_format = models.CharField(
+        max_length=20,
+        choices=[
+            ("conference-6", "6 seeds per conference"),
+            ("conference-7", "7 seeds per conference"),
+            ("conference-8", "8 seeds per conference"),
+            ("league-12", "12 seeds league-wide"),
+            ("custom", "Custom"),
+        ],
+        default="conference-7",
+    )
+    # For the custom format: seeds, by_conference, reseed and optionally byes
+    playoff_format_options = models.JSONField(default=dict, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -99,6 +117,8 @@ class Team(models.Model):
 class Season(models.Model):
     league = models.ForeignKey(League, on_delete=models.CASCADE, related_name="seasons")
     year = models.IntegerField()
+    # Compiled once when the playoff bracket is drawn (see services.playoff_formats)
+    playoff_plan = models.JSONField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -136,6 +156,10 @@ class Game(models.Model):
     scheduled_at = models.DateTimeField(null=True, blank=True)
     winner = models.ForeignKey(Team, null=True, blank=True, on_delete=models.SET_NULL, related_name="wins")
     loser = models.ForeignKey(Team, null=True, blank=True, on_delete=models.SET_NULL, related_name="losses")
+    # RNG seed and the team powers the game was simulated with; enough to replay its plays exactly
+    sim_seed = models.BigIntegerField(null=True, blank=True)
+    sim_home_power = models.FloatField(null=True, blank=True)
+    sim_away_power = models.FloatField(null=True, blank=True)
 
     class Meta:
         ordering = ["week_id", "id"]
@@ -363,6 +387,19 @@ class PlayLog(models.Model):
         return f"{self.game} play {self.play_index}"
 
 
+class PackedPlayLog(models.Model):
+    """
+    A game's whole play-by-play as one compressed columnar blob (see services.play_codec).
+    """
+
+    game = models.OneToOneField(Game, on_delete=models.CASCADE, related_name="packed_plays")
+    play_count = models.PositiveIntegerField(default=0)
+    data = models.BinaryField()
+
+    def __str__(self):
+        return f"{self.game} packed plays ({self.play_count})"
+
+
 class TeamGameStat(models.Model):
     game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name="team_stats")
     team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="game_stats")
@@ -410,6 +447,65 @@ class PlayerGameStat(models.Model):
         return f"{self.player} stats for {self.game}"
 
 
+class TeamSeasonStat(models.Model):
+    """
+    Season totals of a team's game stats, kept in step with TeamGameStat writes
+    (see services.stats.apply_stat_changes).
+    """
+
+    season = models.ForeignKey(Season, on_delete=models.CASCADE, related_name="team_stat_totals")
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="season_stats")
+    games = models.PositiveIntegerField(default=0)
+    total_yards = models.IntegerField(default=0)
+    pass_yards = models.IntegerField(default=0)
+    rush_yards = models.IntegerField(default=0)
+    turnovers = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("season", "team")
+        ordering = ["season_id", "team_id"]
+
+    def __str__(self):
+        return f"{self.team} stats for {self.season.year}"
+
+
+class PlayerSeasonStat(models.Model):
+    """
+    Season totals of a player's game stats per team played for, kept in step
+    with PlayerGameStat writes (see services.stats.apply_stat_changes).
+    """
+
+    season = models.ForeignKey(Season, on_delete=models.CASCADE, related_name="player_stat_totals")
+    player = models.ForeignKey(Player, on_delete=models.CASCADE, related_name="season_stats")
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="player_season_stats")
+    position = models.CharField(max_length=5, default="")
+    games = models.PositiveIntegerField(default=0)
+    pass_att = models.IntegerField(default=0)
+    pass_cmp = models.IntegerField(default=0)
+    pass_yds = models.IntegerField(default=0)
+    pass_td = models.IntegerField(default=0)
+    pass_int = models.IntegerField(default=0)
+    rush_att = models.IntegerField(default=0)
+    rush_yds = models.IntegerField(default=0)
+    rush_td = models.IntegerField(default=0)
+    rec = models.IntegerField(default=0)
+    rec_yds = models.IntegerField(default=0)
+    rec_td = models.IntegerField(default=0)
+    tackles = models.IntegerField(default=0)
+    sacks = models.IntegerField(default=0)
+    interceptions = models.IntegerField(default=0)
+    fumbles = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("season", "player", "team")
+        ordering = ["season_id", "player_id", "team_id"]
+
+    def __str__(self):
+        return f"{self.player} stats for {self.season.year}"
+
+
 class ByeWeek(models.Model):
     season = models.ForeignKey(Season, on_delete=models.CASCADE, related_name="byes")
     team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="byes")
@@ -502,3 +598,269 @@ class WaiverClaim(models.Model):
 
     def __str__(self):
         return f"Waiver {self.player} ({self.status})"
+
+
+class TeamRatingSnapshot(models.Model):
+    team = models.OneToOneField(Team, on_delete=models.CASCADE, related_name="rating_snapshot")
+    power = models.FloatField(default=60.0)
+    player_ratings = models.JSONField(default=dict, blank=True)
+    version = models.PositiveIntegerField(default=0)
+    is_stale = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.team} ratings v{self.version}"
+
+
+class DepthChart(models.Model):
+    """
+    Ordered starters/backups for one team and position. Auto-generated from the
+    roster (healthy, non-IR players by rating); ``is_custom`` keeps an owner's order.
+    """
+
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="depth_charts")
+    position = models.CharField(max_length=3, choices=Player.POSITION_CHOICES)
+    player_ids = models.JSONField(default=list, blank=True)
+    is_custom = models.BooleanField(default=False)
+    is_stale = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("team", "position")
+        ordering = ["team_id", "position"]
+
+    def __str__(self):
+        return f"{self.team} {self.position} depth chart"
+
+
+class SeasonSimulation(models.Model):
+    STATUS_CHOICES = [
+        ("running", "Running"),
+        ("completed", "Completed"),
+        ("failed", "Failed"),
+    ]
+
+    season = models.ForeignKey(Season, on_delete=models.CASCADE, related_name="simulations")
+    requested_by = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL)
+    through_week = models.PositiveIntegerField(null=True, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="running")
+    weeks_total = models.PositiveIntegerField(default=0)
+    weeks_done = models.PositiveIntegerField(default=0)
+    games_done = models.PositiveIntegerField(default=0)
+    current_week = models.PositiveIntegerField(null=True, blank=True)
+    elapsed_ms = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, default="")
+    started_at = models.DateTimeField(default=timezone.now)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-started_at", "-id"]
+
+    def __str__(self):
+        return f"{self.season} sim ({self.status}, {self.weeks_done}/{self.weeks_total} weeks)"
+
+
+class Job(models.Model):
+    """
+    A long-running league operation queued for a ``run_jobs`` worker.
+    """
+
+    STATUS_CHOICES = [
+        ("queued", "Queued"),
+        ("running", "Running"),
+        ("completed", "Completed"),
+        ("failed", "Failed"),
+    ]
+
+    kind = models.CharField(max_length=50)
+    league = models.ForeignKey(League, null=True, blank=True, on_delete=models.CASCADE, related_name="jobs")
+    requested_by = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="queued")
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    progress_done = models.PositiveIntegerField(default=0)
+    progress_total = models.PositiveIntegerField(default=0)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True, default="")
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True, default="")
+    locked_at = models.DateTimeField(null=True, blank=True)
+    # Refreshed by the worker while the handler runs; a stale heartbeat means the worker is gone
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+        indexes = [models.Index(fields=["status", "run_after"])]
+
+    def __str__(self):
+        return f"{self.kind} job {self.pk} ({self.status})"
+
+
+class SimRun(models.Model):
+    """
+    Timing and query counts for one simulation call, split by phase.
+    """
+
+    SCOPE_CHOICES = [
+        ("game", "Game"),
+        ("week", "Week"),
+        ("batch", "Batch"),
+        ("season", "Season"),
+    ]
+    STATUS_CHOICES = [
+        ("completed", "Completed"),
+        ("failed", "Failed"),
+    ]
+
+    league = models.ForeignKey(League, null=True, blank=True, on_delete=models.CASCADE, related_name="sim_runs")
+    season = models.ForeignKey(Season, null=True, blank=True, on_delete=models.CASCADE, related_name="sim_runs")
+    requested_by = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL)
+    scope = models.CharField(max_length=20, choices=SCOPE_CHOICES)
+    games = models.PositiveIntegerField(default=0)
+    load_ms = models.FloatField(default=0)
+    simulate_ms = models.FloatField(default=0)
+    persist_ms = models.FloatField(default=0)
+    total_ms = models.FloatField(default=0)
+    load_queries = models.PositiveIntegerField(default=0)
+    simulate_queries = models.PositiveIntegerField(default=0)
+    persist_queries = models.PositiveIntegerField(default=0)
+    total_queries = models.PositiveIntegerField(default=0)
+    rows_written = models.PositiveIntegerField(default=0)
+    # A failed sim keeps the phase timings it reached
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="completed")
+    error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+
+    def __str__(self):
+        return f"{self.scope} sim run ({self.games} games, {self.total_ms:.0f} ms)"
+
+
+class SimCheckpoint(models.Model):
+    """
+    Progress of a chunked week sim: which games are already committed, so a
+    rerun after a failure only sims the rest.
+    """
+
+    STATUS_CHOICES = [
+        ("running", "Running"),
+        ("completed", "Completed"),
+        ("failed", "Failed"),
+    ]
+
+    week = models.ForeignKey(Week, on_delete=models.CASCADE, related_name="sim_checkpoints")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="running")
+    chunk_size = models.PositiveIntegerField(default=0)
+    games_total = models.PositiveIntegerField(default=0)
+    games_done = models.PositiveIntegerField(default=0)
+    done_game_ids = models.JSONField(default=list, blank=True)
+    attempts = models.PositiveIntegerField(default=1)
+    error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+
+    def __str__(self):
+        return f"{self.week} checkpoint ({self.status}, {self.games_done}/{self.games_total})"
+
+
+class TeamSeasonRecord(models.Model):
+    """
+    Materialized regular-season record for one team, kept in step with game
+    results (see services.standings.apply_game_changes).
+    """
+
+    season = models.ForeignKey(Season, on_delete=models.CASCADE, related_name="team_records")
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="season_records")
+    wins = models.PositiveIntegerField(default=0)
+    losses = models.PositiveIntegerField(default=0)
+    ties = models.PositiveIntegerField(default=0)
+    points_for = models.PositiveIntegerField(default=0)
+    points_against = models.PositiveIntegerField(default=0)
+    home_wins = models.PositiveIntegerField(default=0)
+    home_losses = models.PositiveIntegerField(default=0)
+    home_ties = models.PositiveIntegerField(default=0)
+    away_wins = models.PositiveIntegerField(default=0)
+    away_losses = models.PositiveIntegerField(default=0)
+    away_ties = models.PositiveIntegerField(default=0)
+    division_wins = models.PositiveIntegerField(default=0)
+    division_losses = models.PositiveIntegerField(default=0)
+    division_ties = models.PositiveIntegerField(default=0)
+    conference_wins = models.PositiveIntegerField(default=0)
+    conference_losses = models.PositiveIntegerField(default=0)
+    conference_ties = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("season", "team")
+        indexes = [models.Index(fields=["season", "wins", "points_for"])]
+
+    def __str__(self):
+        return f"{self.team} {self.season.year}: {self.wins}-{self.losses}-{self.ties}"
+
+
+class PlayoffSeed(models.Model):
+    """
+    A team's place in a season's stored playoff bracket, with its regular-season
+    record frozen at the moment the bracket was drawn.
+    """
+
+    season = models.ForeignKey(Season, on_delete=models.CASCADE, related_name="playoff_seeds")
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="playoff_seeds")
+    conference = models.CharField(max_length=100, blank=True, default="")
+    seed = models.PositiveSmallIntegerField()
+    wins = models.PositiveIntegerField(default=0)
+    losses = models.PositiveIntegerField(default=0)
+    ties = models.PositiveIntegerField(default=0)
+    points_for = models.PositiveIntegerField(default=0)
+    points_against = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = (("season", "team"), ("season", "conference", "seed"))
+        ordering = ["conference", "seed"]
+
+    def __str__(self):
+        return f"{self.season.year} {self.conference} #{self.seed} {self.team}"
+
+
+class PlayoffMatchup(models.Model):
+    """
+    One slot of a stored playoff bracket. Byes are stored as completed matchups
+    without a lower seed so every round resolves the same way.
+    """
+
+    STATUS_CHOICES = [
+        ("scheduled", "Scheduled"),
+        ("completed", "Completed"),
+        ("bye", "Bye"),
+    ]
+
+    season = models.ForeignKey(Season, on_delete=models.CASCADE, related_name="playoff_matchups")
+    round = models.PositiveSmallIntegerField()
+    round_name = models.CharField(max_length=30)
+    conference = models.CharField(max_length=100, blank=True, default="")
+    slot = models.PositiveSmallIntegerField(default=0)
+    higher_seed = models.ForeignKey(PlayoffSeed, on_delete=models.CASCADE, related_name="+")
+    lower_seed = models.ForeignKey(PlayoffSeed, on_delete=models.CASCADE, null=True, blank=True, related_name="+")
+    game = models.OneToOneField(
+        Game, on_delete=models.SET_NULL, null=True, blank=True, related_name="playoff_matchup"
+    )
+    winner = models.ForeignKey(PlayoffSeed, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="scheduled")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("season", "round", "conference", "slot")
+        ordering = ["round", "conference", "slot"]
+
+    def __str__(self):
+        return f"{self.season.year} {self.round_name} {self.conference} #{self.slot}"
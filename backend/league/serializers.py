@@ -25,7 +25,12 @@ from .models import (
     PlayLog,
     TeamGameStat,
     PlayerGameStat,
+    SeasonSimulation,
+    Job,
+    SimRun,
+    DepthChart,
 )
+from .services.playoff_formats import DEFAULT_PLAYOFF_FORMAT, playoff_team_count, resolve_format
 
 User = get_user_model()
 
@@ -237,11 +242,36 @@ class LeagueSerializer(serializers.ModelSerializer):
             "allow_cap_growth",
             "allow_playoff_expansion",
             "enable_realignment",
+            "play_log_format",
+            "playoff_format",
+            "playoff_format_options",
             "created_at",
             "updated_at",
         ]
         read_only_fields = ["created_by", "created_at", "updated_at"]
 
+    def validate(self, attrs):
+        def current(field):
+            if field in attrs:
+                return attrs[field]
+            if self.instance is not None:
+                return getattr(self.instance, field)
+            return League._meta.get_field(field).get_default()
+
+        try:
+            fmt = resolve_format(current("playoff_format"), current("playoff_format_options"))
+        except ValueError as exc:
+            raise serializers.ValidationError({"playoff_format": str(exc)})
+        conference_count = current("conference_count")
+        default = resolve_format(DEFAULT_PLAYOFF_FORMAT)
+        if not current("allow_playoff_expansion") and playoff_team_count(fmt, conference_count) > playoff_team_count(
+            default, conference_count
+        ):
+            raise serializers.ValidationError(
+                {"playoff_format": "This format expands the playoff field; enable allow_playoff_expansion first."}
+            )
+        return attrs
+
     def create(self, validated_data):
         user = self.context["request"].user
         league = League.objects.create(created_by=user, **validated_data)
@@ -437,10 +467,23 @@ class StandingSerializer(serializers.Serializer):
     abbreviation = serializers.CharField()
     wins = serializers.IntegerField()
     losses = serializers.IntegerField()
+    ties = serializers.IntegerField()
     points_for = serializers.IntegerField()
     points_against = serializers.IntegerField()
     conference = serializers.CharField()
     division = serializers.CharField()
+    home_wins = serializers.IntegerField()
+    home_losses = serializers.IntegerField()
+    home_ties = serializers.IntegerField()
+    away_wins = serializers.IntegerField()
+    away_losses = serializers.IntegerField()
+    away_ties = serializers.IntegerField()
+    division_wins = serializers.IntegerField()
+    division_losses = serializers.IntegerField()
+    division_ties = serializers.IntegerField()
+    conference_wins = serializers.IntegerField()
+    conference_losses = serializers.IntegerField()
+    conference_ties = serializers.IntegerField()
 
 
 class PlayoffSeedSerializer(StandingSerializer):
@@ -600,3 +643,85 @@ class ByeWeekSerializer(serializers.ModelSerializer):
         model = ByeWeek
         fields = ["id", "team", "team_abbr", "week_number"]
         read_only_fields = ["week_number"]
+
+
+class SeasonSimulationSerializer(serializers.ModelSerializer):
+    year = serializers.IntegerField(source="season.year", read_only=True)
+
+    class Meta:
+        model = SeasonSimulation
+        fields = [
+            "id",
+            "season",
+            "year",
+            "through_week",
+            "status",
+            "weeks_total",
+            "weeks_done",
+            "games_done",
+            "current_week",
+            "elapsed_ms",
+            "error",
+            "started_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
+
+
+class JobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Job
+        fields = [
+            "id",
+            "kind",
+            "league",
+            "requested_by",
+            "payload",
+            "status",
+            "attempts",
+            "max_attempts",
+            "progress_done",
+            "progress_total",
+            "result",
+            "error",
+            "run_after",
+            "created_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
+
+
+class SimRunSerializer(serializers.ModelSerializer):
+    year = serializers.IntegerField(source="season.year", read_only=True, default=None)
+
+    class Meta:
+        model = SimRun
+        fields = [
+            "id",
+            "league",
+            "season",
+            "year",
+            "scope",
+            "games",
+            "load_ms",
+            "simulate_ms",
+            "persist_ms",
+            "total_ms",
+            "load_queries",
+            "simulate_queries",
+            "persist_queries",
+            "total_queries",
+            "rows_written",
+            "status",
+            "error",
+            "requested_by",
+            "created_at",
+        ]
+        read_only_fields = fields
+
+
+class DepthChartSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DepthChart
+        fields = ["id", "team", "position", "player_ids", "is_custom", "updated_at"]
+        read_only_fields = fields
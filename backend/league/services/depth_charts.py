@@ -0,0 +1,123 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db.models import Q
+from django.utils import timezone
+
+from league.models import DepthChart, Player
+
+# Fields whose change can reorder or empty a depth chart
+DEPTH_FIELDS = frozenset(("team", "position", "overall_rating", "on_ir", "injury_status"))
+
+POSITIONS = [code for code, _ in Player.POSITION_CHOICES]
+
+
+def is_available(p) -> bool:
+    return not p.on_ir and p.injury_status == "healthy"
+
+
+def _ordered_ids(players: List[Player], custom_order: Optional[List[int]] = None) -> List[int]:
+    # Healthy, non-IR players by rating; a custom order is kept for players still eligible
+    eligible = sorted((p for p in players if is_available(p)), key=lambda p: (-p.overall_rating, p.id))
+    ids = [p.id for p in eligible]
+    if not custom_order:
+        return ids
+    eligible_ids = set(ids)
+    ordered = [pid for pid in custom_order if pid in eligible_ids]
+    placed = set(ordered)
+    return ordered + [pid for pid in ids if pid not in placed]
+
+
+def rebuild_depth_charts(keys: Iterable[Tuple[int, str]]) -> Dict[Tuple[int, str], DepthChart]:
+    """
+    Regenerate charts for (team_id, position) pairs from one roster query.
+    """
+    keys = set(keys)
+    if not keys:
+        return {}
+    team_ids = {team_id for team_id, _ in keys}
+    positions = {position for _, position in keys}
+    rosters: Dict[Tuple[int, str], List[Player]] = {key: [] for key in keys}
+    players = Player.objects.filter(team_id__in=team_ids, position__in=positions).only(
+        "id", "team_id", "position", "overall_rating", "on_ir", "injury_status"
+    )
+    for p in players:
+        if (p.team_id, p.position) in rosters:
+            rosters[(p.team_id, p.position)].append(p)
+
+    existing = {
+        (chart.team_id, chart.position): chart
+        for chart in DepthChart.objects.filter(team_id__in=team_ids, position__in=positions)
+    }
+    now = timezone.now()
+    to_create = []
+    to_update = []
+    for key, roster in rosters.items():
+        chart = existing.get(key)
+        if chart is None:
+            chart = DepthChart(team_id=key[0], position=key[1], player_ids=_ordered_ids(roster), is_stale=False)
+            to_create.append(chart)
+            existing[key] = chart
+            continue
+        chart.player_ids = _ordered_ids(roster, chart.player_ids if chart.is_custom else None)
+        chart.is_stale = False
+        chart.updated_at = now
+        to_update.append(chart)
+    if to_create:
+        DepthChart.objects.bulk_create(to_create)
+    if to_update:
+        DepthChart.objects.bulk_update(to_update, ["player_ids", "is_stale", "updated_at"])
+    return {key: existing[key] for key in keys}
+
+
+def get_depth_charts(
+    team_ids: Iterable[int], positions: Iterable[str] = POSITIONS
+) -> Dict[int, Dict[str, List[int]]]:
+    """
+    {team_id: {position: [player ids in depth order]}} from one read, rebuilding
+    only missing or stale charts.
+    """
+    team_ids = set(team_ids)
+    positions = list(positions)
+    result: Dict[int, Dict[str, List[int]]] = {team_id: {} for team_id in team_ids}
+    rows = DepthChart.objects.filter(team_id__in=team_ids, position__in=positions, is_stale=False).values_list(
+        "team_id", "position", "player_ids"
+    )
+    for team_id, position, player_ids in rows:
+        result[team_id][position] = player_ids
+    dirty = {(team_id, position) for team_id in team_ids for position in positions if position not in result[team_id]}
+    if dirty:
+        for (team_id, position), chart in rebuild_depth_charts(dirty).items():
+            result[team_id][position] = list(chart.player_ids)
+    return result
+
+
+def mark_depth_charts_stale(keys: Iterable[Tuple[Optional[int], Optional[str]]]) -> int:
+    keys = {(team_id, position) for team_id, position in keys if team_id and position}
+    if not keys:
+        return 0
+    match = Q()
+    for team_id, position in keys:
+        match |= Q(team_id=team_id, position=position)
+    return DepthChart.objects.filter(match, is_stale=False).update(is_stale=True)
+
+
+def set_depth_chart(team, position: str, player_ids: List[int]) -> DepthChart:
+    """
+    Save an owner-ordered chart. Ids must be available players at the position on
+    the team; anyone left out is appended in rating order.
+    """
+    roster = list(Player.objects.filter(team=team, position=position))
+    by_id = {p.id: p for p in roster}
+    for pid in player_ids:
+        if pid not in by_id:
+            raise ValueError(f"Player {pid} is not a {position} on this roster.")
+        if not is_available(by_id[pid]):
+            raise ValueError(f"Player {pid} is injured or on IR.")
+    if len(set(player_ids)) != len(player_ids):
+        raise ValueError("Duplicate players in depth chart.")
+    chart, _ = DepthChart.objects.get_or_create(team=team, position=position)
+    chart.player_ids = _ordered_ids(roster, player_ids)
+    chart.is_custom = True
+    chart.is_stale = False
+    chart.save(update_fields=["player_ids", "is_custom", "is_stale", "updated_at"])
+    return chart
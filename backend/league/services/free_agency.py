@@ -0,0 +1,70 @@
+from typing import List
+
+from django.db import models, transaction
+from django.utils import timezone
+
+from league.models import Contract, FreeAgencyBid, League
+from league.utils import log_action, notify_user
+
+
+def resolve_free_agency(league: League, user=None, request=None) -> List[int]:
+    """
+    Award each player with pending bids to the best valid bid (highest amount for
+    auctions, earliest round for round-based FA). Returns awarded bid ids.
+    """
+    now = timezone.now()
+    pending = FreeAgencyBid.objects.filter(league=league, status="pending").select_related("player", "team")
+    # filter out expired auctions
+    if league.free_agency_mode == "auction":
+        pending = pending.filter(models.Q(expires_at__lte=now) | models.Q(expires_at__isnull=True))
+    awarded = []
+    for player_id in pending.values_list("player_id", flat=True).distinct():
+        if league.free_agency_mode == "rounds":
+            bids = pending.filter(player_id=player_id).order_by("round_number", "created_at")
+        else:
+            bids = pending.filter(player_id=player_id).order_by("-amount", "created_at")
+        if not bids:
+            continue
+        bid = bids.first()
+        team = bid.team
+        # cap/roster re-check
+        roster_count = team.players.filter(on_ir=False).count()
+        if roster_count >= league.roster_size_limit:
+            continue
+        current_cap = sum(c.cap_hit for c in team.contracts.all())
+        if current_cap + float(bid.amount) > float(league.salary_cap):
+            continue
+        # award
+        with transaction.atomic():
+            bid.status = "awarded"
+            bid.awarded_at = timezone.now()
+            bid.save(update_fields=["status", "awarded_at"])
+            # reject other bids on this player
+            pending.filter(player_id=player_id, status="pending").exclude(id=bid.id).update(status="rejected")
+            player = bid.player
+            player.team = team
+            player.save(update_fields=["team"])
+            Contract.objects.create(
+                player=player,
+                team=team,
+                salary=bid.amount,
+                bonus=0,
+                years=1,
+                start_year=timezone.now().year,
+            )
+        awarded.append(bid.id)
+        log_action(
+            user=user,
+            action="fa.award",
+            entity_type="fa_bid",
+            entity_id=bid.id,
+            details={"league_id": league.id, "player_id": player.id, "team_id": team.id, "amount": bid.amount},
+            request=request,
+        )
+        if team.owner_id:
+            notify_user(
+                user=team.owner,
+                category="free_agency",
+                message=f"Free agent {player} awarded to {team.abbreviation} for ${bid.amount}",
+            )
+    return awarded
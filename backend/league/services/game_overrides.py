@@ -0,0 +1,111 @@
+from collections import defaultdict
+from typing import Dict, List, Sequence, Tuple
+
+from django.db import transaction
+
+from league.models import Game, League, Team, Week
+from league.services.standings import apply_game_changes, game_state
+
+EDITABLE_FIELDS = ("home_team", "away_team", "week")
+
+
+def _as_id(value):
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def apply_game_overrides(league: League, edits: Sequence[Dict]) -> Tuple[List[Game], List[Dict]]:
+    """
+    Apply many commissioner game edits ({"id", and any of "home_team",
+    "away_team", "week"}) in one transaction. Teams and weeks are checked against
+    in-memory indexes of the league, and every touched week is checked for
+    double-booking with the edits applied. Returns (updated games, errors); when
+    there are errors (each {"index", "id", "detail"}) nothing is written.
+    """
+    errors: List[Dict] = []
+    if not isinstance(edits, (list, tuple)) or not edits:
+        return [], [{"index": None, "id": None, "detail": "games must be a non-empty list."}]
+
+    team_ids = set(Team.objects.filter(league=league).values_list("id", flat=True))
+    weeks = {
+        week_id: (season_id, is_playoffs)
+        for week_id, season_id, is_playoffs in Week.objects.filter(season__league=league).values_list(
+            "id", "season_id", "is_playoffs"
+        )
+    }
+    week_ids = set(weeks)
+    game_ids = [_as_id(edit.get("id")) if isinstance(edit, dict) else None for edit in edits]
+    games = {game.id: game for game in Game.objects.filter(id__in=[g for g in game_ids if g], week__in=week_ids)}
+
+    seen = set()
+    planned: Dict[int, Tuple[int, int, int]] = {}
+    for index, (edit, game_id) in enumerate(zip(edits, game_ids)):
+        def fail(detail):
+            errors.append({"index": index, "id": game_id, "detail": detail})
+
+        if game_id is None:
+            fail("Each edit needs a game id.")
+            continue
+        if game_id in seen:
+            fail("Game is edited more than once.")
+            continue
+        seen.add(game_id)
+        game = games.get(game_id)
+        if game is None:
+            fail("Game not found in this league.")
+            continue
+        unknown = set(edit) - {"id", *EDITABLE_FIELDS}
+        if unknown:
+            fail(f"Unsupported fields: {', '.join(sorted(unknown))}.")
+            continue
+        home = _as_id(edit.get("home_team", game.home_team_id))
+        away = _as_id(edit.get("away_team", game.away_team_id))
+        week = _as_id(edit.get("week", game.week_id))
+        if home not in team_ids or away not in team_ids:
+            fail("Teams must belong to this league.")
+        elif week not in week_ids:
+            fail("Week must belong to this league.")
+        elif home == away:
+            fail("A team can't play itself.")
+        else:
+            planned[game_id] = (week, home, away)
+    if errors:
+        return [], errors
+
+    # Every week an edit touches, as it will look afterwards
+    touched = {week for week, _, _ in planned.values()} | {games[game_id].week_id for game_id in planned}
+    slots: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+    for game_id, week, home, away in Game.objects.filter(week_id__in=touched).values_list(
+        "id", "week_id", "home_team_id", "away_team_id"
+    ):
+        week, home, away = planned.get(game_id, (week, home, away))
+        slots[(week, home)].append(game_id)
+        slots[(week, away)].append(game_id)
+    index_of = {game_id: index for index, game_id in enumerate(game_ids)}
+    for (week, team_id), booked in sorted(slots.items()):
+        if len(booked) < 2:
+            continue
+        for game_id in booked:
+            if game_id in planned:
+                detail = f"Team {team_id} is double-booked in week {week}."
+                errors.append({"index": index_of[game_id], "id": game_id, "detail": detail})
+    if errors:
+        return [], errors
+
+    updated = []
+    changes = []
+    for game_id, (week, home, away) in planned.items():
+        game = games[game_id]
+        before = game_state(game, *weeks[game.week_id])
+        game.week_id, game.home_team_id, game.away_team_id = week, home, away
+        changes.append((before, game_state(game, *weeks[week])))
+        updated.append(game)
+    with transaction.atomic():
+        Game.objects.bulk_update(updated, ["week", "home_team", "away_team"])
+        # Moving a played game between teams or seasons moves its result too
+        apply_game_changes(changes)
+    return updated, []
@@ -0,0 +1,270 @@
+"""
+Database-backed job queue for long-running league operations.
+
+Views enqueue a Job row; ``manage.py run_jobs`` workers claim and run them.
+Claiming uses ``SELECT ... FOR UPDATE SKIP LOCKED`` where the database
+supports it (Postgres) and a conditional UPDATE on the row's status elsewhere
+(SQLite), so any number of worker processes can share the table without a
+broker. Failed jobs are retried with exponential backoff up to max_attempts.
+"""
+import os
+import socket
+import threading
+from datetime import timedelta
+from typing import Callable, Dict, Optional
+
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from league.models import Job, League, Season
+from league.services.free_agency import resolve_free_agency
+from league.services.rosters import generate_rookie_pool, seed_default_rosters
+from league.services.season_pipeline import playoff_simulation_summary, simulate_playoffs
+from league.services.season_sim import simulate_season, simulate_week
+from league.utils import log_actions
+
+HANDLERS: Dict[str, Callable[[Job], Optional[Dict]]] = {}
+# Attempts a job of each kind gets unless enqueue() says otherwise
+MAX_ATTEMPTS: Dict[str, int] = {}
+DEFAULT_MAX_ATTEMPTS = 3
+
+# Workers refresh a running job's heartbeat this often
+HEARTBEAT_SECONDS = 30
+# Running jobs without a heartbeat for this long are assumed to belong to a dead worker
+STALE_LOCK_SECONDS = 5 * 60
+
+
+def register(kind: str, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+    """
+    Register a job handler. Handlers that aren't safe to rerun after a failure
+    register with ``max_attempts=1``.
+    """
+
+    def decorator(func):
+        HANDLERS[kind] = func
+        MAX_ATTEMPTS[kind] = max_attempts
+        return func
+
+    return decorator
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def enqueue(
+    kind: str,
+    payload: Optional[Dict] = None,
+    league: Optional[League] = None,
+    user=None,
+    max_attempts: Optional[int] = None,
+) -> Job:
+    if kind not in HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    if max_attempts is None:
+        max_attempts = MAX_ATTEMPTS[kind]
+    return Job.objects.create(
+        kind=kind,
+        league=league,
+        requested_by=user if getattr(user, "is_authenticated", False) else None,
+        payload=payload or {},
+        max_attempts=max_attempts,
+    )
+
+
+def claim_next(worker_id: str) -> Optional[Job]:
+    """
+    Atomically take the oldest runnable job for this worker, or None if the queue is empty.
+    """
+    now = timezone.now()
+    runnable = Job.objects.filter(status="queued", run_after__lte=now).order_by("run_after", "id")
+    claim = {
+        "status": "running",
+        "locked_by": worker_id,
+        "locked_at": now,
+        "heartbeat_at": now,
+        "attempts": F("attempts") + 1,
+    }
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            job = runnable.select_for_update(skip_locked=True).first()
+            if job is None:
+                return None
+            Job.objects.filter(pk=job.pk).update(**claim)
+    else:
+        # No row locks (SQLite): whoever flips status from queued wins the row
+        job = None
+        for job_id in runnable.values_list("id", flat=True)[:20]:
+            if Job.objects.filter(pk=job_id, status="queued").update(**claim):
+                job = Job(pk=job_id)
+                break
+        if job is None:
+            return None
+    job.refresh_from_db()
+    return job
+
+
+def set_progress(job: Job, done: int, total: int):
+    job.progress_done = done
+    job.progress_total = total
+    Job.objects.filter(pk=job.pk).update(progress_done=done, progress_total=total, heartbeat_at=timezone.now())
+
+
+def _beat(job: Job, stop: threading.Event, interval: float):
+    try:
+        while not stop.wait(interval):
+            Job.objects.filter(pk=job.pk, status="running", locked_by=job.locked_by).update(
+                heartbeat_at=timezone.now()
+            )
+    finally:
+        connection.close()
+
+
+def run_job(job: Job, heartbeat_seconds: Optional[float] = None) -> Job:
+    """
+    Run a claimed job's handler and record the outcome; failures are requeued with backoff.
+    With ``heartbeat_seconds`` a background thread keeps the job's heartbeat fresh
+    so long handlers aren't mistaken for a dead worker's.
+    """
+    handler = HANDLERS.get(job.kind)
+    stop = threading.Event()
+    if heartbeat_seconds:
+        threading.Thread(target=_beat, args=(job, stop, heartbeat_seconds), daemon=True).start()
+    try:
+        if handler is None:
+            raise ValueError(f"Unknown job kind: {job.kind}")
+        result = handler(job)
+    except Exception as exc:
+        job.error = f"{type(exc).__name__}: {exc}"
+        if job.attempts < job.max_attempts:
+            job.status = "queued"
+            job.run_after = timezone.now() + timedelta(seconds=2**job.attempts)
+        else:
+            job.status = "failed"
+            job.finished_at = timezone.now()
+    else:
+        job.status = "completed"
+        job.result = result
+        job.error = ""
+        job.finished_at = timezone.now()
+    finally:
+        stop.set()
+    job.locked_by = ""
+    job.locked_at = None
+    job.heartbeat_at = None
+    job.save(
+        update_fields=["status", "result", "error", "run_after", "locked_by", "locked_at", "heartbeat_at", "finished_at"]
+    )
+    return job
+
+
+def requeue_stale(timeout_seconds: int = STALE_LOCK_SECONDS) -> int:
+    """
+    Release running jobs whose worker stopped sending heartbeats. The lost run
+    already counted against the job's attempts when it was claimed, so jobs out
+    of attempts are marked failed instead of being queued again. Returns the
+    number of jobs released.
+    """
+    now = timezone.now()
+    cutoff = now - timedelta(seconds=timeout_seconds)
+    stale = Job.objects.filter(status="running").filter(
+        Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True, locked_at__lt=cutoff)
+    )
+    released = {"locked_by": "", "locked_at": None, "heartbeat_at": None, "error": "Worker stopped responding"}
+    failed = stale.filter(attempts__gte=F("max_attempts")).update(status="failed", finished_at=now, **released)
+    return failed + stale.update(status="queued", run_after=now, **released)
+
+
+def run_pending(worker_id: Optional[str] = None, limit: Optional[int] = None) -> int:
+    """
+    Claim and run jobs until the queue is empty (or ``limit`` jobs ran). Returns jobs run.
+    """
+    worker_id = worker_id or default_worker_id()
+    ran = 0
+    while limit is None or ran < limit:
+        job = claim_next(worker_id)
+        if job is None:
+            break
+        run_job(job)
+        ran += 1
+    return ran
+
+
+# Handlers
+
+
+@register("week.simulate")
+def _simulate_week_job(job: Job) -> Dict:
+    season = Season.objects.get(pk=job.payload["season_id"])
+    week = season.weeks.filter(number=job.payload["week_number"], is_playoffs=False).first()
+    detail_level = job.payload.get("detail_level", "full")
+    games = simulate_week(week, user=job.requested_by, detail_level=detail_level) if week else []
+    log_actions(
+        user=job.requested_by,
+        action="game.simulate",
+        entity_type="game",
+        entries=[
+            (game.id, {"home": game.home_team_id, "away": game.away_team_id, "week": week.number}) for game in games
+        ],
+    )
+    return {
+        "simulated": [
+            {"game_id": g.id, "home_score": g.home_score, "away_score": g.away_score, "status": g.status}
+            for g in games
+        ]
+    }
+
+
+@register("season.simulate")
+def _simulate_season_job(job: Job) -> Dict:
+    season = Season.objects.get(pk=job.payload["season_id"])
+    progress = simulate_season(
+        season,
+        through_week=job.payload.get("through_week"),
+        user=job.requested_by,
+        store_plays=job.payload.get("store_plays", False),
+        detail_level=job.payload.get("detail_level", "full"),
+        on_week=lambda done, total: set_progress(job, done, total),
+    )
+    if progress.status != "completed":
+        raise RuntimeError(progress.error or "Season simulation failed")
+    return {"simulation_id": progress.id, "weeks": progress.weeks_done, "games": progress.games_done}
+
+
+@register("playoffs.simulate")
+def _simulate_playoffs_job(job: Job) -> Dict:
+    season = Season.objects.select_related("league").get(pk=job.payload["season_id"])
+    games = simulate_playoffs(
+        season,
+        store_plays=job.payload.get("store_plays", False),
+        detail_level=job.payload.get("detail_level", "full"),
+        user=job.requested_by,
+    )
+    log_actions(
+        user=job.requested_by,
+        action="game.simulate",
+        entity_type="game",
+        entries=[
+            (game.id, {"home": game.home_team_id, "away": game.away_team_id, "week": game.week.number})
+            for game in games
+        ],
+    )
+    return playoff_simulation_summary(season, games)
+
+
+@register("rosters.seed")
+def _seed_rosters_job(job: Job) -> Dict:
+    return {"created": seed_default_rosters(League.objects.get(pk=job.payload["league_id"]))}
+
+
+# Each run adds a whole new rookie class, so a retry would stack a second one on the first
+@register("rookies.generate", max_attempts=1)
+def _rookie_pool_job(job: Job) -> Dict:
+    return {"created": generate_rookie_pool(League.objects.get(pk=job.payload["league_id"]))}
+
+
+@register("fa.resolve")
+def _resolve_free_agency_job(job: Job) -> Dict:
+    league = League.objects.get(pk=job.payload["league_id"])
+    return {"awarded": resolve_free_agency(league, user=job.requested_by)}
@@ -0,0 +1,83 @@
+"""
+Packed play-log format.
+
+A game's plays are stored as one zlib-compressed columnar blob instead of one
+PlayLog row per play. Layout: a 3-byte header (format version, play count)
+followed by fixed-width columns, each PLAYS long:
+
+    quarter      uint8
+    clock        uint16   seconds left in the quarter
+    play_type    uint8    sim_engine.PLAY_* code
+    yards        int8
+    home_ball    uint8    1 when the home side had the ball
+    home_score   uint16   running score after the play
+    away_score   uint16
+
+Summaries are rendered from the codes when the blob is decoded. Like
+``sim_engine`` this module has no Django imports.
+"""
+import struct
+import zlib
+from typing import Dict, List
+
+import numpy as np
+
+from league.services.sim_engine import render_summary
+
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<BH")
+COLUMNS = [
+    ("quarter", np.uint8),
+    ("clock", np.uint16),
+    ("play_type", np.uint8),
+    ("yards", np.int8),
+    ("home_ball", np.uint8),
+    ("home_score", np.uint16),
+    ("away_score", np.uint16),
+]
+
+
+def pack_plays(codes: Dict[str, List[int]]) -> bytes:
+    """
+    Pack one game's play columns (``sim_engine.game_codes``) into a blob.
+    """
+    count = len(codes["quarter"])
+    parts = [_HEADER.pack(FORMAT_VERSION, count)]
+    for name, dtype in COLUMNS:
+        parts.append(np.asarray(codes[name], dtype=dtype).tobytes())
+    return zlib.compress(b"".join(parts))
+
+
+def unpack_codes(blob: bytes) -> Dict[str, np.ndarray]:
+    raw = zlib.decompress(bytes(blob))
+    version, count = _HEADER.unpack_from(raw)
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported packed play-log version {version}")
+    offset = _HEADER.size
+    columns = {}
+    for name, dtype in COLUMNS:
+        columns[name] = np.frombuffer(raw, dtype=dtype, count=count, offset=offset)
+        offset += count * np.dtype(dtype).itemsize
+    return columns
+
+
+def unpack_plays(blob: bytes) -> List[Dict]:
+    """
+    Decode a blob into play dicts shaped like PlayLog rows.
+    """
+    columns = {name: values.tolist() for name, values in unpack_codes(blob).items()}
+    plays = []
+    for idx in range(len(columns["quarter"])):
+        plays.append(
+            {
+                "play_index": idx + 1,
+                "quarter": columns["quarter"][idx],
+                "clock_seconds": columns["clock"][idx],
+                "summary": render_summary(
+                    columns["play_type"][idx], "home" if columns["home_ball"][idx] else "away", columns["yards"][idx]
+                ),
+                "home_score": columns["home_score"][idx],
+                "away_score": columns["away_score"][idx],
+            }
+        )
+    return plays
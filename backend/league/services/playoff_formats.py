@@ -0,0 +1,185 @@
+"""
+Playoff formats.
+
+A format is a small dict: seeds per bracket, whether each conference seeds its
+own bracket (with a championship between the conference winners) or the whole
+league shares one, whether rounds are reseeded, and optionally how many top
+seeds get a first-round bye (by default whatever fills the bracket to a power
+of two). ``compile_plan`` turns a format into a bracket plan, stored on the
+season when its bracket is drawn: every round lists its slots, and each slot
+names where its teams come from:
+
+* ``["seed", n]``: the nth entrant of the stage (a seed, or for the
+  championship stage the nth-best conference champion)
+* ``["rank", n]``: the nth-best remaining team after reseeding
+* ``["winner", slot]``: the winner of that slot of the previous round
+
+``None`` marks the empty side of a bye.
+"""
+from typing import Dict, List, Optional
+
+from league.models import League
+
+PLAYOFF_FORMATS: Dict[str, Dict] = {
+    "conference-6": {"seeds": 6, "by_conference": True, "reseed": True},
+    "conference-7": {"seeds": 7, "by_conference": True, "reseed": True},
+    "conference-8": {"seeds": 8, "by_conference": True, "reseed": True},
+    "league-12": {"seeds": 12, "by_conference": False, "reseed": True},
+}
+DEFAULT_PLAYOFF_FORMAT = "conference-7"
+CUSTOM_PLAYOFF_FORMAT = "custom"
+
+CONFERENCE_ROUND_NAMES = ["Wildcard", "Divisional", "Conference"]
+LEAGUE_ROUND_NAMES = ["Wildcard", "Divisional", "Semifinal", "Championship"]
+CHAMPIONSHIP_ROUND_NAMES = ["Semifinal", "Championship"]
+
+
+def normalize_format(options: Dict) -> Dict:
+    """
+    Fill in defaults and check a format is playable. Raises ValueError.
+    """
+    try:
+        seeds = int(options.get("seeds", 0))
+    except (TypeError, ValueError):
+        raise ValueError("seeds must be a number.")
+    if seeds < 2:
+        raise ValueError("A playoff format needs at least 2 seeds.")
+    size = 1 << (seeds - 1).bit_length()
+    reseed = bool(options.get("reseed", True))
+    byes = options.get("byes")
+    byes = size - seeds if byes is None else int(byes)
+    if not reseed and byes != size - seeds:
+        raise ValueError("A fixed bracket gives byes to fill it to a power of two; leave byes unset.")
+    playing = seeds - byes
+    if byes < 0 or playing < 2 or playing % 2:
+        raise ValueError("byes must leave an even number of teams (at least 2) playing the first round.")
+    advancing = byes + playing // 2
+    if advancing & (advancing - 1):
+        raise ValueError("Byes plus first-round winners must be a power of two.")
+    return {
+        "seeds": seeds,
+        "byes": byes,
+        "by_conference": bool(options.get("by_conference", True)),
+        "reseed": reseed,
+    }
+
+
+def playoff_team_count(fmt: Dict, conference_count: int) -> int:
+    return fmt["seeds"] * (max(conference_count, 1) if fmt["by_conference"] else 1)
+
+
+def resolve_format(key: str, options: Optional[Dict] = None) -> Dict:
+    if key == CUSTOM_PLAYOFF_FORMAT:
+        return normalize_format(options or {})
+    if key not in PLAYOFF_FORMATS:
+        raise ValueError(f"Unknown playoff format {key!r}.")
+    return normalize_format(PLAYOFF_FORMATS[key])
+
+
+def league_format(league: League, seeds: Optional[int] = None) -> Dict:
+    """
+    The league's playoff format. Formats that field more teams than the default
+    only apply while the league allows playoff expansion. ``seeds`` overrides the
+    seed count (byes are recomputed).
+    """
+    default = resolve_format(DEFAULT_PLAYOFF_FORMAT)
+    try:
+        fmt = resolve_format(league.playoff_format, league.playoff_format_options)
+    except ValueError:
+        fmt = default
+    if not league.allow_playoff_expansion and playoff_team_count(fmt, league.conference_count) > playoff_team_count(
+        default, league.conference_count
+    ):
+        fmt = default
+    if seeds is not None:
+        fmt = normalize_format({**fmt, "seeds": seeds, "byes": None})
+    return fmt
+
+
+def _bracket_order(size: int) -> List[int]:
+    # Standard bracket positions, e.g. 8 -> 1, 8, 4, 5, 2, 7, 3, 6
+    order = [1]
+    while len(order) < size:
+        total = len(order) * 2 + 1
+        order = [seed for top in order for seed in (top, total - top)]
+    return order
+
+
+def _stage_rounds(entrants: int, byes: int, reseed: bool, names: List[str], first_number: int) -> List[Dict]:
+    rounds: List[Dict] = []
+    if reseed:
+        # Round one: highest plays lowest among the teams without a bye, byes last
+        playing = list(range(byes + 1, entrants + 1))
+        slots = [
+            {"home": ["seed", playing[idx]], "away": ["seed", playing[-idx - 1]]} for idx in range(len(playing) // 2)
+        ]
+        slots += [{"home": ["seed", seed], "away": None} for seed in range(1, byes + 1)]
+    else:
+        order = _bracket_order(1 << (entrants - 1).bit_length())
+        slots = [
+            {"home": ["seed", order[idx]], "away": ["seed", order[idx + 1]] if order[idx + 1] <= entrants else None}
+            for idx in range(0, len(order), 2)
+        ]
+    rounds.append({"slots": slots})
+    remaining = len(slots)
+    while remaining > 1:
+        if reseed:
+            slots = [{"home": ["rank", idx + 1], "away": ["rank", remaining - idx]} for idx in range(remaining // 2)]
+        else:
+            slots = [{"home": ["winner", idx], "away": ["winner", idx + 1]} for idx in range(0, remaining, 2)]
+        rounds.append({"slots": slots})
+        remaining = len(slots)
+    count = len(rounds)
+    for idx, spec in enumerate(rounds):
+        from_end = count - idx
+        spec["number"] = first_number + idx
+        spec["name"] = names[-from_end] if from_end <= len(names) else f"Round {first_number + idx}"
+    return rounds
+
+
+def compile_plan(fmt: Dict, groups: List[str]) -> Dict:
+    """
+    Bracket plan for a format and the seeding groups (conference names, or
+    [""] for a league-wide bracket). Plain JSON so it can live on the season.
+    """
+    by_conference = fmt["by_conference"] and len(groups) > 1
+    stages = [
+        {
+            "scope": "group",
+            "rounds": _stage_rounds(
+                fmt["seeds"],
+                fmt["byes"],
+                fmt["reseed"],
+                CONFERENCE_ROUND_NAMES if by_conference else LEAGUE_ROUND_NAMES,
+                1,
+            ),
+        }
+    ]
+    if by_conference:
+        champions = len(groups)
+        size = 1 << (champions - 1).bit_length()
+        stages.append(
+            {
+                "scope": "league",
+                "rounds": _stage_rounds(
+                    champions,
+                    size - champions,
+                    True,
+                    CHAMPIONSHIP_ROUND_NAMES,
+                    len(stages[0]["rounds"]) + 1,
+                ),
+            }
+        )
+    return {"format": fmt, "groups": groups, "stages": stages}
+
+
+def plan_rounds(plan: Dict) -> List[Dict]:
+    """Every round of a plan in order, each tagged with its stage scope."""
+    return [{**spec, "scope": stage["scope"]} for stage in plan["stages"] for spec in stage["rounds"]]
+
+
+def find_round(plan: Dict, number: int) -> Optional[Dict]:
+    for spec in plan_rounds(plan):
+        if spec["number"] == number:
+            return spec
+    return None
@@ -1,23 +1,38 @@
-from typing import List, Dict, Tuple, Optional
+from typing import Dict, List, Optional, Tuple
 
-from django.db import models
+from django.db import transaction
+from django.db.models import Count, Max, Q
 
-from league.models import Season, Team, Game, Week
+from league.models import Game, PlayoffMatchup, PlayoffSeed, Season, Week
+from league.services.playoff_formats import compile_plan, find_round, league_format, plan_rounds
 from league.services.standings import compute_standings
+from league.services.tiebreakers import Tiebreaker
 
 
-def generate_playoff_seeds(season: Season, seeds: int = 7) -> List[Dict]:
+UNBRACKETED_PLAYOFFS_DETAIL = "This season's playoff games were played without a stored bracket; it can't be redrawn."
+
+
+def generate_playoff_seeds(
+    season: Season, seeds: Optional[int] = None, by_conference: Optional[bool] = None
+) -> List[Dict]:
     """
-    Return top seeds per conference (NFL-style 7 per conference by default).
+    Return the top seeds per conference, or league-wide, as the league's playoff
+    format says (NFL-style 7 per conference by default). Ties are re-broken
+    within each seeding group, since a league-wide tie group can resolve
+    differently once teams from the other conference drop out.
     """
-    standings = compute_standings(season)
+    if seeds is None or by_conference is None:
+        fmt = league_format(season.league, seeds)
+        seeds, by_conference = fmt["seeds"], fmt["by_conference"]
+    tiebreaker = Tiebreaker(season)
+    standings = compute_standings(season, tiebreaker)
     grouped = {}
     for record in standings:
-        conf = record.get("conference") or "Conference"
+        conf = (record.get("conference") or "Conference") if by_conference else ""
         grouped.setdefault(conf, []).append(record)
     seeded: List[Dict] = []
     for conf_name, records in grouped.items():
-        top = records[:seeds]
+        top = tiebreaker.order(records)[:seeds]
         for idx, rec in enumerate(top, start=1):
             rec = dict(rec)
             rec["seed"] = idx
@@ -28,279 +43,377 @@ def generate_playoff_seeds(season: Season, seeds: int = 7) -> List[Dict]:
     return seeded
 
 
-def _conference_bracket(seed_list: List[Dict]) -> List[Tuple[Dict, Dict]]:
-    """
-    Build a simple bracket for a single conference.
-    Uses 7 seeds (1 bye) by default; falls back to top/bottom pairing.
-    """
-    if not seed_list:
-        return []
-    seed_list = sorted(seed_list, key=lambda s: s.get("seed", 99))
-    if len(seed_list) == 7:
-        # Wild card: 2v7,3v6,4v5; 1 seed bye
-        return [
-          (seed_list[1], seed_list[6]),
-          (seed_list[2], seed_list[5]),
-          (seed_list[3], seed_list[4]),
-          (seed_list[0], None),
-        ]
-    # Generic pairing highest vs lowest
-    result = []
-    left = 0
-    right = len(seed_list) - 1
-    while left < right:
-        result.append((seed_list[left], seed_list[right]))
-        left += 1
-        right -= 1
-    if left == right:
-        result.append((seed_list[left], None))
-    return result
-
-
-def generate_bracket(season: Season, seeds: int = 7) -> List[Tuple[Dict, Dict, str]]:
+def _group_seeds(seeds_all: List) -> Dict[str, List]:
+    by_conf: Dict[str, List] = {}
+    for seed in seeds_all:
+        conference = seed["conference_name"] if isinstance(seed, dict) else seed.conference
+        by_conf.setdefault(conference, []).append(seed)
+    return by_conf
+
+
+def _rank_key(seed) -> Tuple:
+    if isinstance(seed, dict):
+        return seed.get("seed", 99), -seed.get("wins", 0), seed.get("conference_name", ""), seed.get("team_id", 0)
+    return seed.seed, -seed.wins, seed.conference, seed.team_id
+
+
+def _resolve_slots(spec: Dict, entrants: List, previous: Dict[int, object]) -> List[Tuple[int, object, object]]:
     """
-    Return a list of matchup tuples (higher_seed, lower_seed, conference).
-    For NFL-style 7 seeds per conference: seed 1 gets a bye; 2v7,3v6,4v5.
+    Walk a plan round's slots once: (slot, higher, lower) per slot that has a
+    team, lower None for a bye. entrants is ordered best first; previous maps
+    the last round's slots to their winners.
     """
-    seeds_all = generate_playoff_seeds(season, seeds)
-    if not seeds_all:
-        return []
-    # Group by conference
-    by_conf: Dict[str, List[Dict]] = {}
-    for seed in seeds_all:
-        conf = seed.get("conference_name") or "Conference"
-        by_conf.setdefault(conf, []).append(seed)
+
+    def resolve(source):
+        if source is None:
+            return None
+        kind, value = source
+        if kind == "winner":
+            return previous.get(value)
+        return entrants[value - 1] if value <= len(entrants) else None
+
+    pairs = []
+    for slot, spec_slot in enumerate(spec["slots"]):
+        higher, lower = resolve(spec_slot["home"]), resolve(spec_slot["away"])
+        if higher is None:
+            higher, lower = lower, None
+        elif lower is not None and _rank_key(lower) < _rank_key(higher):
+            higher, lower = lower, higher
+        if higher is not None:
+            pairs.append((slot, higher, lower))
+    return pairs
+
+
+def _compile_season_plan(season: Season, seeds: Optional[int] = None) -> Tuple[Dict, List[Dict]]:
+    fmt = league_format(season.league, seeds)
+    rows = generate_playoff_seeds(season, fmt["seeds"], by_conference=fmt["by_conference"])
+    return compile_plan(fmt, list(_group_seeds(rows))), rows
+
+
+def _first_round(plan: Dict, rows: List[Dict]) -> List[Tuple[Dict, Optional[Dict], str]]:
+    first = plan_rounds(plan)[0]
     bracket = []
-    for conf_name, conf_seeds in by_conf.items():
-        matchups = _conference_bracket(conf_seeds[:seeds])
-        for higher, lower in matchups:
+    for conf_name, conf_seeds in _group_seeds(rows).items():
+        for _, higher, lower in _resolve_slots(first, sorted(conf_seeds, key=_rank_key), {}):
             bracket.append((higher, lower, conf_name))
     return bracket
 
 
-def _find_game(season: Season, team_a_id: int, team_b_id: int) -> Optional[Game]:
-    return (
-        Game.objects.filter(week__season=season, week__is_playoffs=True)
-        .filter(
-            (models.Q(home_team_id=team_a_id, away_team_id=team_b_id))
-            | (models.Q(home_team_id=team_b_id, away_team_id=team_a_id))
-        )
-        .order_by("-week__number", "-id")
-        .first()
-    )
+def generate_bracket(season: Season, seeds: Optional[int] = None) -> List[Tuple[Dict, Dict, str]]:
+    """
+    Return the first round as matchup tuples (higher_seed, lower_seed, conference),
+    lower_seed None for a bye. For NFL-style 7 seeds per conference: seed 1 gets a
+    bye; 2v7,3v6,4v5.
+    """
+    plan, rows = _compile_season_plan(season, seeds)
+    return _first_round(plan, rows)
+
+
+SNAPSHOT_FIELDS = ("wins", "losses", "ties", "points_for", "points_against")
+ROUND_ORDER = ["Wildcard", "Divisional", "Conference", "Championship"]
 
 
-def _winner(game: Game) -> Optional[Team]:
+def _winner_id(game: Optional[Game]) -> Optional[int]:
     if not game or game.status != "completed":
         return None
     if game.home_score is None or game.away_score is None:
         return None
     if game.home_score == game.away_score:
         return None
-    return game.home_team if game.home_score > game.away_score else game.away_team
+    return game.home_team_id if game.home_score > game.away_score else game.away_team_id
 
 
-def playoff_progress(season: Season, seeds: int = 7):
+def _regular_season_over(season: Season) -> bool:
+    counts = Game.objects.filter(week__season=season, week__is_playoffs=False).aggregate(
+        total=Count("id"), open=Count("id", filter=~Q(status="completed"))
+    )
+    return counts["total"] > 0 and counts["open"] == 0
+
+
+def _playoff_week(season_id: int, number: int) -> Week:
+    week, _ = Week.objects.get_or_create(season_id=season_id, number=number, is_playoffs=True)
+    return week
+
+
+def _build_round(
+    season_id: int,
+    plan: Dict,
+    spec: Dict,
+    conference: str,
+    entrants: List[PlayoffSeed],
+    previous: Dict[int, PlayoffSeed],
+    week_number: int,
+) -> List[int]:
     """
-    Compute playoff rounds with advancing winners (reseeding each round).
-    Returns a structure with rounds and matchup status (pending/in-progress/final).
+    Insert one round's matchups and games from its plan spec; return new game
+    ids. A round made up only of byes is decided on the spot and the bracket
+    moves straight on to the next one.
     """
-    seeds_all = generate_playoff_seeds(season, seeds)
-    if not seeds_all:
-        return {"rounds": []}
+    pairs = _resolve_slots(spec, entrants, previous)
+    played = [(higher, lower) for _, higher, lower in pairs if lower is not None]
+    games: List[Game] = []
+    if played:
+        week = _playoff_week(season_id, week_number)
+        games = Game.objects.bulk_create(
+            [
+                Game(week=week, home_team_id=higher.team_id, away_team_id=lower.team_id, status="scheduled")
+                for higher, lower in played
+            ]
+        )
+    scheduled = iter(games)
+    matchups = []
+    for slot, higher, lower in pairs:
+        matchup = PlayoffMatchup(
+            season_id=season_id,
+            round=spec["number"],
+            round_name=spec["name"],
+            conference=conference,
+            slot=slot,
+            higher_seed=higher,
+            lower_seed=lower,
+        )
+        if lower is None:
+            matchup.status, matchup.winner = "bye", higher
+        else:
+            matchup.game = next(scheduled)
+        matchups.append(matchup)
+    PlayoffMatchup.objects.bulk_create(matchups)
+    if games:
+        return [game.id for game in games]
+    return _after_round(season_id, plan, spec["number"], conference, matchups, week_number)
 
-    by_conf: Dict[str, List[Dict]] = {}
-    for seed in seeds_all:
-        conf = seed.get("conference_name") or "Conference"
-        by_conf.setdefault(conf, []).append(seed)
 
-    rounds = []
-    conf_champs = []
-
-    for conf_name, conf_seeds in by_conf.items():
-        conf_seeds = sorted(conf_seeds, key=lambda s: s.get("seed", 99))
-        seed_map = {s["seed"]: s for s in conf_seeds}
-
-        # Wildcard round
-        wc_pairs = [(2, 7), (3, 6), (4, 5)]
-        wc_matchups = []
-        wc_winners: List[Tuple[int, Dict]] = []
-        for a, b in wc_pairs:
-            if a not in seed_map or b not in seed_map:
-                continue
-            ga = seed_map[a]
-            gb = seed_map[b]
-            game = _find_game(season, ga["team_id"], gb["team_id"])
-            winner_team = _winner(game)
-            winner_seed = None
-            if winner_team:
-                winner_seed = a if winner_team.id == ga["team_id"] else b
-                wc_winners.append((winner_seed, seed_map[winner_seed]))
-            wc_matchups.append(
-                {
-                    "round": "Wildcard",
-                    "conference": conf_name,
-                    "higher_seed": ga,
-                    "lower_seed": gb,
-                    "game_id": getattr(game, "id", None),
-                    "status": getattr(game, "status", "pending") if game else "pending",
-                    "winner_seed": winner_seed,
-                }
-            )
-        # Seed 1 bye auto-advances
-        if 1 in seed_map:
-            wc_winners.append((1, seed_map[1]))
-
-        # Divisional: 1 vs lowest remaining, other two face
-        div_matchups = []
-        div_winners: List[Tuple[int, Dict]] = []
-        remaining = sorted(wc_winners, key=lambda x: x[0])
-        if len(remaining) >= 2:
-            top_seed, top_team = remaining[0]
-            bye_seed, bye_team = (1, seed_map[1]) if 1 in seed_map else (None, None)
-            if bye_seed and bye_seed != top_seed:
-                # 1 vs lowest remaining
-                low_seed, low_team = remaining[0]
-                game = _find_game(season, bye_team["team_id"], low_team["team_id"]) if bye_team else None
-                winner_team = _winner(game)
-                winner_seed = None
-                if winner_team:
-                    winner_seed = bye_seed if winner_team.id == bye_team["team_id"] else low_seed
-                    div_winners.append((winner_seed, seed_map[winner_seed]))
-                div_matchups.append(
-                    {
-                        "round": "Divisional",
-                        "conference": conf_name,
-                        "higher_seed": bye_team,
-                        "lower_seed": low_team,
-                        "game_id": getattr(game, "id", None),
-                        "status": getattr(game, "status", "pending") if game else "pending",
-                        "winner_seed": winner_seed,
-                    }
-                )
-                others = [pair for pair in remaining if pair[0] not in (bye_seed, low_seed)]
-            else:
-                others = remaining
-        else:
-            others = remaining
-
-        if len(others) >= 2:
-            a_seed, a_team = others[0]
-            b_seed, b_team = others[1]
-            game = _find_game(season, a_team["team_id"], b_team["team_id"])
-            winner_team = _winner(game)
-            winner_seed = None
-            if winner_team:
-                winner_seed = a_seed if winner_team.id == a_team["team_id"] else b_seed
-                div_winners.append((winner_seed, seed_map[winner_seed]))
-            div_matchups.append(
-                {
-                    "round": "Divisional",
-                    "conference": conf_name,
-                    "higher_seed": a_team,
-                    "lower_seed": b_team,
-                    "game_id": getattr(game, "id", None),
-                    "status": getattr(game, "status", "pending") if game else "pending",
-                    "winner_seed": winner_seed,
-                }
-            )
+def _after_round(
+    season_id: int, plan: Dict, round_number: int, conference: str, matchups: List[PlayoffMatchup], week_number: int
+) -> List[int]:
+    """
+    Every matchup of a round (in its conference) has a winner: build the next
+    round the plan describes, or once every conference has a champion, the
+    championship stage. Safe to call again: existing rounds are left alone.
+    """
+    current, upcoming = find_round(plan, round_number), find_round(plan, round_number + 1)
+    if upcoming is None:
+        # League champion decided
+        return []
+    if upcoming["scope"] == current["scope"]:
+        if PlayoffMatchup.objects.filter(season_id=season_id, round=upcoming["number"], conference=conference).exists():
+            return []
+        previous = {m.slot: m.winner for m in matchups}
+        entrants = sorted(previous.values(), key=_rank_key)
+        return _build_round(season_id, plan, upcoming, conference, entrants, previous, week_number + 1)
 
-        rounds.extend(wc_matchups + div_matchups)
-
-        # Conference championship
-        cc_matchups = []
-        if len(div_winners) >= 2:
-            div_sorted = sorted(div_winners, key=lambda x: x[0])
-            a_seed, a_team = div_sorted[0]
-            b_seed, b_team = div_sorted[1]
-            game = _find_game(season, a_team["team_id"], b_team["team_id"])
-            winner_team = _winner(game)
-            winner_seed = None
-            champ = None
-            if winner_team:
-                winner_seed = a_seed if winner_team.id == a_team["team_id"] else b_seed
-                champ = seed_map[winner_seed]
-                conf_champs.append((conf_name, champ))
-            cc_matchups.append(
-                {
-                    "round": "Conference",
-                    "conference": conf_name,
-                    "higher_seed": a_team,
-                    "lower_seed": b_team,
-                    "game_id": getattr(game, "id", None),
-                    "status": getattr(game, "status", "pending") if game else "pending",
-                    "winner_seed": winner_seed,
-                }
+    # A conference champion: the championship stage starts when every conference has one
+    finals = list(PlayoffMatchup.objects.filter(season_id=season_id, round=round_number).select_related("winner"))
+    if len({m.conference for m in finals}) < len(plan["groups"]) or any(m.winner_id is None for m in finals):
+        return []
+    if PlayoffMatchup.objects.filter(season_id=season_id, round=upcoming["number"]).exists():
+        return []
+    champions = sorted((m.winner for m in finals), key=_rank_key)
+    return _build_round(season_id, plan, upcoming, "", champions, {}, week_number + 1)
+
+
+def unbracketed_playoff_games(season: Season) -> bool:
+    """
+    Whether the season has playoff games but no stored bracket, e.g. playoffs
+    played before brackets were stored. Such a bracket can't be redrawn without
+    duplicating the games already played.
+    """
+    return (
+        not season.playoff_seeds.exists()
+        and Game.objects.filter(week__season=season, week__is_playoffs=True).exists()
+    )
+
+
+@transaction.atomic
+def create_bracket(season: Season, seeds: Optional[int] = None) -> List[int]:
+    """
+    Draw the season's stored bracket from the final standings: compile the
+    league's playoff format into the season's plan, then store PlayoffSeed rows
+    and the first round's matchups and games. Does nothing when a bracket
+    already exists. Returns the created game ids. Raises ValueError when the
+    season already has playoff games without a stored bracket.
+    """
+    if season.playoff_seeds.exists():
+        return []
+    if unbracketed_playoff_games(season):
+        raise ValueError(UNBRACKETED_PLAYOFFS_DETAIL)
+    plan, rows = _compile_season_plan(season, seeds)
+    if not rows:
+        return []
+    season.playoff_plan = plan
+    season.save(update_fields=["playoff_plan"])
+    seed_rows = PlayoffSeed.objects.bulk_create(
+        [
+            PlayoffSeed(
+                season=season,
+                team_id=row["team_id"],
+                conference=row["conference_name"],
+                seed=row["seed"],
+                **{field: row[field] for field in SNAPSHOT_FIELDS},
             )
-        elif len(div_winners) == 1:
-            # Only one team advanced; they are the champ
-            champ = div_winners[0][1]
-            conf_champs.append((conf_name, champ))
-        rounds.extend(cc_matchups)
-
-    # Championship (Super Bowl) between conference champs, if two exist
-    if len(conf_champs) >= 2:
-        a_conf, a_team = conf_champs[0]
-        b_conf, b_team = conf_champs[1]
-        game = _find_game(season, a_team["team_id"], b_team["team_id"])
-        winner_team = _winner(game)
-        winner_conf = None
-        if winner_team:
-            winner_conf = a_conf if winner_team.id == a_team["team_id"] else b_conf
-        rounds.append(
-            {
-                "round": "Championship",
-                "conference": f"{a_conf} vs {b_conf}",
-                "higher_seed": a_team,
-                "lower_seed": b_team,
-                "game_id": getattr(game, "id", None),
-                "status": getattr(game, "status", "pending") if game else "pending",
-                "winner_conference": winner_conf,
-            }
-        )
+            for row in rows
+        ]
+    )
+    max_regular = season.weeks.filter(is_playoffs=False).aggregate(Max("number"))["number__max"] or 0
+    first = plan_rounds(plan)[0]
+    created: List[int] = []
+    for conference, conf_seeds in _group_seeds(seed_rows).items():
+        entrants = sorted(conf_seeds, key=_rank_key)
+        created.extend(_build_round(season.id, plan, first, conference, entrants, {}, max_regular + 1))
+    return created
 
-    return {"rounds": rounds}
 
+def _record(matchup: PlayoffMatchup, game: Game, plan: Dict) -> List[int]:
+    winner_id = _winner_id(game)
+    if winner_id is None:
+        return []
+    matchup.winner = matchup.higher_seed if matchup.higher_seed.team_id == winner_id else matchup.lower_seed
+    matchup.status = "completed"
+    matchup.save(update_fields=["winner", "status", "updated_at"])
+    siblings = list(
+        PlayoffMatchup.objects.filter(
+            season_id=matchup.season_id, round=matchup.round, conference=matchup.conference
+        ).select_related("winner")
+    )
+    if any(m.winner_id is None for m in siblings):
+        return []
+    return _after_round(matchup.season_id, plan, matchup.round, matchup.conference, siblings, game.week.number)
 
-ROUND_ORDER = ["Wildcard", "Divisional", "Conference", "Championship"]
 
+@transaction.atomic
+def record_playoff_result(game: Game) -> List[int]:
+    """
+    Advance the stored bracket for one completed playoff game: marks its
+    matchup's winner and, if that finishes the round, creates the next round's
+    games. A fixed handful of queries; returns the created game ids.
+    """
+    matchup = (
+        PlayoffMatchup.objects.filter(game=game, winner__isnull=True)
+        .select_related("season", "higher_seed", "lower_seed")
+        .first()
+    )
+    if matchup is None:
+        return []
+    return _record(matchup, game, matchup.season.playoff_plan)
 
-def advance_playoff_rounds(season: Season, seeds: int = 7) -> List[int]:
+
+@transaction.atomic
+def advance_playoff_rounds(season: Season, seeds: Optional[int] = None) -> List[int]:
     """
-    Create playoff games for the next rounds based on existing results.
-    Returns list of created game IDs.
+    Bring the stored bracket up to date: draw it once the regular season is
+    over, then record any completed playoff games it hasn't seen yet (e.g. from
+    week sims). Returns the created game ids; rerunning creates nothing new.
+    Raises ValueError for playoff games without a stored bracket.
     """
-    progress = playoff_progress(season, seeds)
     created: List[int] = []
-    if not progress.get("rounds"):
-        return created
-
-    max_regular = season.weeks.filter(is_playoffs=False).aggregate(models.Max("number")).get("number__max") or 0
-
-    for idx, round_name in enumerate(ROUND_ORDER, start=1):
-        matchups = [m for m in progress["rounds"] if m.get("round") == round_name]
-        if not matchups:
-            continue
-        week_number = max_regular + idx
-        week, _ = Week.objects.get_or_create(season=season, number=week_number, is_playoffs=True)
-        for m in matchups:
-            higher = m.get("higher_seed")
-            lower = m.get("lower_seed")
-            if not higher or not lower:
-                # bye or no opponent; skip scheduling
-                continue
-            home_id = higher.get("team_id")
-            away_id = lower.get("team_id")
-            if not home_id or not away_id:
-                continue
-            exists = Game.objects.filter(week=week).filter(
-                (models.Q(home_team_id=home_id, away_team_id=away_id))
-                | (models.Q(home_team_id=away_id, away_team_id=home_id))
-            )
-            if exists.exists():
-                continue
-            home = Team.objects.get(id=home_id)
-            away = Team.objects.get(id=away_id)
-            game = Game.objects.create(week=week, home_team=home, away_team=away, status="scheduled")
-            created.append(game.id)
+    if not season.playoff_seeds.exists():
+        if not _regular_season_over(season):
+            return created
+        created.extend(create_bracket(season, seeds))
+    pending = PlayoffMatchup.objects.filter(season=season, winner__isnull=True, game__status="completed")
+    return created + _record_all(season, pending)
+
+
+def _record_all(season: Season, matchups) -> List[int]:
+    created: List[int] = []
+    for matchup in matchups.select_related("game__week", "higher_seed", "lower_seed"):
+        created.extend(_record(matchup, matchup.game, season.playoff_plan))
     return created
+
+
+@transaction.atomic
+def record_playoff_results(season: Season, games: List[Game]) -> List[int]:
+    """
+    Advance the stored bracket for a batch of completed games of one season,
+    reusing the season's loaded plan. Returns the created game ids.
+    """
+    return _record_all(season, PlayoffMatchup.objects.filter(game__in=games, winner__isnull=True))
+
+
+def bracket_ready(season: Season) -> bool:
+    """Whether the season's bracket is drawn or can be (the regular season is over)."""
+    return season.playoff_seeds.exists() or _regular_season_over(season)
+
+
+def playoff_champion(season: Season) -> Optional[PlayoffSeed]:
+    """The seed that won the season's final round, if it has been played."""
+    if not season.playoff_plan:
+        return None
+    final = plan_rounds(season.playoff_plan)[-1]["number"]
+    matchup = (
+        PlayoffMatchup.objects.filter(season=season, round=final, winner__isnull=False)
+        .select_related("winner__team")
+        .first()
+    )
+    return matchup.winner if matchup else None
+
+
+def _seed_row(seed: Optional[PlayoffSeed]) -> Optional[Dict]:
+    if seed is None:
+        return None
+    row = {
+        "team_id": seed.team_id,
+        "abbreviation": seed.team.abbreviation,
+        "conference": seed.team.conference.name,
+        "division": seed.team.division.name,
+        "seed": seed.seed,
+        "conference_name": seed.conference,
+    }
+    row.update({field: getattr(seed, field) for field in SNAPSHOT_FIELDS})
+    return row
+
+
+def playoff_progress(season: Season, seeds: Optional[int] = None):
+    """
+    The season's playoff rounds with matchup status (pending/scheduled/completed).
+    Reads the stored bracket in one query; before the bracket is drawn, shows
+    the first round as the current standings would seed it.
+    """
+    matchups = list(
+        season.playoff_matchups.exclude(status="bye").select_related(
+            "game",
+            "winner",
+            "higher_seed__team__conference",
+            "higher_seed__team__division",
+            "lower_seed__team__conference",
+            "lower_seed__team__division",
+        )
+    )
+    if not matchups and not season.playoff_seeds.exists():
+        plan, rows = _compile_season_plan(season, seeds)
+        if not rows:
+            return {"rounds": []}
+        name = plan_rounds(plan)[0]["name"]
+        return {
+            "rounds": [
+                {
+                    "round": name,
+                    "conference": conf,
+                    "higher_seed": higher,
+                    "lower_seed": lower,
+                    "game_id": None,
+                    "status": "pending",
+                    "winner_seed": None,
+                }
+                for higher, lower, conf in _first_round(plan, rows)
+                if lower is not None
+            ]
+        }
+
+    rounds = []
+    for m in matchups:
+        entry = {
+            "round": m.round_name,
+            "conference": m.conference,
+            "higher_seed": _seed_row(m.higher_seed),
+            "lower_seed": _seed_row(m.lower_seed),
+            "game_id": m.game_id,
+            "status": m.game.status if m.game else "pending",
+            "winner_seed": m.winner.seed if m.winner else None,
+        }
+        if not m.conference and m.higher_seed.conference:
+            # Championship stage between conference winners
+            entry["conference"] = f"{m.higher_seed.conference} vs {m.lower_seed.conference}"
+            entry["winner_conference"] = m.winner.conference if m.winner else None
+        rounds.append(entry)
+    return {"rounds": rounds}
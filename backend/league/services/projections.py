@@ -0,0 +1,235 @@
+"""
+Monte Carlo season projections.
+
+Loads the remaining regular-season schedule and team powers once, then plays
+the rest of the season thousands of times as NumPy arrays. Rather than running
+every play, each game is drawn from the per-play outcome probabilities the
+play engine (``sim_engine``) implies for the two powers: a multinomial over
+48 plays of home TD / home FG / away TD / away FG / no score. Seeding follows
+``generate_playoff_seeds`` under the league's playoff format: teams rank on
+winning percentage (ties count half a win), and equal percentages fall to
+head-to-head, division record, net points and the abbreviation coin toss, the
+main steps of ``tiebreakers.py`` computed for every iteration at once from the
+season's game matrix.
+"""
+import math
+from typing import Dict, List, Optional
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max, Sum
+
+from league.models import Game, Season, Team
+from league.services import sim_engine
+from league.services.playoff_formats import league_format
+from league.services.ratings import get_team_snapshots
+
+CHUNK_ITERATIONS = 2000
+
+
+def _normal_tail(threshold: np.ndarray) -> np.ndarray:
+    # P(Z >= threshold) for a standard normal
+    return np.array([0.5 * math.erfc(value / math.sqrt(2)) for value in threshold.tolist()])
+
+
+def _side_probabilities(edge: np.ndarray):
+    # Mirrors the engine: yards ~ N(edge * 0.2 + 4, 8); TD on 20+ yards 15% of the
+    # time, otherwise FG on 3+ yards 25% of the time.
+    mean = edge * 0.2 + 4
+    p20 = _normal_tail((20 - mean) / 8)
+    p3 = _normal_tail((3 - mean) / 8)
+    td = 0.15 * p20
+    fg = 0.25 * (p3 - td)
+    return td, fg
+
+
+def play_probabilities(home_power: np.ndarray, away_power: np.ndarray) -> np.ndarray:
+    """
+    (games, 5) per-play probabilities of home TD, home FG, away TD, away FG, no score.
+    """
+    home_power = np.asarray(home_power, dtype=float)
+    away_power = np.asarray(away_power, dtype=float)
+    home_share = home_power / (home_power + away_power)
+    home_td, home_fg = _side_probabilities(home_power - away_power)
+    away_td, away_fg = _side_probabilities(away_power - home_power)
+    pvals = np.stack(
+        [home_share * home_td, home_share * home_fg, (1 - home_share) * away_td, (1 - home_share) * away_fg], axis=1
+    )
+    return np.concatenate([pvals, 1 - pvals.sum(axis=1, keepdims=True)], axis=1)
+
+
+def _load(season: Season):
+    teams = list(
+        Team.objects.filter(league_id=season.league_id)
+        .select_related("conference", "division")
+        .order_by("id")
+    )
+    index = {team.id: idx for idx, team in enumerate(teams)}
+    played = []
+    remaining = []
+    games = Game.objects.filter(week__season=season, week__is_playoffs=False).values_list(
+        "home_team_id", "away_team_id", "status", "home_score", "away_score"
+    )
+    for home_id, away_id, game_status, home_score, away_score in games:
+        home, away = index[home_id], index[away_id]
+        if game_status != "completed":
+            remaining.append((home, away))
+        else:
+            played.append((home, away, home_score or 0, away_score or 0))
+    return teams, played, remaining
+
+
+def _pct(wins: np.ndarray, losses: np.ndarray, ties: np.ndarray) -> np.ndarray:
+    games = wins + losses + ties
+    return np.divide(wins + 0.5 * ties, games, out=np.zeros_like(games), where=games > 0)
+
+
+def project_season(
+    season: Season, iterations: int = 10000, seeds: Optional[int] = None, rng: Optional[np.random.Generator] = None
+) -> List[Dict]:
+    """
+    Play out the remaining schedule ``iterations`` times. Returns one row per team
+    with projected wins/losses, playoff odds and the probability of each seed.
+    Seeds per group, and whether conferences seed separately, come from the
+    league's playoff format; ``seeds`` overrides the seed count.
+    """
+    rng = rng or np.random.default_rng()
+    fmt = league_format(season.league, seeds)
+    seeds = fmt["seeds"]
+    teams, played, remaining = _load(season)
+    n_teams = len(teams)
+    if not n_teams:
+        return []
+    snapshots = get_team_snapshots([team.id for team in teams])
+    power = np.array([snapshots[team.id].power for team in teams])
+    sim_home = np.array([home for home, _ in remaining], dtype=np.int64)
+    sim_away = np.array([away for _, away in remaining], dtype=np.int64)
+    pvals = play_probabilities(power[sim_home], power[sim_away]) if remaining else np.zeros((0, 5))
+    # Every game of the season, played ones first; (games, teams) incidence
+    # matrices turn per-game results into per-team totals with a matmul
+    home_idx = np.array([game[0] for game in played] + sim_home.tolist(), dtype=np.int64)
+    away_idx = np.array([game[1] for game in played] + sim_away.tolist(), dtype=np.int64)
+    played_home_score = np.array([game[2] for game in played], dtype=float)
+    played_away_score = np.array([game[3] for game in played], dtype=float)
+    home_onehot = np.zeros((len(home_idx), n_teams))
+    home_onehot[np.arange(len(home_idx)), home_idx] = 1
+    away_onehot = np.zeros((len(away_idx), n_teams))
+    away_onehot[np.arange(len(away_idx)), away_idx] = 1
+    both_onehot = home_onehot + away_onehot
+    division = np.array([team.division_id for team in teams])
+    division_game = (division[home_idx] == division[away_idx]).astype(float)
+    # Stand-in for the coin toss, as in tiebreakers.py: alphabetical by abbreviation
+    toss = np.empty(n_teams)
+    toss[sorted(range(n_teams), key=lambda idx: (teams[idx].abbreviation, teams[idx].id))] = np.arange(n_teams)
+
+    groups: Dict[str, List[int]] = {}
+    for idx, team in enumerate(teams):
+        groups.setdefault(team.conference.name if fmt["by_conference"] else "", []).append(idx)
+    group_columns = [np.array(columns) for columns in groups.values()]
+
+    total_wins = np.zeros(n_teams)
+    total_losses = np.zeros(n_teams)
+    seed_counts = np.zeros((n_teams, seeds))
+    for start in range(0, iterations, CHUNK_ITERATIONS):
+        size = min(CHUNK_ITERATIONS, iterations - start)
+        home_score = np.broadcast_to(played_home_score, (size, len(played)))
+        away_score = np.broadcast_to(played_away_score, (size, len(played)))
+        if remaining:
+            counts = rng.multinomial(sim_engine.PLAYS_PER_GAME, pvals, size=(size, len(remaining)))
+            home_score = np.concatenate(
+                [home_score, counts[..., 0] * sim_engine.TD_POINTS + counts[..., 1] * sim_engine.FG_POINTS], axis=1
+            )
+            away_score = np.concatenate(
+                [away_score, counts[..., 2] * sim_engine.TD_POINTS + counts[..., 3] * sim_engine.FG_POINTS], axis=1
+            )
+        home_win = (home_score > away_score).astype(float)
+        away_win = (away_score > home_score).astype(float)
+        tie = (home_score == away_score).astype(float)
+
+        def record(mask):
+            return (
+                (home_win * mask) @ home_onehot + (away_win * mask) @ away_onehot,
+                (away_win * mask) @ home_onehot + (home_win * mask) @ away_onehot,
+                (tie * mask) @ both_onehot,
+            )
+
+        sim_wins, sim_losses, sim_ties = record(1.0)
+        total_wins += sim_wins.sum(axis=0)
+        total_losses += sim_losses.sum(axis=0)
+        pct = _pct(sim_wins, sim_losses, sim_ties)
+        # Tiebreakers, in the order tiebreakers.py applies them: head-to-head among
+        # teams on the same winning percentage, division record, net points, coin toss
+        h2h_wins, h2h_losses, _ = record((pct[:, home_idx] == pct[:, away_idx]).astype(float))
+        division_pct = _pct(*record(division_game))
+        net_points = (home_score - away_score) @ home_onehot + (away_score - home_score) @ away_onehot
+        for columns in group_columns:
+            keys = [
+                np.broadcast_to(toss[columns], (size, len(columns))),
+                -net_points[:, columns],
+                -division_pct[:, columns],
+                -(h2h_wins - h2h_losses)[:, columns],
+                -pct[:, columns],
+            ]
+            seeded = columns[np.lexsort(keys, axis=-1)[:, :seeds]]
+            for seed in range(seeded.shape[1]):
+                seed_counts[:, seed] += np.bincount(seeded[:, seed], minlength=n_teams)
+
+    base_wins, base_losses, base_ties = np.zeros(n_teams), np.zeros(n_teams), np.zeros(n_teams)
+    for home, away, home_points, away_points in played:
+        if home_points == away_points:
+            base_ties[[home, away]] += 1
+        else:
+            winner, loser = (home, away) if home_points > away_points else (away, home)
+            base_wins[winner] += 1
+            base_losses[loser] += 1
+    rows = []
+    for idx, team in enumerate(teams):
+        seed_odds = seed_counts[idx] / iterations
+        rows.append(
+            {
+                "team_id": team.id,
+                "abbreviation": team.abbreviation,
+                "conference": team.conference.name,
+                "division": team.division.name,
+                "wins": int(base_wins[idx]),
+                "losses": int(base_losses[idx]),
+                "ties": int(base_ties[idx]),
+                "projected_wins": round(float(total_wins[idx] / iterations), 2),
+                "projected_losses": round(float(total_losses[idx] / iterations), 2),
+                "playoff_odds": round(float(seed_odds.sum()), 4),
+                "seed_odds": {str(seed + 1): round(float(p), 4) for seed, p in enumerate(seed_odds)},
+            }
+        )
+    rows.sort(key=lambda r: (r["conference"], -r["playoff_odds"], -r["projected_wins"]))
+    return rows
+
+
+def _results_version(season: Season) -> str:
+    # Changes whenever a game of the season completes (or a result is edited)
+    agg = Game.objects.filter(week__season=season, status="completed").aggregate(
+        count=Count("id"), last=Max("id"), home=Sum("home_score"), away=Sum("away_score")
+    )
+    return f"{agg['count']}-{agg['last']}-{agg['home']}-{agg['away']}"
+
+
+def cached_projections(season: Season, iterations: Optional[int] = None, seeds: Optional[int] = None) -> Dict:
+    """
+    Projections for a season, cached until the season's completed results (or
+    the league's playoff format) change.
+    """
+    if iterations is None:
+        iterations = getattr(settings, "SIM_PROJECTION_ITERATIONS", 10000)
+    version = _results_version(season)
+    fmt = league_format(season.league, seeds)
+    key = f"league:projections:{season.id}:{iterations}:{fmt['seeds']}:{int(fmt['by_conference'])}"
+    cached = cache.get(key)
+    if cached and cached["version"] == version:
+        return cached
+    payload = {
+        "version": version,
+        "iterations": iterations,
+        "teams": project_season(season, iterations=iterations, seeds=fmt["seeds"]),
+    }
+    cache.set(key, payload, getattr(settings, "SIM_PROJECTION_CACHE_SECONDS", 24 * 60 * 60))
+    return payload
@@ -0,0 +1,105 @@
+from typing import Dict, Iterable, List
+
+from django.utils import timezone
+
+from league.models import Player, TeamRatingSnapshot
+
+COMPOSITE_FIELDS = (
+    "overall_rating",
+    "rating_speed",
+    "rating_accel",
+    "rating_agility",
+    "rating_strength",
+    "rating_hands",
+    "rating_endurance",
+    "rating_intelligence",
+    "rating_discipline",
+)
+
+# Fields whose change invalidates a team's snapshot
+SNAPSHOT_FIELDS = frozenset(("team",) + COMPOSITE_FIELDS)
+
+# Skill players the sim attributes stats to, and how many per position
+SKILL_SLOTS = {"QB": 1, "RB": 2, "WR": 3, "TE": 1}
+
+DEFAULT_POWER = 60.0
+
+
+def player_composite(p) -> float:
+    # Blend overall and core ratings if present
+    core = getattr(p, "rating_speed", None)
+    if core is None:
+        return p.overall_rating
+    avg_core = (
+        p.rating_speed
+        + p.rating_accel
+        + p.rating_agility
+        + p.rating_strength
+        + p.rating_hands
+        + p.rating_endurance
+        + p.rating_intelligence
+        + p.rating_discipline
+    ) / 8
+    return 0.6 * p.overall_rating + 0.4 * avg_core
+
+
+def _snapshot_values(players: List[Player]) -> Dict:
+    ratings = {str(p.id): round(player_composite(p), 2) for p in players}
+    power = sum(ratings.values()) / len(ratings) if ratings else DEFAULT_POWER
+    return {"power": power, "player_ratings": ratings}
+
+
+def rebuild_team_snapshots(team_ids: Iterable[int]) -> Dict[int, TeamRatingSnapshot]:
+    """
+    Recompute snapshots for the given teams from one roster query and bump their version.
+    """
+    team_ids = set(team_ids)
+    if not team_ids:
+        return {}
+    rosters: Dict[int, List[Player]] = {team_id: [] for team_id in team_ids}
+    for p in Player.objects.filter(team_id__in=team_ids).only("id", "team_id", *COMPOSITE_FIELDS):
+        rosters[p.team_id].append(p)
+
+    existing = {snap.team_id: snap for snap in TeamRatingSnapshot.objects.filter(team_id__in=team_ids)}
+    to_create = []
+    to_update = []
+    for team_id, players in rosters.items():
+        values = _snapshot_values(players)
+        snap = existing.get(team_id)
+        if snap is None:
+            snap = TeamRatingSnapshot(team_id=team_id, version=1, is_stale=False, **values)
+            to_create.append(snap)
+            existing[team_id] = snap
+            continue
+        for key, value in values.items():
+            setattr(snap, key, value)
+        snap.version += 1
+        snap.is_stale = False
+        snap.updated_at = timezone.now()
+        to_update.append(snap)
+    if to_create:
+        TeamRatingSnapshot.objects.bulk_create(to_create)
+    if to_update:
+        TeamRatingSnapshot.objects.bulk_update(
+            to_update, ["power", "player_ratings", "version", "is_stale", "updated_at"]
+        )
+    return existing
+
+
+def get_team_snapshots(team_ids: Iterable[int]) -> Dict[int, TeamRatingSnapshot]:
+    """
+    Return fresh snapshots keyed by team id, rebuilding only missing or stale ones.
+    """
+    team_ids = set(team_ids)
+    snapshots = {snap.team_id: snap for snap in TeamRatingSnapshot.objects.filter(team_id__in=team_ids)}
+    dirty = {team_id for team_id in team_ids if team_id not in snapshots or snapshots[team_id].is_stale}
+    if dirty:
+        snapshots.update(rebuild_team_snapshots(dirty))
+    return snapshots
+
+
+def mark_snapshots_stale(team_ids: Iterable[int]) -> int:
+    team_ids = {team_id for team_id in team_ids if team_id}
+    if not team_ids:
+        return 0
+    return TeamRatingSnapshot.objects.filter(team_id__in=team_ids, is_stale=False).update(is_stale=True)
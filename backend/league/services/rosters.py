@@ -0,0 +1,150 @@
+import random
+from typing import List, Optional
+
+from django.db import transaction
+from django.utils import timezone
+
+from league.models import Contract, League, Player, Team
+
+FIRST_NAMES = [
+    "Alex",
+    "Jordan",
+    "Chris",
+    "Taylor",
+    "Casey",
+    "Sam",
+    "Devin",
+    "Riley",
+    "Quinn",
+    "Shawn",
+    "Marcus",
+    "Evan",
+    "Noah",
+    "Liam",
+    "Mason",
+    "Logan",
+    "Caleb",
+    "Isaiah",
+    "Dylan",
+    "Micah",
+]
+
+LAST_NAMES = [
+    "Johnson",
+    "Miller",
+    "Davis",
+    "Thompson",
+    "Lewis",
+    "Walker",
+    "Robinson",
+    "Young",
+    "Allen",
+    "Parker",
+    "Anderson",
+    "Bennett",
+    "Campbell",
+    "Cooper",
+    "Edwards",
+    "Foster",
+    "Griffin",
+    "Hayes",
+    "Mitchell",
+    "Reed",
+]
+
+POSITION_BANDS = {
+    "QB": (68, 90),
+    "RB": (62, 86),
+    "WR": (62, 88),
+    "TE": (58, 85),
+    "OL": (62, 85),
+    "DL": (62, 86),
+    "LB": (62, 85),
+    "CB": (62, 87),
+    "S": (62, 85),
+    "K": (60, 80),
+    "P": (60, 80),
+}
+
+ROSTER_TEMPLATE = [
+    ("QB", 3),
+    ("RB", 4),
+    ("WR", 6),
+    ("TE", 3),
+    ("OL", 9),
+    ("DL", 8),
+    ("LB", 6),
+    ("CB", 6),
+    ("S", 4),
+    ("K", 1),
+    ("P", 1),
+]
+
+
+def _random_name():
+    return random.choice(FIRST_NAMES), random.choice(LAST_NAMES)
+
+
+def _random_rating(position: str):
+    low, high = POSITION_BANDS.get(position, (60, 80))
+    return random.randint(low, high)
+
+
+def create_generated_player(league: League, position: str, is_rookie_pool: bool, team: Optional[Team] = None):
+    first, last = _random_name()
+    overall = _random_rating(position)
+    player = Player.objects.create(
+        league=league,
+        team=team,
+        first_name=first,
+        last_name=last,
+        position=position,
+        age=22 if is_rookie_pool else random.randint(22, 32),
+        overall_rating=overall,
+        potential_rating=min(95, overall + random.randint(5, 18)),
+        injury_status="healthy",
+        is_rookie_pool=is_rookie_pool,
+    )
+    return player
+
+
+def generate_rookie_pool(league: League) -> List[int]:
+    """
+    Create an undrafted rookie class for the league; returns the new player ids.
+    The class is created in one transaction, so a failure leaves no partial class.
+    """
+    created = []
+    with transaction.atomic():
+        # Two copies of the roster template to make ~50-60 rookies
+        for _ in range(2):
+            for pos, count in ROSTER_TEMPLATE:
+                for _ in range(count):
+                    player = create_generated_player(league, pos, is_rookie_pool=True)
+                    created.append(player.id)
+    return created
+
+
+def seed_default_rosters(league: League) -> List[int]:
+    """
+    Fill every team up to the roster template with generated players on one-year deals.
+    """
+    created = []
+    for team in league.teams.all():
+        active_count = team.players.filter(on_ir=False).count()
+        if active_count >= league.roster_size_limit:
+            continue
+        for pos, count in ROSTER_TEMPLATE:
+            current_at_pos = team.players.filter(position=pos).count()
+            needed = max(0, count - current_at_pos)
+            for _ in range(needed):
+                player = create_generated_player(league, pos, is_rookie_pool=False, team=team)
+                Contract.objects.create(
+                    player=player,
+                    team=team,
+                    salary=max(500000, player.overall_rating * 20000),
+                    bonus=0,
+                    years=1,
+                    start_year=timezone.now().year,
+                )
+                created.append(player.id)
+    return created
@@ -1,7 +1,21 @@
-from collections import deque
-from typing import List
+import random
+from collections import Counter, defaultdict, deque
+from typing import Dict, List, Optional, Sequence, Tuple
 
-from league.models import Game, League, Season, Team, Week
+from django.db import transaction
+
+from league.models import ByeWeek, Division, Game, League, Season, Team, Week
+from league.services.standings import compute_standings
+
+# NFL formula leagues: two conferences, an even number of divisions each, four teams per division
+DIVISION_SIZE = 4
+
+Pairing = Tuple[int, int]
+
+# Cap on chain swaps spent moving teams onto their configured bye weeks
+BYE_SWAP_STEPS = 200
+# ...and on sideways swaps in a row without getting more of them in place
+BYE_SWAP_STALL = 40
 
 
 def _round_robin_pairings(team_ids: List[int]) -> List[List[tuple[int, int]]]:
@@ -27,30 +41,520 @@ def _round_robin_pairings(team_ids: List[int]) -> List[List[tuple[int, int]]]:
     return rounds
 
 
-def generate_regular_season_schedule(league: League, year: int) -> Season:
-    teams = list(league.teams.all())
+def _formula_structure(teams: Sequence[Team]) -> Optional[List[List[List[int]]]]:
+    """
+    [conference][division] -> team ids, or None when the league doesn't have the
+    shape the NFL formula needs.
+    """
+    divisions = Division.objects.filter(id__in={t.division_id for t in teams}).select_related("conference")
+    division_map = {d.id: d for d in divisions}
+    by_division: Dict[int, List[int]] = defaultdict(list)
+    for team in sorted(teams, key=lambda t: t.id):
+        by_division[team.division_id].append(team.id)
+    conferences: Dict[int, List[Division]] = defaultdict(list)
+    for division in division_map.values():
+        conferences[division.conference_id].append(division)
+    if len(conferences) != 2:
+        return None
+    structure = []
+    for conf_divisions in sorted(conferences.values(), key=lambda ds: (ds[0].conference.order, ds[0].conference_id)):
+        conf_divisions.sort(key=lambda d: (d.order, d.id))
+        structure.append([by_division[d.id] for d in conf_divisions])
+    counts = {len(conf) for conf in structure}
+    if len(counts) != 1 or counts.pop() % 2:
+        return None
+    if any(len(team_ids) != DIVISION_SIZE for conf in structure for team_ids in conf):
+        return None
+    return structure
+
+
+def _place_order(league: League, year: int, structure: List[List[List[int]]]) -> List[List[List[int]]]:
+    """
+    Reorder each division by finish in the league's previous season (team id order
+    for a league's first season), so index i is the team that finished i+1th.
+    """
+    previous = league.seasons.filter(year__lt=year).order_by("-year").first()
+    rank: Dict[int, int] = {}
+    if previous:
+        rank = {row["team_id"]: idx for idx, row in enumerate(compute_standings(previous))}
+    fallback = len(rank)
+    return [
+        [sorted(team_ids, key=lambda t: (rank.get(t, fallback), t)) for team_ids in conf] for conf in structure
+    ]
+
+
+def _euler_orientation(edges: List[Pairing]) -> List[Pairing]:
+    """
+    Orient an even-degree graph along Euler circuits so every node hosts half its games.
+    """
+    adjacency: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+    for idx, (a, b) in enumerate(edges):
+        adjacency[a].append((b, idx))
+        adjacency[b].append((a, idx))
+    used = [False] * len(edges)
+    oriented: List[Pairing] = []
+    for start in list(adjacency):
+        stack = [start]
+        while stack:
+            node = stack[-1]
+            while adjacency[node] and used[adjacency[node][-1][1]]:
+                adjacency[node].pop()
+            if not adjacency[node]:
+                stack.pop()
+                continue
+            nxt, idx = adjacency[node].pop()
+            used[idx] = True
+            oriented.append((node, nxt))
+            stack.append(nxt)
+    return oriented
+
+
+def _cross_rounds(left: List[int], right: List[int], flip: bool) -> List[List[Pairing]]:
+    # Full home-and-away-balanced series between two divisions, one perfect matching per round
+    size = len(left)
+    rounds = []
+    for shift in range(size):
+        pairs = []
+        for i, home in enumerate(left):
+            j = (i + shift) % size
+            away = right[j]
+            pairs.append((home, away) if (i + j + flip) % 2 == 0 else (away, home))
+        rounds.append(pairs)
+    return rounds
+
+
+def _merge_rounds(parts: List[List[List[Pairing]]]) -> List[List[Pairing]]:
+    # Zip per-group rounds into league-wide rounds
+    return [sum(group, []) for group in zip(*parts)]
+
+
+def formula_rounds(structure: List[List[List[int]]], year: int) -> Dict[str, List[List[Pairing]]]:
+    """
+    The season's games under the NFL formula, grouped into rounds where every
+    team plays exactly once:
+
+        division     home and away against each division rival
+        intra        every team in a rotating same-conference division
+        inter        every team in a rotating other-conference division
+        same_place   same-place finisher in each remaining same-conference division
+        extra        same-place finisher in another other-conference division (the 17th game)
+
+    ``structure`` lists team ids by conference and division, in last season's finishing order.
+    """
+    division_count = len(structure[0])
+    division_rounds = []
+    for conf in structure:
+        for team_ids in conf:
+            first_leg = _round_robin_pairings(team_ids)
+            division_rounds.append(first_leg + [[(away, home) for home, away in rnd] for rnd in first_leg])
+
+    matchings = _round_robin_pairings(list(range(division_count)))
+    rotation = year % len(matchings)
+    intra_parts = []
+    same_place_edges: List[Pairing] = []
+    for k, matching in enumerate(matchings):
+        if k == rotation:
+            for conf in structure:
+                for a, b in matching:
+                    intra_parts.append(_cross_rounds(conf[a], conf[b], bool(year % 2)))
+        else:
+            same_place_edges.extend(matching)
+    # Each division hosts half of its same-place games
+    orientation = set(_euler_orientation(same_place_edges))
+    same_place = []
+    for matching in (m for idx, m in enumerate(matchings) if idx != rotation):
+        pairs = []
+        for conf in structure:
+            for a, b in matching:
+                home, away = (a, b) if (a, b) in orientation else (b, a)
+                pairs.extend((conf[home][place], conf[away][place]) for place in range(DIVISION_SIZE))
+        same_place.append(pairs)
+
+    first, second = structure
+    inter_parts = [
+        _cross_rounds(first[i], second[(i + year) % division_count], bool((year // 2) % 2))
+        for i in range(division_count)
+    ]
+    extra = []
+    for i in range(division_count):
+        opponent = second[(i + year + division_count // 2) % division_count]
+        for place in range(DIVISION_SIZE):
+            pair = (first[i][place], opponent[place])
+            extra.append(pair if year % 2 == 0 else pair[::-1])
+
+    return {
+        "division": _merge_rounds(division_rounds),
+        "intra": _merge_rounds(intra_parts),
+        "inter": _merge_rounds(inter_parts),
+        "same_place": same_place,
+        "extra": [extra],
+    }
+
+
+def _spread(low: int, high: int, count: int) -> List[int]:
+    if count <= 1:
+        return [low]
+    return sorted({low + round(idx * (high - low) / (count - 1)) for idx in range(count)})
+
+
+def assign_weeks(
+    rounds: Dict[str, List[List[Pairing]]],
+    division_of: Dict[int, int],
+    configured_byes: Dict[int, int],
+) -> Tuple[Dict[int, List[Pairing]], Dict[int, int]]:
+    """
+    Lay the rounds out over ``games + 1`` weeks so every team gets exactly one bye.
+
+    Divisional rounds only pair teams of the same division, so they go into a set
+    of "bye weeks" one larger than their count: each division sits out one of
+    those weeks (its bye) and plays its divisional rounds, in order, in the rest.
+    Every other round is a full league-wide week. Each division's bye starts at
+    the week most of its configured byes ask for; teams configured for another
+    week are then moved there one at a time (see ``_honour_byes``).
+    Returns ({week number: [(home, away)]}, {team id: bye week}).
+    """
+    division_rounds = rounds["division"]
+    other_rounds = []
+    for intra, inter in zip(rounds["intra"], rounds["inter"]):
+        other_rounds.extend([intra, inter])
+    other_rounds[2:2] = rounds["same_place"][:1]
+    other_rounds.extend(rounds["same_place"][1:] + rounds["extra"])
+    week_count = len(division_rounds) + len(other_rounds) + 1
+    slot_count = len(division_rounds) + 1
+
+    requested: Dict[int, Counter] = defaultdict(Counter)
+    for team_id, week in configured_byes.items():
+        if not 1 <= week <= week_count:
+            raise ValueError(f"Bye week {week} is outside the {week_count}-week season.")
+        requested[division_of[team_id]][week] += 1
+    # The divisional layout has room for slot_count bye weeks: the most requested ones
+    totals = sum(requested.values(), Counter())
+    fixed = sorted(sorted(totals, key=lambda week: (-totals[week], week))[:slot_count])
+    division_byes: Dict[int, int] = {}
+    for division_id, weeks in requested.items():
+        usable = [week for week in weeks if week in fixed]
+        if usable:
+            division_byes[division_id] = min(usable, key=lambda week: (-weeks[week], week))
+
+    # Byes fall in the middle of the season; the last week is a divisional week
+    low, high = week_count // 4 + 1, max(week_count // 4 + 1, week_count - 4)
+    defaults = _spread(low, high, slot_count - 1) + [week_count]
+    slots = list(fixed)
+    for week in defaults + sorted(range(1, week_count + 1), key=lambda w: abs(w - (low + high) / 2)):
+        if len(slots) == slot_count:
+            break
+        if week not in slots:
+            slots.append(week)
+    slots.sort()
+
+    eligible = [week for week in slots if low <= week <= high] or slots
+    load = Counter(division_byes.values())
+    for division_id in sorted(set(division_of.values())):
+        if division_id in division_byes:
+            continue
+        week = min(eligible, key=lambda w: (load[w], eligible.index(w)))
+        division_byes[division_id] = week
+        load[week] += 1
+
+    schedule: Dict[int, List[Pairing]] = {week: [] for week in range(1, week_count + 1)}
+    for rnd_index, pairs in enumerate(division_rounds):
+        for home, away in pairs:
+            bye_index = slots.index(division_byes[division_of[home]])
+            week = slots[rnd_index if rnd_index < bye_index else rnd_index + 1]
+            schedule[week].append((home, away))
+    open_weeks = [week for week in range(1, week_count + 1) if week not in slots]
+    for week, pairs in zip(open_weeks, other_rounds):
+        schedule[week].extend(pairs)
+    byes = {team_id: division_byes[division_id] for team_id, division_id in division_of.items()}
+    _honour_byes(schedule, byes, configured_byes)
+    return schedule, byes
+
+
+def _swap_bye(weeks_of: Dict[int, Dict[int, Pairing]], byes: Dict[int, int], team_id: int, target: int) -> None:
+    """
+    Move a team's bye to ``target`` by swapping the two weeks along the chain of
+    games that starts with its ``target`` game (a Kempe chain). Games keep their
+    home and away sides; the team at the far end of the chain has its bye move
+    too, which keeps every week's idle teams an even number.
+    """
+    source = byes[team_id]
+    chain = []
+    node, week = team_id, target
+    while week in weeks_of[node]:
+        pair = weeks_of[node][week]
+        chain.append((pair, week))
+        node = pair[1] if pair[0] == node else pair[0]
+        week = source if week == target else target
+    for pair, week in chain:
+        for team in pair:
+            del weeks_of[team][week]
+    for pair, week in chain:
+        for team in pair:
+            weeks_of[team][source if week == target else target] = pair
+    byes[team_id] = target
+    byes[node] = source if target in weeks_of[node] else target
+
+
+def _honour_byes(schedule: Dict[int, List[Pairing]], byes: Dict[int, int], configured: Dict[int, int]) -> None:
+    """
+    Move teams whose configured bye differs from their division's onto it with
+    chain swaps (directly, or through another week first). Each step keeps the
+    swap that leaves the most configured byes in place, taking sideways steps
+    (seeded, so schedules stay reproducible) to get past dead ends. Raises
+    ValueError when the byes still can't all be honoured, e.g. a week where an
+    odd number of teams must be idle.
+    """
+    if all(byes[team_id] == week for team_id, week in configured.items()):
+        return
+    if len(configured) == len(byes) and any(count % 2 for count in Counter(configured.values()).values()):
+        raise ValueError("Configured bye weeks can't all be honoured; idle teams must pair up every week.")
+    weeks_of: Dict[int, Dict[int, Pairing]] = defaultdict(dict)
+    for week, pairs in schedule.items():
+        for pair in pairs:
+            for team_id in pair:
+                weeks_of[team_id][week] = pair
+    rng = random.Random(len(configured))
+
+    def honoured(state_byes):
+        return sum(state_byes[team_id] == week for team_id, week in configured.items())
+
+    best, stalled = honoured(byes), 0
+    for _ in range(BYE_SWAP_STEPS):
+        pending = sorted(team_id for team_id, week in configured.items() if byes[team_id] != week)
+        if not pending or stalled > BYE_SWAP_STALL:
+            break
+        current = honoured(byes)
+        options = []
+        for team_id in pending:
+            for via in [None, *schedule]:
+                if via in (byes[team_id], configured[team_id]):
+                    continue
+                trial_weeks = {team: dict(weeks) for team, weeks in weeks_of.items()}
+                trial_byes = dict(byes)
+                if via is not None:
+                    _swap_bye(trial_weeks, trial_byes, team_id, via)
+                _swap_bye(trial_weeks, trial_byes, team_id, configured[team_id])
+                options.append((honoured(trial_byes), trial_weeks, trial_byes))
+        top = max(score for score, _, _ in options)
+        if top < current:
+            break
+        stalled = 0 if top > best else stalled + 1
+        best = max(best, top)
+        _, trial_weeks, trial_byes = rng.choice([option for option in options if option[0] == top])
+        weeks_of.clear()
+        weeks_of.update(trial_weeks)
+        byes.update(trial_byes)
+    if any(byes[team_id] != week for team_id, week in configured.items()):
+        raise ValueError("Configured bye weeks can't all be honoured; idle teams must pair up every week.")
+    for week in schedule:
+        schedule[week] = sorted({weeks_of[team_id][week] for team_id in weeks_of if week in weeks_of[team_id]})
+
+
+def validate_schedule(
+    schedule: Dict[int, List[Pairing]],
+    byes: Dict[int, int],
+    division_of: Dict[int, int],
+    games_per_team: int,
+) -> None:
+    """
+    Check a generated schedule in memory; raises ValueError on the first violation.
+    """
+    games_played = Counter()
+    home_games = Counter()
+    meetings = Counter()
+    for week, pairs in schedule.items():
+        seen = set()
+        for home, away in pairs:
+            for team_id in (home, away):
+                if team_id in seen:
+                    raise ValueError(f"Team {team_id} plays twice in week {week}.")
+                if byes.get(team_id) == week:
+                    raise ValueError(f"Team {team_id} plays during its bye week {week}.")
+                seen.add(team_id)
+                games_played[team_id] += 1
+            home_games[home] += 1
+            meetings[frozenset((home, away))] += 1
+        idle = set(division_of) - seen
+        if idle != {team_id for team_id, bye in byes.items() if bye == week}:
+            raise ValueError(f"Week {week} has teams idle outside their bye.")
+    for team_id in division_of:
+        if games_played[team_id] != games_per_team:
+            raise ValueError(f"Team {team_id} has {games_played[team_id]} games, expected {games_per_team}.")
+        if abs(2 * home_games[team_id] - games_per_team) > 1:
+            raise ValueError(f"Team {team_id} has {home_games[team_id]} home games of {games_per_team}.")
+    for pair, count in meetings.items():
+        a, b = tuple(pair)
+        expected = 2 if division_of[a] == division_of[b] else 1
+        if count != expected:
+            raise ValueError(f"Teams {a} and {b} meet {count} times, expected {expected}.")
+
+
+def formula_schedule(league: League, year: int, teams: Sequence[Team]) -> Optional[Dict[int, List[Pairing]]]:
+    """
+    Validated {week: [(home, away)]} under the NFL formula, or None when the
+    league's structure doesn't fit it.
+    """
+    structure = _formula_structure(teams)
+    if structure is None:
+        return None
+    structure = _place_order(league, year, structure)
+    rounds = formula_rounds(structure, year)
+    division_of = {t.id: t.division_id for t in teams}
+    configured = {}
+    for team_id, week in ByeWeek.objects.filter(season__league=league, season__year=year).values_list(
+        "team_id", "week_number"
+    ):
+        if configured.setdefault(team_id, week) != week:
+            raise ValueError(f"Team {team_id} has more than one configured bye week.")
+    schedule, byes = assign_weeks(rounds, division_of, configured)
+    games_per_team = len(schedule) - 1
+    validate_schedule(schedule, byes, division_of, games_per_team)
+    return schedule
+
+
+def round_robin_schedule(teams: Sequence[Team]) -> Dict[int, List[Pairing]]:
+    schedule = {}
+    for idx, matchups in enumerate(_round_robin_pairings([t.id for t in teams]), start=1):
+        # Alternate home/away each week for fairness
+        schedule[idx] = [(away, home) if idx % 2 == 0 else (home, away) for home, away in matchups]
+    return schedule
+
+
+def build_schedule(league: League, year: int, teams: Sequence[Team]) -> Dict[int, List[Pairing]]:
+    """
+    {week number: [(home, away)]} for the season. Leagues shaped like the NFL (two
+    conferences, an even number of four-team divisions in each) get the NFL
+    formula schedule with one bye per team, honouring configured ByeWeek rows;
+    any other league gets a single round-robin.
+    """
     if len(teams) < 2:
         raise ValueError("At least two teams are required to generate a schedule.")
+    return formula_schedule(league, year, teams) or round_robin_schedule(teams)
+
+
+@transaction.atomic
+def generate_regular_season_schedule(league: League, year: int) -> Season:
+    """
+    Build the regular season for ``year`` from scratch, replacing any existing
+    weeks (and, by cascade, their games and results) in one transaction. See ``regenerate_schedule``
+    for a non-destructive update.
+    """
+    schedule = build_schedule(league, year, list(league.teams.all()))
 
     season, _ = Season.objects.get_or_create(league=league, year=year)
-    # Clear existing weeks/games for a regenerate
+    # Clear existing weeks/games for a regenerate; their results go with them
     season.weeks.all().delete()
+    season.team_records.all().delete()
+    season.team_stat_totals.all().delete()
+    season.player_stat_totals.all().delete()
+    season.playoff_matchups.all().delete()
+    season.playoff_seeds.all().delete()
 
-    team_ids = [t.id for t in teams]
-    rounds = _round_robin_pairings(team_ids)
-
-    week_objs = []
-    for idx, matchups in enumerate(rounds, start=1):
-        week = Week.objects.create(season=season, number=idx, is_playoffs=False)
-        week_objs.append(week)
-        for home_id, away_id in matchups:
-            # Alternate home/away each week for fairness
-            if idx % 2 == 0:
-                home_id, away_id = away_id, home_id
-            Game.objects.create(
-                week=week,
-                home_team_id=home_id,
-                away_team_id=away_id,
-            )
-
+    weeks = Week.objects.bulk_create(
+        [Week(season=season, number=number, is_playoffs=False) for number in sorted(schedule)]
+    )
+    Game.objects.bulk_create(
+        [
+            Game(week=week, home_team_id=home_id, away_team_id=away_id)
+            for week in weeks
+            for home_id, away_id in schedule[week.number]
+        ]
+    )
     return season
+
+
+@transaction.atomic
+def regenerate_schedule(league: League, year: int) -> Tuple[Season, Dict]:
+    """
+    Bring an existing season in line with a freshly built schedule without
+    touching played games. Completed and in-progress games are kept and count
+    against the new schedule; the remaining scheduled games are matched to it
+    (same week and teams, then same week with home/away swapped, then same
+    teams in another week) and only the differences are written. New games that
+    would double-book a team in a week it already played are skipped.
+
+    Returns (season, diff) where diff counts kept, unchanged, inserted, updated
+    and deleted games and lists the skipped (week, home, away) matchups.
+    """
+    target = build_schedule(league, year, list(league.teams.all()))
+    season, _ = Season.objects.get_or_create(league=league, year=year)
+    weeks = {week.number: week for week in season.weeks.filter(is_playoffs=False)}
+    existing = list(Game.objects.filter(week__in=weeks.values()).select_related("week"))
+    played = [game for game in existing if game.status != "scheduled"]
+    pending = [game for game in existing if game.status == "scheduled"]
+
+    # Played games satisfy the matchups they cover, wherever they landed
+    remaining = Counter(frozenset(pair) for pairs in target.values() for pair in pairs)
+    busy = set()
+    for game in played:
+        remaining[frozenset((game.home_team_id, game.away_team_id))] -= 1
+        busy.update({(game.week.number, game.home_team_id), (game.week.number, game.away_team_id)})
+    wanted: List[Tuple[int, int, int]] = []
+    skipped: List[Tuple[int, int, int]] = []
+    for number in sorted(target):
+        for home, away in target[number]:
+            pair = frozenset((home, away))
+            if remaining[pair] <= 0:
+                continue
+            remaining[pair] -= 1
+            if (number, home) in busy or (number, away) in busy:
+                skipped.append((number, home, away))
+            else:
+                wanted.append((number, home, away))
+
+    exact = defaultdict(list)
+    swapped = defaultdict(list)
+    moved = defaultdict(list)
+    for game in pending:
+        exact[(game.week.number, game.home_team_id, game.away_team_id)].append(game)
+        swapped[(game.week.number, game.away_team_id, game.home_team_id)].append(game)
+        moved[(game.home_team_id, game.away_team_id)].append(game)
+    unmatched = {game.id for game in pending}
+    updates: List[Tuple[Game, Tuple[int, int, int]]] = []
+    # Exact matches first, then home/away swaps, then week moves, so no looser
+    # match steals a game that fits a later matchup exactly
+    passes = (
+        (exact, lambda key: key),
+        (swapped, lambda key: key),
+        (moved, lambda key: key[1:]),
+    )
+    todo = list(wanted)
+    unchanged = 0
+    for pass_index, (index, lookup) in enumerate(passes):
+        left = []
+        for key in todo:
+            game = next((g for g in index.get(lookup(key), []) if g.id in unmatched), None)
+            if game is None:
+                left.append(key)
+                continue
+            unmatched.discard(game.id)
+            if pass_index == 0:
+                unchanged += 1
+            else:
+                updates.append((game, key))
+        todo = left
+    inserts = todo
+
+    missing = sorted({number for number, _, _ in inserts + [key for _, key in updates]} - set(weeks))
+    for week in Week.objects.bulk_create([Week(season=season, number=n, is_playoffs=False) for n in missing]):
+        weeks[week.number] = week
+    for game, (number, home, away) in updates:
+        game.week = weeks[number]
+        game.home_team_id = home
+        game.away_team_id = away
+    Game.objects.bulk_update([game for game, _ in updates], ["week", "home_team", "away_team"])
+    Game.objects.bulk_create(
+        [Game(week=weeks[number], home_team_id=home, away_team_id=away) for number, home, away in inserts]
+    )
+    deleted = Game.objects.filter(id__in=unmatched).delete()[1].get("league.Game", 0) if unmatched else 0
+    # Drop regular weeks the new schedule no longer uses once they're empty
+    season.weeks.filter(is_playoffs=False, games__isnull=True).exclude(number__in=target).delete()
+
+    return season, {
+        "kept": len(played),
+        "unchanged": unchanged,
+        "inserted": len(inserts),
+        "updated": len(updates),
+        "deleted": deleted,
+        "skipped": [{"week": number, "home_team_id": home, "away_team_id": away} for number, home, away in skipped],
+    }
@@ -0,0 +1,151 @@
+"""
+End-to-end season pipeline for long-lived leagues: schedule, regular season,
+playoffs, then rollover into the next year. Each season runs in its own
+transaction so a failure part-way leaves earlier seasons committed.
+"""
+import time
+from typing import Callable, Dict, List, Optional
+
+from django.db import models, transaction
+from django.utils import timezone
+
+from league.models import Game, Injury, League, Player, Season
+from league.services.depth_charts import mark_depth_charts_stale
+from league.services.playoffs import (
+    advance_playoff_rounds,
+    bracket_ready,
+    playoff_champion,
+    record_playoff_results,
+)
+from league.services.schedule_generator import generate_regular_season_schedule
+from league.services.season_sim import simulate_season, simulate_week
+from league.services.sim_metrics import record_sim_run
+from league.services.simulator import settle_tied_games
+
+# Tied playoff games are re-simulated (standing in for overtime) up to this many times; any
+# still tied after that are settled by a sudden-death field goal (see ``settle_tied_games``)
+PLAYOFF_TIE_RESIMS = 10
+
+
+def simulate_playoffs(
+    season: Season,
+    seeds: Optional[int] = None,
+    store_plays: bool = False,
+    detail_level: str = "full",
+    user=None,
+) -> List[Game]:
+    """
+    Run the whole postseason: draw the bracket if needed, then sim each round's
+    games as one batch per week and advance the bracket from their results,
+    until a champion is decided (every playoff game ends with a winner). Seeds and the bracket plan are loaded once and
+    shared by every round. ``seeds`` overrides the league's playoff format seed
+    count. Raises ValueError while the regular season is unfinished, or when
+    the season has playoff games but no stored bracket.
+    """
+    if not bracket_ready(season):
+        raise ValueError("The regular season isn't finished yet.")
+    advance_playoff_rounds(season, seeds=seeds)
+    played: List[Game] = []
+    games = list(
+        Game.objects.filter(week__season=season, week__is_playoffs=True, status="scheduled").select_related(
+            "week", "home_team", "away_team"
+        )
+    )
+    while games:
+        by_week: Dict[int, List[Game]] = {}
+        for game in games:
+            by_week.setdefault(game.week_id, []).append(game)
+        for week_games in by_week.values():
+            week = week_games[0].week
+            simulate_week(week, week_games, store_plays=store_plays, user=user, detail_level=detail_level)
+            tied = [game for game in week_games if game.home_score == game.away_score]
+            for _ in range(PLAYOFF_TIE_RESIMS):
+                if not tied:
+                    break
+                simulate_week(week, tied, store_plays=store_plays, user=user, detail_level=detail_level)
+                tied = [game for game in tied if game.home_score == game.away_score]
+            settle_tied_games(tied)
+        played.extend(games)
+        created = record_playoff_results(season, games)
+        games = list(Game.objects.filter(id__in=created).select_related("week", "home_team", "away_team"))
+    return played
+
+
+def playoff_simulation_summary(season: Season, games: List[Game]) -> Dict:
+    """Response body for a postseason sim: the games played and the champion, if decided."""
+    champion = playoff_champion(season)
+    return {
+        "simulated": [
+            {
+                "game_id": game.id,
+                "week": game.week.number,
+                "home_team": game.home_team_id,
+                "away_team": game.away_team_id,
+                "home_score": game.home_score,
+                "away_score": game.away_score,
+                "status": game.status,
+            }
+            for game in games
+        ],
+        "champion": (
+            {
+                "team_id": champion.team_id,
+                "team": champion.team.abbreviation,
+                "conference": champion.conference,
+                "seed": champion.seed,
+            }
+            if champion
+            else None
+        ),
+    }
+
+
+def rollover_season(league: League) -> int:
+    """
+    Carry the league into its next year: everyone ages a year and injuries heal
+    over the offseason. Returns the number of players aged.
+    """
+    players = Player.objects.filter(models.Q(league=league) | models.Q(team__league=league))
+    now = timezone.now()
+    Injury.objects.filter(league=league, status="active").update(status="resolved", resolved_at=now)
+    # Bulk updates skip the player signals, so flag the charts the healed players sit on
+    healed = players.filter(models.Q(on_ir=True) | ~models.Q(injury_status="healthy"))
+    mark_depth_charts_stale(healed.values_list("team_id", "position"))
+    healed.update(on_ir=False, injury_status="healthy", updated_at=now)
+    return players.update(age=models.F("age") + 1, updated_at=now)
+
+
+def simulate_seasons(
+    league: League,
+    count: int,
+    start_year: Optional[int] = None,
+    seeds: Optional[int] = None,
+    store_plays: bool = False,
+    detail_level: str = "full",
+    on_season: Optional[Callable[[Season, float], None]] = None,
+) -> List[Season]:
+    """
+    Generate and play ``count`` full seasons back to back, committing at each
+    season boundary. ``start_year`` defaults to the year after the league's
+    latest season. ``on_season(season, seconds)`` is called after each commit.
+    """
+    if start_year is None:
+        latest = league.seasons.aggregate(models.Max("year"))["year__max"]
+        start_year = latest + 1 if latest is not None else timezone.now().year
+    seasons = []
+    for year in range(start_year, start_year + count):
+        started = time.perf_counter()
+        # The run is recorded outside the season's transaction so a failed season keeps its SimRun
+        with record_sim_run("season", league_id=league.id) as run:
+            with transaction.atomic():
+                season = generate_regular_season_schedule(league, year)
+                progress = simulate_season(season, store_plays=store_plays, detail_level=detail_level)
+                if progress.status != "completed":
+                    raise RuntimeError(f"Season {year} failed: {progress.error}")
+                simulate_playoffs(season, seeds=seeds, store_plays=store_plays, detail_level=detail_level)
+                rollover_season(league)
+            run.season_id = season.id
+        seasons.append(season)
+        if on_season:
+            on_season(season, time.perf_counter() - started)
+    return seasons
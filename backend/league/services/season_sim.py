@@ -0,0 +1,174 @@
+import time
+from typing import Callable, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from league.models import Game, Season, SeasonSimulation, SimCheckpoint, Week
+from league.services.sim_metrics import record_sim_run
+from league.services.simulator import persist_sim_results, simulate_games
+
+
+def _chunk_size(chunk_size: Optional[int]) -> int:
+    if chunk_size is None:
+        chunk_size = getattr(settings, "SIM_CHUNK_SIZE", 32)
+    return max(1, int(chunk_size))
+
+
+def _open_checkpoint(week: Week, games: List[Game], chunk_size: int) -> SimCheckpoint:
+    """
+    Resume the week's unfinished checkpoint if there is one, else start a new one.
+    """
+    checkpoint = SimCheckpoint.objects.filter(week=week).exclude(status="completed").first()
+    if checkpoint is None:
+        return SimCheckpoint.objects.create(week=week, chunk_size=chunk_size, games_total=len(games))
+    checkpoint.status = "running"
+    checkpoint.chunk_size = chunk_size
+    checkpoint.attempts += 1
+    checkpoint.error = ""
+    checkpoint.games_total = len(set(checkpoint.done_game_ids) | {game.id for game in games})
+    checkpoint.save(update_fields=["status", "chunk_size", "attempts", "error", "games_total", "updated_at"])
+    return checkpoint
+
+
+def simulate_week(
+    week: Week,
+    games: Optional[List[Game]] = None,
+    store_plays: bool = True,
+    user=None,
+    detail_level: str = "full",
+    chunk_size: Optional[int] = None,
+) -> List[Game]:
+    """
+    Simulate and persist a week's scheduled games (or the given subset) in chunks
+    of ``chunk_size`` (default SIM_CHUNK_SIZE), each committed in its own short
+    transaction together with a SimCheckpoint update. If a chunk fails, games
+    already committed stay done and a rerun picks up the rest. Returns the games
+    simulated by this call.
+    """
+    size = _chunk_size(chunk_size)
+    with record_sim_run("week", league_id=week.season.league_id, season_id=week.season_id, user=user):
+        if games is None:
+            games = list(week.games.filter(status="scheduled").select_related("home_team", "away_team"))
+        if not games:
+            return []
+        checkpoint = _open_checkpoint(week, games, size)
+        done = set(checkpoint.done_game_ids)
+        pending = [game for game in games if game.id not in done]
+        try:
+            for start in range(0, len(pending), size):
+                chunk = pending[start : start + size]
+                results = simulate_games(chunk, detail_level=detail_level)
+                with transaction.atomic():
+                    persist_sim_results(list(zip(chunk, results)), store_plays=store_plays)
+                    checkpoint.done_game_ids = checkpoint.done_game_ids + [game.id for game in chunk]
+                    checkpoint.games_done = len(checkpoint.done_game_ids)
+                    if start + size >= len(pending):
+                        checkpoint.status = "completed"
+                    checkpoint.save(update_fields=["done_game_ids", "games_done", "status", "updated_at"])
+        except Exception as exc:
+            checkpoint.status = "failed"
+            checkpoint.error = str(exc)
+            checkpoint.save(update_fields=["status", "error", "updated_at"])
+            raise
+        if checkpoint.status != "completed":
+            # Everything was already done by an earlier attempt
+            checkpoint.status = "completed"
+            checkpoint.save(update_fields=["status", "updated_at"])
+    return pending
+
+
+def simulate_weeks(
+    weeks: Iterable[Week],
+    max_workers: Optional[int] = None,
+    store_plays: bool = True,
+    detail_level: str = "full",
+    chunk_size: Optional[int] = None,
+) -> List[Game]:
+    """
+    Simulate the scheduled games of many weeks (e.g. one per league for a nightly
+    run) in a single fan-out across worker processes, then persist them in
+    chunked transactions. Only scheduled games are picked up, so a rerun after a
+    failure resumes where the last committed chunk left off.
+    """
+    weeks = list(weeks)
+    size = _chunk_size(chunk_size)
+    league_ids = set(Season.objects.filter(weeks__in=weeks).values_list("league_id", flat=True))
+    with record_sim_run("batch", league_id=league_ids.pop() if len(league_ids) == 1 else None):
+        games = list(
+            Game.objects.filter(week__in=weeks, status="scheduled").select_related("home_team", "away_team")
+        )
+        results = simulate_games(games, max_workers=max_workers, detail_level=detail_level)
+        pairs = list(zip(games, results))
+        for start in range(0, len(pairs), size):
+            with transaction.atomic():
+                persist_sim_results(pairs[start : start + size], store_plays=store_plays)
+    return games
+
+
+def next_regular_weeks(seasons) -> List[Week]:
+    """
+    The earliest regular-season week that still has scheduled games, per season.
+    """
+    weeks = []
+    for season in seasons:
+        week = remaining_regular_weeks(season).first()
+        if week:
+            weeks.append(week)
+    return weeks
+
+
+def remaining_regular_weeks(season: Season, through_week: Optional[int] = None):
+    weeks = season.weeks.filter(is_playoffs=False, games__status="scheduled").distinct().order_by("number")
+    if through_week is not None:
+        weeks = weeks.filter(number__lte=through_week)
+    return weeks
+
+
+def simulate_season(
+    season: Season,
+    through_week: Optional[int] = None,
+    user=None,
+    store_plays: bool = False,
+    on_week: Optional[Callable[[int, int], None]] = None,
+    detail_level: str = "full",
+    chunk_size: Optional[int] = None,
+) -> SeasonSimulation:
+    """
+    Sim every remaining regular-season week in order, committing in chunks (see
+    ``simulate_week``) and recording progress on a SeasonSimulation row that other
+    requests can poll. A rerun after a failure resumes with the unfinished games.
+    Play-by-play is not stored by default; it is replayed from each game's seed.
+    ``on_week(weeks_done, weeks_total)`` is called after each week commits.
+    """
+    weeks = list(remaining_regular_weeks(season, through_week))
+    progress = SeasonSimulation.objects.create(
+        season=season,
+        requested_by=user if getattr(user, "is_authenticated", False) else None,
+        through_week=through_week,
+        weeks_total=len(weeks),
+    )
+    started = time.perf_counter()
+    try:
+        with record_sim_run("season", league_id=season.league_id, season_id=season.id, user=user):
+            for week in weeks:
+                games = simulate_week(
+                    week, store_plays=store_plays, detail_level=detail_level, chunk_size=chunk_size
+                )
+                progress.weeks_done += 1
+                progress.games_done += len(games)
+                progress.current_week = week.number
+                progress.elapsed_ms = int((time.perf_counter() - started) * 1000)
+                progress.save(update_fields=["weeks_done", "games_done", "current_week", "elapsed_ms"])
+                if on_week:
+                    on_week(progress.weeks_done, progress.weeks_total)
+    except Exception as exc:
+        progress.status = "failed"
+        progress.error = str(exc)
+    else:
+        progress.status = "completed"
+    progress.elapsed_ms = int((time.perf_counter() - started) * 1000)
+    progress.finished_at = timezone.now()
+    progress.save(update_fields=["status", "error", "elapsed_ms", "finished_at"])
+    return progress
@@ -0,0 +1,347 @@
+"""
+Vectorized play engine.
+
+Plays every game of a batch at once as NumPy arrays of shape
+(games, plays). The model is the one ``simulator.simulate_game`` has always
+used: 4 quarters of 12 plays, possession weighted by relative team power,
+gaussian yardage and probabilistic TD/FG/turnover outcomes.
+
+This module is deliberately free of Django imports so it can be used from
+worker processes and projection code without touching the ORM.
+"""
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+QUARTERS = 4
+PLAYS_PER_QUARTER = 12
+PLAYS_PER_GAME = QUARTERS * PLAYS_PER_QUARTER
+QUARTER_SECONDS = 900
+
+PLAY_RUN = 0
+PLAY_PASS = 1
+PLAY_TD_RUN = 2
+PLAY_TD_PASS = 3
+PLAY_FG = 4
+PLAY_TURNOVER = 5
+
+TD_POINTS = 7
+FG_POINTS = 3
+
+# Sudden-death overtime period for playoff games that can't end tied (see overtime_field_goal)
+OVERTIME_SECONDS = 600
+
+# How much of a game to build: plays + box score, box score only, or just the score
+DETAIL_LEVELS = ("full", "stats", "score")
+
+PLAYER_STAT_FIELDS = [
+    "pass_att",
+    "pass_cmp",
+    "pass_yds",
+    "pass_td",
+    "pass_int",
+    "rush_att",
+    "rush_yds",
+    "rush_td",
+    "rec",
+    "rec_yds",
+    "rec_td",
+    "tackles",
+    "sacks",
+    "interceptions",
+    "fumbles",
+]
+
+
+def _draw_plays(rng: np.random.Generator, n_games: int) -> Dict[str, np.ndarray]:
+    shape = (n_games, PLAYS_PER_GAME)
+    return {
+        "elapsed": rng.integers(15, 46, size=(n_games, QUARTERS, PLAYS_PER_QUARTER)),
+        "possession": rng.random(shape),
+        "yardage": rng.standard_normal(shape),
+        "play_call": rng.random(shape),
+        "rolls": rng.random((n_games, 3, PLAYS_PER_GAME)),
+    }
+
+
+def simulate_matchups(
+    home_power: Sequence[float],
+    away_power: Sequence[float],
+    rng: Optional[np.random.Generator] = None,
+    rngs: Optional[Sequence[np.random.Generator]] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Play N games at once. Returns (N, PLAYS_PER_GAME) arrays keyed by
+    quarter, clock, home_ball, yards, play_type, home_score and away_score
+    (scores are cumulative after each play).
+
+    Pass ``rngs`` (one generator per game) to give every game its own
+    reproducible stream; otherwise all draws come from ``rng``.
+    """
+    home = np.asarray(home_power, dtype=float).reshape(-1, 1)
+    away = np.asarray(away_power, dtype=float).reshape(-1, 1)
+    n_games = home.shape[0]
+    shape = (n_games, PLAYS_PER_GAME)
+    if rngs is not None:
+        per_game = [_draw_plays(game_rng, 1) for game_rng in rngs]
+        draws = {key: np.concatenate([d[key] for d in per_game]) for key in per_game[0]}
+    else:
+        draws = _draw_plays(rng or np.random.default_rng(), n_games)
+
+    clock = np.maximum(0, QUARTER_SECONDS - np.cumsum(draws["elapsed"], axis=2)).reshape(shape)
+    quarter = np.broadcast_to(np.repeat(np.arange(1, QUARTERS + 1), PLAYS_PER_QUARTER), shape)
+
+    home_ball = draws["possession"] < home / (home + away)
+    edge = np.where(home_ball, home - away, away - home)
+    yards = np.trunc(edge * 0.2 + 4 + 8 * draws["yardage"]).astype(np.int64)
+    yards = np.clip(yards, -10, 80)
+
+    is_run = draws["play_call"] < 0.45
+    rolls = draws["rolls"]
+    td = (yards >= 20) & (rolls[:, 0] < 0.15)
+    fg = ~td & (yards >= 3) & (rolls[:, 1] < 0.25)
+    turnover = ~td & ~fg & (yards < -5) & (rolls[:, 2] < 0.1)
+
+    play_type = np.where(is_run, PLAY_RUN, PLAY_PASS)
+    play_type = np.where(td, play_type + PLAY_TD_RUN, play_type)
+    play_type = np.where(fg, PLAY_FG, play_type)
+    play_type = np.where(turnover, PLAY_TURNOVER, play_type)
+
+    points = np.where(td, TD_POINTS, np.where(fg, FG_POINTS, 0))
+    home_score = np.cumsum(np.where(home_ball, points, 0), axis=1)
+    away_score = np.cumsum(np.where(home_ball, 0, points), axis=1)
+
+    return {
+        "quarter": quarter,
+        "clock": clock,
+        "home_ball": home_ball,
+        "yards": yards,
+        "play_type": play_type,
+        "home_score": home_score,
+        "away_score": away_score,
+    }
+
+
+def new_seed() -> int:
+    # 63 bits so it fits a signed BIGINT column
+    return int(np.random.SeedSequence().generate_state(1, np.uint64)[0] >> np.uint64(1))
+
+
+def replay_plays(seed: int, home_power: float, away_power: float) -> List[Dict]:
+    """
+    Rebuild a game's play-by-play from its seed and the powers it was played with.
+    """
+    arrays = simulate_matchups([home_power], [away_power], rngs=[np.random.default_rng(seed)])
+    return game_plays(arrays, 0)
+
+
+def render_summary(play_type: int, offense: str, yards: int) -> str:
+    offense = offense.upper()
+    if play_type == PLAY_TD_RUN:
+        return f"{offense} TD on a run ({TD_POINTS} pts)"
+    if play_type == PLAY_TD_PASS:
+        return f"{offense} TD on a pass ({TD_POINTS} pts)"
+    if play_type == PLAY_FG:
+        return f"{offense} FG ({FG_POINTS} pts)"
+    if play_type == PLAY_TURNOVER:
+        return f"{offense} turnover"
+    result = "run" if play_type == PLAY_RUN else "pass"
+    return f"{offense} {result} for {yards} yards"
+
+
+def game_plays(arrays: Dict[str, np.ndarray], index: int) -> List[Dict]:
+    """
+    Build the play dicts for one game of a batch, in the shape PlayLog rows use.
+    """
+    quarters = arrays["quarter"][index].tolist()
+    clocks = arrays["clock"][index].tolist()
+    home_ball = arrays["home_ball"][index].tolist()
+    yards = arrays["yards"][index].tolist()
+    play_types = arrays["play_type"][index].tolist()
+    home_scores = arrays["home_score"][index].tolist()
+    away_scores = arrays["away_score"][index].tolist()
+    plays = []
+    for idx in range(len(quarters)):
+        plays.append(
+            {
+                "play_index": idx + 1,
+                "quarter": quarters[idx],
+                "clock_seconds": clocks[idx],
+                "summary": render_summary(play_types[idx], "home" if home_ball[idx] else "away", yards[idx]),
+                "home_score": home_scores[idx],
+                "away_score": away_scores[idx],
+            }
+        )
+    return plays
+
+
+def game_codes(arrays: Dict[str, np.ndarray], index: int) -> Dict[str, List[int]]:
+    """
+    One game's raw play columns as plain lists, for the packed play-log format.
+    """
+    return {
+        name: arrays[name][index].astype(np.int64).tolist()
+        for name in ("quarter", "clock", "play_type", "yards", "home_ball", "home_score", "away_score")
+    }
+
+
+def overtime_field_goal(seed: int, home_score: int, away_score: int) -> Dict[str, int]:
+    """
+    The sudden-death field goal that settles a game still tied after regulation,
+    as one play's codes (the ``game_codes`` columns). The kicking side, clock and
+    yardage come from the game's seed, so a replayed game settles the same way.
+    """
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(1,)))
+    home_ball = bool(rng.random() < 0.5)
+    return {
+        "quarter": QUARTERS + 1,
+        "clock": int(rng.integers(0, OVERTIME_SECONDS)),
+        "play_type": PLAY_FG,
+        "yards": int(rng.integers(3, 20)),
+        "home_ball": int(home_ball),
+        "home_score": home_score + (FG_POINTS if home_ball else 0),
+        "away_score": away_score + (0 if home_ball else FG_POINTS),
+    }
+
+
+def code_play(codes: Dict[str, int], play_index: int) -> Dict:
+    """One play's codes as a play dict shaped like PlayLog rows."""
+    return {
+        "play_index": play_index,
+        "quarter": codes["quarter"],
+        "clock_seconds": codes["clock"],
+        "summary": render_summary(codes["play_type"], "home" if codes["home_ball"] else "away", codes["yards"]),
+        "home_score": codes["home_score"],
+        "away_score": codes["away_score"],
+    }
+
+
+def split_yards(total: int, parts: int) -> List[int]:
+    if parts <= 0:
+        return []
+    base = max(0, total // parts)
+    result = [base for _ in range(parts)]
+    remain = total - base * parts
+    idx = 0
+    while remain > 0:
+        result[idx % parts] += 1
+        idx += 1
+        remain -= 1
+    return result
+
+
+def player_stat_rows(groups: Dict[str, List[Dict]], team_id: int, yards: int, rng: np.random.Generator) -> List[Dict]:
+    """
+    Coarse stat lines for one side, merged per player (a QB can both pass and rush).
+    """
+    rows: Dict[int, Dict] = {}
+
+    def add(p, position, **values):
+        row = rows.setdefault(p["id"], {"player_id": p["id"], "team_id": team_id, "position": position})
+        row["position"] = position
+        row.update(values)
+
+    pass_yds = int(yards * 0.6)
+    rush_yds = yards - pass_yds
+    qb = groups["QB"][0] if groups.get("QB") else None
+    if qb:
+        add(
+            qb,
+            "QB",
+            pass_att=25,
+            pass_cmp=16,
+            pass_yds=pass_yds,
+            pass_td=int(rng.integers(0, 4)),
+            pass_int=int(rng.integers(0, 3)),
+        )
+    rushers = (groups.get("RB", []) + groups.get("QB", [])[:1])[:2]
+    if rushers:
+        split = split_yards(rush_yds, len(rushers))
+        for idx, p in enumerate(rushers):
+            add(
+                p,
+                p["position"],
+                rush_att=12 if p["position"] == "RB" else 4,
+                rush_yds=split[idx],
+                rush_td=1 if idx == 0 and rush_yds > 80 else 0,
+            )
+    receivers = (groups.get("WR", []) + groups.get("TE", []))[:3]
+    if receivers:
+        split = split_yards(pass_yds, len(receivers))
+        for idx, p in enumerate(receivers):
+            add(
+                p,
+                p["position"],
+                rec=4 + idx,
+                rec_yds=split[idx],
+                rec_td=1 if idx == 0 and pass_yds > 120 else 0,
+            )
+    return list(rows.values())
+
+
+def play_matchups(matchups: Sequence[Dict], detail_level: str = "full") -> List[Dict]:
+    """
+    Plain data in, plain data out: each matchup carries game_id, team ids, powers,
+    skill groups and optionally a seed; each result carries the score, plays, box
+    score rows and the seed that reproduces it. Safe to run in a worker process.
+
+    ``detail_level`` "stats" skips building plays; "score" also skips the box
+    score. Scores are the same at every level for a given seed.
+    """
+    if detail_level not in DETAIL_LEVELS:
+        raise ValueError(f"detail_level must be one of {', '.join(DETAIL_LEVELS)}")
+    if not matchups:
+        return []
+    seeds = [m.get("seed") if m.get("seed") is not None else new_seed() for m in matchups]
+    rngs = [np.random.default_rng(game_seed) for game_seed in seeds]
+    arrays = simulate_matchups([m["home_power"] for m in matchups], [m["away_power"] for m in matchups], rngs=rngs)
+    final_home = arrays["home_score"][:, -1].tolist()
+    final_away = arrays["away_score"][:, -1].tolist()
+    results = []
+    for idx, matchup in enumerate(matchups):
+        rng = rngs[idx]
+        home_score = final_home[idx]
+        away_score = final_away[idx]
+        winner_id = None
+        loser_id = None
+        if home_score > away_score:
+            winner_id, loser_id = matchup["home_team_id"], matchup["away_team_id"]
+        elif away_score > home_score:
+            winner_id, loser_id = matchup["away_team_id"], matchup["home_team_id"]
+        result = {
+            "game_id": matchup["game_id"],
+            "home_score": home_score,
+            "away_score": away_score,
+            "status": "completed",
+            "winner_id": winner_id,
+            "loser_id": loser_id,
+            "team_stats": [],
+            "player_stats": [],
+            "home_power": matchup["home_power"],
+            "away_power": matchup["away_power"],
+            "seed": seeds[idx],
+            "detail_level": detail_level,
+        }
+        results.append(result)
+        if detail_level == "score":
+            continue
+        team_stats = result["team_stats"]
+        player_stats = result["player_stats"]
+        for side, score in (("home", home_score), ("away", away_score)):
+            team_id = matchup[f"{side}_team_id"]
+            # Simple team stats derived from score
+            yards = int(score * 10 + rng.integers(180, 361))
+            team_stats.append(
+                {
+                    "team_id": team_id,
+                    "total_yards": yards,
+                    "pass_yards": int(yards * 0.6),
+                    "rush_yards": int(yards * 0.4),
+                    "turnovers": int(rng.integers(0, 3)),
+                }
+            )
+            player_stats.extend(player_stat_rows(matchup.get(f"{side}_groups") or {}, team_id, yards, rng))
+        if detail_level == "full":
+            result["plays"] = game_plays(arrays, idx)
+            result["play_codes"] = game_codes(arrays, idx)
+    return results
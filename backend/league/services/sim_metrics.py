@@ -0,0 +1,112 @@
+"""
+Per-phase instrumentation for simulations.
+
+``record_sim_run`` opens a recording scope around a sim call and stores a
+SimRun row when it exits, including when the sim raises (marked failed, with
+the phase timings it reached). Inside it, the simulator wraps its phases in
+``phase("load" | "simulate" | "persist")``, which time the block and count
+the queries it runs. Outside a recording scope ``phase`` does nothing, so the
+simulator can be called bare (tests, benchmarks) at no cost. Nested scopes
+fold into the outermost one: a season sim records one SimRun, not one per week.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from django.db import connection
+
+from league.models import SimRun
+
+PHASES = ("load", "simulate", "persist")
+
+_active: ContextVar[Optional["SimRecorder"]] = ContextVar("sim_recorder", default=None)
+
+
+class SimRecorder:
+    def __init__(self, season_id: Optional[int] = None):
+        # Callers that create the season inside the run set this once it is committed
+        self.season_id = season_id
+        self.ms = {name: 0.0 for name in PHASES}
+        self.queries = {name: 0 for name in PHASES}
+        self.games = 0
+        self.rows_written = 0
+        self.total_queries = 0
+
+
+def _count_queries(counter):
+    def wrapper(execute, sql, params, many, context):
+        counter[0] += 1
+        return execute(sql, params, many, context)
+
+    return wrapper
+
+
+@contextmanager
+def phase(name: str):
+    recorder = _active.get()
+    if recorder is None:
+        yield
+        return
+    counter = [0]
+    started = time.perf_counter()
+    try:
+        with connection.execute_wrapper(_count_queries(counter)):
+            yield
+    finally:
+        recorder.ms[name] += (time.perf_counter() - started) * 1000
+        recorder.queries[name] += counter[0]
+
+
+def note_written(games: int, rows: int):
+    recorder = _active.get()
+    if recorder is not None:
+        recorder.games += games
+        recorder.rows_written += rows
+
+
+@contextmanager
+def record_sim_run(scope: str, league_id: Optional[int] = None, season_id: Optional[int] = None, user=None):
+    """
+    Record the enclosed sim as one SimRun (only if no recording is already active).
+    The row is written whether or not the sim raises; open the scope outside any
+    transaction the sim may roll back, or a failed run's row goes with it.
+    """
+    if _active.get() is not None:
+        yield _active.get()
+        return
+    recorder = SimRecorder(season_id)
+    token = _active.set(recorder)
+    counter = [0]
+    started = time.perf_counter()
+    error = ""
+    try:
+        with connection.execute_wrapper(_count_queries(counter)):
+            yield recorder
+    except BaseException as exc:
+        error = f"{type(exc).__name__}: {exc}"
+        raise
+    finally:
+        _active.reset(token)
+        total_ms = (time.perf_counter() - started) * 1000
+        recorder.total_queries = counter[0]
+        # A transaction already marked for rollback can't take the row (it would be rolled back anyway)
+        if not connection.needs_rollback:
+            SimRun.objects.create(
+                league_id=league_id,
+                season_id=recorder.season_id,
+                requested_by=user if getattr(user, "is_authenticated", False) else None,
+                scope=scope,
+                games=recorder.games,
+                load_ms=round(recorder.ms["load"], 3),
+                simulate_ms=round(recorder.ms["simulate"], 3),
+                persist_ms=round(recorder.ms["persist"], 3),
+                total_ms=round(total_ms, 3),
+                load_queries=recorder.queries["load"],
+                simulate_queries=recorder.queries["simulate"],
+                persist_queries=recorder.queries["persist"],
+                total_queries=recorder.total_queries,
+                rows_written=recorder.rows_written,
+                status="failed" if error else "completed",
+                error=error,
+            )
@@ -1,233 +1,311 @@
-import random
-from typing import List, Dict
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional, Sequence, Tuple
 
+from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
-from django.utils import timezone
-
-from league.models import Game, PlayLog, TeamGameStat, PlayerGameStat
-
-
-def _team_power(team) -> float:
-    players = list(team.players.all())
-    if not players:
-        return 60.0
-    # Blend overall and core ratings if present
-    totals = []
-    for p in players:
-        core = getattr(p, "rating_speed", None)
-        if core is not None:
-            avg_core = (
-                p.rating_speed
-                + p.rating_accel
-                + p.rating_agility
-                + p.rating_strength
-                + p.rating_hands
-                + p.rating_endurance
-                + p.rating_intelligence
-                + p.rating_discipline
-            ) / 8
-            totals.append(0.6 * p.overall_rating + 0.4 * avg_core)
-        else:
-            totals.append(p.overall_rating)
-    return sum(totals) / len(totals)
-
-
-def _skill_groups(team):
-    qbs = list(team.players.filter(position="QB").order_by("-overall_rating")[:1])
-    rbs = list(team.players.filter(position="RB").order_by("-overall_rating")[:2])
-    wrs = list(team.players.filter(position="WR").order_by("-overall_rating")[:3])
-    tes = list(team.players.filter(position="TE").order_by("-overall_rating")[:1])
-    return {"QB": qbs, "RB": rbs, "WR": wrs, "TE": tes}
-
-
-def _generate_player_stats(game: Game, home_yards: int, away_yards: int):
-    home_groups = _skill_groups(game.home_team)
-    away_groups = _skill_groups(game.away_team)
-
-    def gen_side(groups, yards, is_home: bool):
-        pass_yds = int(yards * 0.6)
-        rush_yds = yards - pass_yds
-        qb = groups["QB"][0] if groups["QB"] else None
-        if qb:
-            PlayerGameStat.objects.update_or_create(
-                game=game,
-                player=qb,
-                defaults={
-                    "team": game.home_team if is_home else game.away_team,
-                    "position": "QB",
-                    "pass_att": 25,
-                    "pass_cmp": 16,
-                    "pass_yds": pass_yds,
-                    "pass_td": random.randint(0, 3),
-                    "pass_int": random.randint(0, 2),
-                },
-            )
-        rushers = (groups["RB"] + groups["QB"][:1])[:2]
-        if rushers:
-            split = _split_yards(rush_yds, len(rushers))
-            for idx, p in enumerate(rushers):
-                PlayerGameStat.objects.update_or_create(
-                    game=game,
-                    player=p,
-                    defaults={
-                        "team": game.home_team if is_home else game.away_team,
-                        "position": p.position,
-                        "rush_att": 12 if p.position == "RB" else 4,
-                        "rush_yds": split[idx],
-                        "rush_td": 1 if idx == 0 and rush_yds > 80 else 0,
-                    },
-                )
-        receivers = (groups["WR"] + groups["TE"])[:3]
-        if receivers:
-            split = _split_yards(pass_yds, len(receivers))
-            for idx, p in enumerate(receivers):
-                PlayerGameStat.objects.update_or_create(
-                    game=game,
-                    player=p,
-                    defaults={
-                        "team": game.home_team if is_home else game.away_team,
-                        "position": p.position,
-                        "rec": 4 + idx,
-                        "rec_yds": split[idx],
-                        "rec_td": 1 if idx == 0 and pass_yds > 120 else 0,
-                    },
-                )
-
-    gen_side(home_groups, home_yards, True)
-    gen_side(away_groups, away_yards, False)
-
-
-def _split_yards(total: int, parts: int) -> list[int]:
-    if parts <= 0:
+from django.db.models import F, Max
+
+from league.models import Game, PackedPlayLog, PlayLog, TeamGameStat, PlayerGameStat
+from league.services import play_codec, sim_engine
+from league.services.depth_charts import get_depth_charts
+from league.services.ratings import SKILL_SLOTS, get_team_snapshots
+from league.services.sim_metrics import note_written, phase
+from league.services.standings import STATE_FIELDS, apply_game_changes, game_state
+from league.services.stats import apply_stat_changes
+
+
+def _skill_groups(chart: Dict[str, List[int]]) -> Dict[str, List[Dict]]:
+    return {
+        position: [{"id": player_id, "position": position} for player_id in chart.get(position, [])[:slots]]
+        for position, slots in SKILL_SLOTS.items()
+    }
+
+
+def build_matchups(
+    games: Sequence[Game], seeds: Optional[Sequence[Optional[int]]] = None, detail_level: str = "full"
+) -> List[Dict]:
+    """
+    Reduce games to the plain rating data the engine needs: one snapshot read and
+    one depth chart read for the batch (skipped at the "score" level, which
+    attributes no player stats). Games without a seed get a fresh one.
+    """
+    team_ids = {g.home_team_id for g in games} | {g.away_team_id for g in games}
+    snapshots = get_team_snapshots(team_ids)
+    if detail_level == "score":
+        charts = {team_id: {} for team_id in team_ids}
+    else:
+        charts = get_depth_charts(team_ids, SKILL_SLOTS)
+    matchups = []
+    for idx, game in enumerate(games):
+        home = snapshots[game.home_team_id]
+        away = snapshots[game.away_team_id]
+        matchups.append(
+            {
+                "game_id": game.id,
+                "home_team_id": game.home_team_id,
+                "away_team_id": game.away_team_id,
+                "home_power": home.power,
+                "away_power": away.power,
+                "home_groups": _skill_groups(charts[game.home_team_id]),
+                "away_groups": _skill_groups(charts[game.away_team_id]),
+                "seed": seeds[idx] if seeds else None,
+            }
+        )
+    return matchups
+
+
+def _worker_count(max_workers: Optional[int]) -> int:
+    if max_workers is None:
+        max_workers = getattr(settings, "SIM_MAX_WORKERS", None) or os.cpu_count() or 1
+    return max(1, int(max_workers))
+
+
+def run_matchups(
+    matchups: Sequence[Dict],
+    max_workers: Optional[int] = None,
+    min_parallel: Optional[int] = None,
+    detail_level: str = "full",
+) -> List[Dict]:
+    """
+    Play matchups in-process, or fan chunks out across a process pool sized to the
+    machine's cores when the batch is big enough to pay for the pool. Results keep
+    the input order.
+    """
+    matchups = list(matchups)
+    workers = min(_worker_count(max_workers), len(matchups))
+    if min_parallel is None:
+        min_parallel = getattr(settings, "SIM_PARALLEL_MIN_GAMES", 256)
+    if workers <= 1 or len(matchups) < min_parallel:
+        return sim_engine.play_matchups(matchups, detail_level)
+    chunk_size = -(-len(matchups) // workers)
+    chunks = [matchups[idx : idx + chunk_size] for idx in range(0, len(matchups), chunk_size)]
+    results: List[Dict] = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk_results in pool.map(partial(sim_engine.play_matchups, detail_level=detail_level), chunks):
+            results.extend(chunk_results)
+    return results
+
+
+def simulate_games(
+    games: Sequence[Game],
+    max_workers: Optional[int] = None,
+    seeds: Optional[Sequence[Optional[int]]] = None,
+    detail_level: str = "full",
+) -> List[Dict]:
+    """
+    Simulate a batch of games with the vectorized engine. Each result has the
+    same shape as ``simulate_game`` returns, with winner/loser resolved to teams.
+    Passing a game's stored seed (and unchanged rosters) reproduces its result.
+    ``detail_level`` is one of ``sim_engine.DETAIL_LEVELS``.
+    """
+    if detail_level not in sim_engine.DETAIL_LEVELS:
+        raise ValueError(f"detail_level must be one of {', '.join(sim_engine.DETAIL_LEVELS)}")
+    games = list(games)
+    if not games:
         return []
-    base = max(0, total // parts)
-    result = [base for _ in range(parts)]
-    remain = total - base * parts
-    idx = 0
-    while remain > 0:
-        result[idx % parts] += 1
-        idx += 1
-        remain -= 1
-    return result
-
-
-def simulate_game(game: Game) -> Dict:
+    with phase("load"):
+        matchups = build_matchups(games, seeds, detail_level)
+    with phase("simulate"):
+        results = run_matchups(matchups, max_workers=max_workers, detail_level=detail_level)
+    for game, result in zip(games, results):
+        teams = {game.home_team_id: game.home_team, game.away_team_id: game.away_team}
+        result["winner"] = teams.get(result["winner_id"])
+        result["loser"] = teams.get(result["loser_id"])
+    return results
+
+
+def simulate_game(game: Game, seed: Optional[int] = None, detail_level: str = "full") -> Dict:
     """
     Simple ratings-driven sim that produces play-by-play and team stats.
     """
-    home_power = _team_power(game.home_team)
-    away_power = _team_power(game.away_team)
-    home_score = 0
-    away_score = 0
-    plays: List[Dict] = []
-    play_index = 1
-    quarters = [900, 900, 900, 900]
-    for q_idx, q_time in enumerate(quarters, start=1):
-        clock = q_time
-        # ~12 plays per quarter
-        for _ in range(12):
-            clock = max(0, clock - random.randint(15, 45))
-            # determine possession by relative power
-            if random.random() < home_power / (home_power + away_power):
-                offense = "home"
-                defense = "away"
-            else:
-                offense = "away"
-                defense = "home"
-            base = home_power if offense == "home" else away_power
-            def_base = away_power if offense == "home" else home_power
-            yard = int(random.gauss((base - def_base) * 0.2 + 4, 8))
-            yard = max(-10, min(80, yard))
-            result = "run" if random.random() < 0.45 else "pass"
-            summary = f"{offense.upper()} {result} for {yard} yards"
-            # scoring
-            if yard >= 20 and random.random() < 0.15:
-                score_add = 7
-                if offense == "home":
-                    home_score += score_add
-                else:
-                    away_score += score_add
-                summary = f"{offense.upper()} TD on a {result} ({score_add} pts)"
-            elif yard >= 3 and random.random() < 0.25:
-                score_add = 3
-                if offense == "home":
-                    home_score += score_add
-                else:
-                    away_score += score_add
-                summary = f"{offense.upper()} FG ({score_add} pts)"
-            elif yard < -5 and random.random() < 0.1:
-                # turnover
-                summary = f"{offense.upper()} turnover"
-                if offense == "home":
-                    away_score += 0
-                else:
-                    home_score += 0
-            plays.append(
-                {
-                    "play_index": play_index,
-                    "quarter": q_idx,
-                    "clock_seconds": clock,
-                    "summary": summary,
-                    "home_score": home_score,
-                    "away_score": away_score,
-                }
+    return simulate_games([game], seeds=[seed], detail_level=detail_level)[0]
+
+
+def persist_sim_result(game: Game, sim_result: Dict, store_plays: bool = True) -> Dict[str, int]:
+    return persist_sim_results([(game, sim_result)], store_plays=store_plays)
+
+
+def persist_sim_results(pairs: Sequence[Tuple[Game, Dict]], store_plays: bool = True) -> Dict[str, int]:
+    """
+    Write a batch of simulated games in a few statements: one bulk_update for
+    the games, one delete + bulk_create for plays and team stats, and one
+    upsert on (game, player) for player stats. Returns row counts written.
+
+    With ``store_plays=False`` only scores and stats are written; the play-by-play
+    is rebuilt from the game's seed when someone asks for it (see ``game_play_log``).
+    Leagues set to the packed play-log format get one PackedPlayLog blob per game
+    instead of PlayLog rows. Results simmed below the "full" detail level carry
+    no plays (and at "score", no stats), so those writes are skipped; their
+    play-by-play can still be replayed from the seed.
+    """
+    with phase("persist"), transaction.atomic():
+        written = _persist_sim_results(list(pairs), store_plays)
+    note_written(written["games"], sum(written.values()))
+    return written
+
+
+def _persist_sim_results(pairs: List[Tuple[Game, Dict]], store_plays: bool) -> Dict[str, int]:
+    if not pairs:
+        return {"games": 0, "plays": 0, "team_stats": 0, "player_stats": 0}
+    game_ids = [game.id for game, _ in pairs]
+    # Stored state before the write: backs out re-simmed results from standings and picks the play-log format
+    before = {
+        row["id"]: row
+        for row in Game.objects.filter(id__in=game_ids).values(
+            "id",
+            *STATE_FIELDS,
+            season_id=F("week__season_id"),
+            is_playoffs=F("week__is_playoffs"),
+            play_log_format=F("week__season__league__play_log_format"),
+        )
+    }
+    formats = {game_id: row["play_log_format"] for game_id, row in before.items()}
+    games = []
+    play_rows = []
+    packed_rows = []
+    play_count = 0
+    team_rows = []
+    player_rows = []
+    for game, sim_result in pairs:
+        game.home_score = sim_result["home_score"]
+        game.away_score = sim_result["away_score"]
+        game.status = sim_result["status"]
+        game.winner = sim_result["winner"]
+        game.loser = sim_result["loser"]
+        game.sim_seed = sim_result.get("seed")
+        game.sim_home_power = sim_result.get("home_power")
+        game.sim_away_power = sim_result.get("away_power")
+        games.append(game)
+        if store_plays and formats.get(game.id) == "packed" and sim_result.get("play_codes"):
+            codes = sim_result["play_codes"]
+            packed_rows.append(
+                PackedPlayLog(game_id=game.id, play_count=len(codes["quarter"]), data=play_codec.pack_plays(codes))
             )
-            play_index += 1
-    # final outcome
-    status = "completed"
-    winner = None
-    loser = None
-    if home_score > away_score:
-        winner = game.home_team
-        loser = game.away_team
-    elif away_score > home_score:
-        winner = game.away_team
-        loser = game.home_team
+            play_count += len(codes["quarter"])
+        elif store_plays:
+            plays = sim_result.get("plays", [])
+            play_rows.extend(PlayLog(game_id=game.id, **play) for play in plays)
+            play_count += len(plays)
+        team_rows.extend(TeamGameStat(game_id=game.id, **row) for row in sim_result.get("team_stats", []))
+        player_rows.extend(PlayerGameStat(game_id=game.id, **row) for row in sim_result.get("player_stats", []))
+
+    Game.objects.bulk_update(
+        games,
+        ["home_score", "away_score", "status", "winner", "loser", "sim_seed", "sim_home_power", "sim_away_power"],
+    )
+    apply_game_changes(
+        (before[game.id], game_state(game, before[game.id]["season_id"], before[game.id]["is_playoffs"]))
+        for game in games
+        if game.id in before
+    )
+    # Stat lines this write replaces come off the season totals; only games simmed before have any
+    resimmed = [game_id for game_id, row in before.items() if row["status"] == "completed"]
+    score_only = {game.id for game, sim_result in pairs if sim_result.get("detail_level") == "score"}
+    old_team_rows, old_player_rows = [], []
+    if resimmed:
+        old_team_rows = list(TeamGameStat.objects.filter(game_id__in=resimmed))
+        rewritten = {(row.game_id, row.player_id) for row in player_rows}
+        old_player_rows = [
+            row
+            for row in PlayerGameStat.objects.filter(game_id__in=resimmed)
+            if row.game_id in score_only or (row.game_id, row.player_id) in rewritten
+        ]
+    # Clear previous logs/stats
+    PlayLog.objects.filter(game_id__in=game_ids).delete()
+    PackedPlayLog.objects.filter(game_id__in=game_ids).delete()
+    TeamGameStat.objects.filter(game_id__in=game_ids).delete()
+    PlayLog.objects.bulk_create(play_rows)
+    PackedPlayLog.objects.bulk_create(packed_rows)
+    TeamGameStat.objects.bulk_create(team_rows)
+    # The upsert below only replaces rows it writes; score-only re-sims clear stale lines
+    if score_only:
+        PlayerGameStat.objects.filter(game_id__in=score_only).delete()
+    PlayerGameStat.objects.bulk_create(
+        player_rows,
+        update_conflicts=True,
+        unique_fields=["game", "player"],
+        update_fields=["team", "position", *sim_engine.PLAYER_STAT_FIELDS],
+    )
+    apply_stat_changes(
+        {game_id: row["season_id"] for game_id, row in before.items()},
+        old_team_rows,
+        team_rows,
+        old_player_rows,
+        player_rows,
+    )
     return {
-        "home_score": home_score,
-        "away_score": away_score,
-        "status": status,
-        "winner": winner,
-        "loser": loser,
-        "plays": plays,
-        "home_power": home_power,
-        "away_power": away_power,
+        "games": len(games),
+        "plays": play_count,
+        "team_stats": len(team_rows),
+        "player_stats": len(player_rows),
     }
 
 
 @transaction.atomic
-def persist_sim_result(game: Game, sim_result: Dict):
-    game.home_score = sim_result["home_score"]
-    game.away_score = sim_result["away_score"]
-    game.status = sim_result["status"]
-    game.winner = sim_result["winner"]
-    game.loser = sim_result["loser"]
-    game.save(update_fields=["home_score", "away_score", "status", "winner", "loser"])
-    # Clear previous logs/stats
-    game.plays.all().delete()
-    game.team_stats.all().delete()
-    plays = sim_result.get("plays", [])
-    for play in plays:
-        PlayLog.objects.create(game=game, **play)
-    # Simple team stats derived from power
-    home_yards = int(sim_result["home_score"] * 10 + random.randint(180, 360))
-    away_yards = int(sim_result["away_score"] * 10 + random.randint(180, 360))
-    TeamGameStat.objects.create(
-        game=game,
-        team=game.home_team,
-        total_yards=home_yards,
-        pass_yards=int(home_yards * 0.6),
-        rush_yards=int(home_yards * 0.4),
-        turnovers=random.randint(0, 2),
+def settle_tied_games(games: Sequence[Game]) -> None:
+    """
+    Settle simulated games that ended tied with a sudden-death field goal
+    (``sim_engine.overtime_field_goal``), for games that must have a winner.
+    The play is written like the rest of the game: the final score and result
+    on the game, and the play appended to its stored PlayLog rows or packed
+    blob; plays replayed from the seed get it in ``game_play_log``. Team stat
+    rows carry no points, so they stand as simulated.
+    """
+    games = [game for game in games if game.home_score == game.away_score and game.sim_seed is not None]
+    if not games:
+        return
+    overtime = {}
+    for game in games:
+        codes = sim_engine.overtime_field_goal(game.sim_seed, game.home_score, game.away_score)
+        overtime[game.id] = codes
+        game.home_score, game.away_score = codes["home_score"], codes["away_score"]
+        teams = (game.home_team_id, game.away_team_id)
+        game.winner_id, game.loser_id = teams if codes["home_ball"] else teams[::-1]
+    Game.objects.bulk_update(games, ["home_score", "away_score", "winner", "loser"])
+
+    last_plays = (
+        PlayLog.objects.filter(game_id__in=overtime).values("game_id").annotate(last=Max("play_index"))
+    )
+    PlayLog.objects.bulk_create(
+        PlayLog(game_id=row["game_id"], **sim_engine.code_play(overtime[row["game_id"]], row["last"] + 1))
+        for row in last_plays
     )
+    packed = list(PackedPlayLog.objects.filter(game_id__in=overtime))
+    for log in packed:
+        columns = {name: values.tolist() for name, values in play_codec.unpack_codes(log.data).items()}
+        for name, value in overtime[log.game_id].items():
+            columns[name].append(value)
+        log.data = play_codec.pack_plays(columns)
+        log.play_count += 1
+    PackedPlayLog.objects.bulk_update(packed, ["data", "play_count"])
+
 
-    # Generate coarse player stats shares
-    _generate_player_stats(game, home_yards, away_yards)
-    TeamGameStat.objects.create(
-        game=game,
-        team=game.away_team,
-        total_yards=away_yards,
-        pass_yards=int(away_yards * 0.6),
-        rush_yards=int(away_yards * 0.4),
-        turnovers=random.randint(0, 2),
+def game_play_log(game: Game) -> List:
+    """
+    A game's play-by-play: the stored PlayLog rows if there are any, else its
+    decoded packed blob, else the plays replayed from its seed (cached, since a
+    replay is deterministic). A replay that ends tied where the game has a
+    result was settled in overtime, so the overtime play is added back.
+    """
+    plays = list(game.plays.all())
+    if plays:
+        return plays
+    packed = PackedPlayLog.objects.filter(game=game).only("data").first()
+    if packed:
+        return play_codec.unpack_plays(packed.data)
+    if game.sim_seed is None or game.sim_home_power is None or game.sim_away_power is None:
+        return plays
+    key = f"league:play-log:{game.id}:{game.sim_seed}"
+    plays = cache.get_or_set(
+        key,
+        lambda: sim_engine.replay_plays(game.sim_seed, game.sim_home_power, game.sim_away_power),
+        getattr(settings, "SIM_PLAY_LOG_CACHE_SECONDS", 3600),
     )
+    final = plays[-1] if plays else None
+    if final and final["home_score"] == final["away_score"] and game.home_score != game.away_score:
+        codes = sim_engine.overtime_field_goal(game.sim_seed, final["home_score"], final["away_score"])
+        plays = [*plays, sim_engine.code_play(codes, len(plays) + 1)]
+    return plays
@@ -1,43 +1,155 @@
 from collections import defaultdict
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from league.models import Game, Season, Team
+from django.db import transaction
 
+from league.models import Game, Season, Team, TeamSeasonRecord
+from league.services.tiebreakers import Tiebreaker
 
-def compute_standings(season: Season) -> List[Dict]:
-    records = defaultdict(lambda: {"wins": 0, "losses": 0, "points_for": 0, "points_against": 0})
+RECORD_FIELDS = [
+    "wins",
+    "losses",
+    "ties",
+    "points_for",
+    "points_against",
+    "home_wins",
+    "home_losses",
+    "home_ties",
+    "away_wins",
+    "away_losses",
+    "away_ties",
+    "division_wins",
+    "division_losses",
+    "division_ties",
+    "conference_wins",
+    "conference_losses",
+    "conference_ties",
+]
 
-    games = Game.objects.filter(week__season=season, status="completed").select_related("home_team", "away_team")
-    for g in games:
-        if g.winner_id == g.home_team_id:
-            records[g.home_team_id]["wins"] += 1
-            records[g.away_team_id]["losses"] += 1
-        elif g.winner_id == g.away_team_id:
-            records[g.away_team_id]["wins"] += 1
-            records[g.home_team_id]["losses"] += 1
-        records[g.home_team_id]["points_for"] += g.home_score
-        records[g.home_team_id]["points_against"] += g.away_score
-        records[g.away_team_id]["points_for"] += g.away_score
-        records[g.away_team_id]["points_against"] += g.home_score
+# What a TeamSeasonRecord needs to know about a game
+STATE_FIELDS = ("status", "home_team_id", "away_team_id", "home_score", "away_score")
 
-    # Build list with team info
-    teams = Team.objects.filter(id__in=records.keys()).select_related("conference", "division")
-    standings = []
-    for team in teams:
-        rec = records[team.id]
-        standings.append(
-            {
-                "team_id": team.id,
-                "abbreviation": team.abbreviation,
-                "wins": rec["wins"],
-                "losses": rec["losses"],
-                "points_for": rec["points_for"],
-                "points_against": rec["points_against"],
-                "conference": team.conference.name,
-                "division": team.division.name,
-            }
+GameState = Dict
+
+
+def game_state(game: Game, season_id: int, is_playoffs: bool) -> GameState:
+    state = {field: getattr(game, field) for field in STATE_FIELDS}
+    state.update(season_id=season_id, is_playoffs=is_playoffs)
+    return state
+
+
+def _counts(state: Optional[GameState]) -> bool:
+    return bool(state) and state["status"] == "completed" and not state["is_playoffs"]
+
+
+def _add_game(deltas, state: GameState, sign: int, teams: Dict[int, Tuple[int, int]]):
+    home, away = state["home_team_id"], state["away_team_id"]
+    home_score, away_score = state["home_score"] or 0, state["away_score"] or 0
+    same_division = teams[home][0] == teams[away][0]
+    same_conference = teams[home][1] == teams[away][1]
+    sides = ((home, "home", home_score, away_score), (away, "away", away_score, home_score))
+    for team_id, side, scored, allowed in sides:
+        outcome = "wins" if scored > allowed else "losses" if scored < allowed else "ties"
+        delta = deltas[(state["season_id"], team_id)]
+        delta[outcome] += sign
+        delta[f"{side}_{outcome}"] += sign
+        delta["points_for"] += sign * scored
+        delta["points_against"] += sign * allowed
+        if same_division:
+            delta[f"division_{outcome}"] += sign
+        if same_conference:
+            delta[f"conference_{outcome}"] += sign
+
+
+def apply_game_changes(changes: Iterable[Tuple[Optional[GameState], Optional[GameState]]]) -> int:
+    """
+    Fold game result changes, (before, after) state pairs with None for "didn't
+    exist", into TeamSeasonRecord rows. Only completed regular-season games
+    count; a re-scored or re-simulated game backs out its old result first. Runs
+    a fixed handful of queries however many games are in the batch. Returns the
+    number of records touched.
+    """
+    changes = [(before, after) for before, after in changes if _counts(before) or _counts(after)]
+    if not changes:
+        return 0
+    team_ids = set()
+    for before, after in changes:
+        for state in (before, after):
+            if _counts(state):
+                team_ids.update((state["home_team_id"], state["away_team_id"]))
+    teams = {
+        team_id: (division_id, conference_id)
+        for team_id, division_id, conference_id in Team.objects.filter(id__in=team_ids).values_list(
+            "id", "division_id", "conference_id"
         )
+    }
+    deltas: Dict[Tuple[int, int], Dict[str, int]] = defaultdict(lambda: dict.fromkeys(RECORD_FIELDS, 0))
+    for before, after in changes:
+        if _counts(before):
+            _add_game(deltas, before, -1, teams)
+        if _counts(after):
+            _add_game(deltas, after, 1, teams)
+    deltas = {key: delta for key, delta in deltas.items() if any(delta.values())}
+    if not deltas:
+        return 0
+
+    season_ids = {season_id for season_id, _ in deltas}
+    with transaction.atomic(savepoint=False):
+        existing = {
+            (record.season_id, record.team_id): record
+            for record in TeamSeasonRecord.objects.select_for_update().filter(
+                season_id__in=season_ids, team_id__in={team_id for _, team_id in deltas}
+            )
+        }
+        to_create = []
+        to_update = []
+        for (season_id, team_id), delta in deltas.items():
+            record = existing.get((season_id, team_id))
+            if record is None:
+                record = TeamSeasonRecord(season_id=season_id, team_id=team_id)
+                to_create.append(record)
+            else:
+                to_update.append(record)
+            for field, value in delta.items():
+                setattr(record, field, max(0, getattr(record, field) + value))
+        if to_update:
+            TeamSeasonRecord.objects.bulk_update(to_update, RECORD_FIELDS)
+        if to_create:
+            TeamSeasonRecord.objects.bulk_create(to_create)
+    return len(deltas)
+
 
-    # Simple sort by wins then PF as placeholder
-    standings.sort(key=lambda x: (-x["wins"], -x["points_for"]))
-    return standings
+def rebuild_team_records(season: Season) -> int:
+    """
+    Recompute a season's records from its completed games (repairs drift, e.g.
+    after realignment or direct database edits).
+    """
+    games = Game.objects.filter(week__season=season, week__is_playoffs=False, status="completed")
+    with transaction.atomic():
+        TeamSeasonRecord.objects.filter(season=season).delete()
+        return apply_game_changes((None, game_state(game, season.id, False)) for game in games)
+
+
+def compute_standings(season: Season, tiebreaker: Optional[Tiebreaker] = None) -> List[Dict]:
+    """
+    Regular-season standings from the materialized records: one indexed query,
+    plus two to load the results matrix when teams share a winning percentage.
+    Sorted by winning percentage with NFL tiebreakers (see tiebreakers.py).
+    """
+    records = (
+        TeamSeasonRecord.objects.filter(season=season)
+        .exclude(wins=0, losses=0, ties=0)
+        .select_related("team__conference", "team__division")
+        .order_by("team__abbreviation")
+    )
+    standings = []
+    for record in records:
+        row = {
+            "team_id": record.team_id,
+            "abbreviation": record.team.abbreviation,
+            "conference": record.team.conference.name,
+            "division": record.team.division.name,
+        }
+        row.update({field: getattr(record, field) for field in RECORD_FIELDS})
+        standings.append(row)
+    return (tiebreaker or Tiebreaker(season)).order(standings)
@@ -1,92 +1,208 @@
-from django.db.models import Sum, Count
+"""
+Season stat totals.
 
-from league.models import PlayerGameStat, Season, TeamGameStat
+PlayerSeasonStat and TeamSeasonStat hold each season's running totals of the
+per-game stat lines, so season pages and leaderboards read one row per player
+(per team played for) or team however many games have been played. Writers
+fold their changes in with ``apply_stat_changes``: the lines a re-simulated
+game is replacing come off, the new lines go on. ``rebuild_season_stats``
+recomputes a season's totals from the game lines. Both paths label a player's
+total with the position of their line in their latest game (highest game id).
+"""
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set
 
+from django.db import transaction
+from django.db.models import Count, F, Max, Sum, Window
 
-def player_season_stats(season: Season):
-    stats = (
-        PlayerGameStat.objects.filter(game__week__season=season)
-        .values("player_id", "player__first_name", "player__last_name", "team__abbreviation", "position")
-        .annotate(
-            games=Count("id"),
-            pass_att=Sum("pass_att"),
-            pass_cmp=Sum("pass_cmp"),
-            pass_yds=Sum("pass_yds"),
-            pass_td=Sum("pass_td"),
-            pass_int=Sum("pass_int"),
-            rush_att=Sum("rush_att"),
-            rush_yds=Sum("rush_yds"),
-            rush_td=Sum("rush_td"),
-            rec=Sum("rec"),
-            rec_yds=Sum("rec_yds"),
-            rec_td=Sum("rec_td"),
-            tackles=Sum("tackles"),
-            sacks=Sum("sacks"),
-            interceptions=Sum("interceptions"),
-            fumbles=Sum("fumbles"),
+from league.models import PlayerGameStat, PlayerSeasonStat, Season, TeamGameStat, TeamSeasonStat
+from league.services.sim_engine import PLAYER_STAT_FIELDS
+
+TEAM_STAT_FIELDS = ["total_yards", "pass_yards", "rush_yards", "turnovers"]
+
+LEADER_STATS = {
+    "pass_yds",
+    "pass_td",
+    "rush_yds",
+    "rush_td",
+    "rec_yds",
+    "rec_td",
+    "tackles",
+    "sacks",
+    "interceptions",
+}
+
+
+def _latest_positions(season_ids: Iterable[int], player_ids: Optional[Iterable[int]] = None) -> Dict[tuple, str]:
+    """
+    {(season id, player id, team id): position} from each player's line in
+    their latest game of the season for that team (highest game id). One query.
+    """
+    lines = PlayerGameStat.objects.filter(game__week__season_id__in=set(season_ids))
+    if player_ids is not None:
+        lines = lines.filter(player_id__in=set(player_ids))
+    rows = (
+        lines.annotate(
+            season_id=F("game__week__season_id"),
+            latest_game=Window(Max("game_id"), partition_by=[F("player_id"), F("team_id"), F("season_id")]),
         )
+        .filter(game_id=F("latest_game"))
+        .values("season_id", "player_id", "team_id", "position")
     )
-    # normalize output keys
-    results = []
-    for row in stats:
-        results.append(
-            {
-                "player_id": row["player_id"],
-                "player_name": f"{row['player__first_name']} {row['player__last_name']}",
-                "team_abbr": row["team__abbreviation"],
-                "position": row["position"],
-                **{k: row.get(k) or 0 for k in [
-                    "games","pass_att","pass_cmp","pass_yds","pass_td","pass_int",
-                    "rush_att","rush_yds","rush_td","rec","rec_yds","rec_td",
-                    "tackles","sacks","interceptions","fumbles"
-                ]}
-            }
-        )
-    return results
+    return {(row["season_id"], row["player_id"], row["team_id"]): row["position"] for row in rows}
 
 
-def player_leaders(season: Season, stat: str, limit: int = 10):
-    allowed = {
-        "pass_yds",
-        "pass_td",
-        "rush_yds",
-        "rush_td",
-        "rec_yds",
-        "rec_td",
-        "tackles",
-        "sacks",
-        "interceptions",
+def _player_labels(keys: Set[tuple]) -> Dict[tuple, Dict[str, str]]:
+    positions = _latest_positions({key[0] for key in keys}, {key[1] for key in keys})
+    return {key: {"position": positions[key]} for key in keys if key in positions}
+
+
+def _fold(
+    model,
+    key_fields: Sequence[str],
+    stat_fields: List[str],
+    seasons: Dict[int, int],
+    removed: Iterable,
+    added: Iterable,
+    label_fields: Sequence[str] = (),
+    labels_for: Optional[Callable[[Set[tuple]], Dict[tuple, Dict[str, str]]]] = None,
+) -> int:
+    # ``labels_for`` reads the label fields of the touched totals from the already-written game lines
+    deltas: Dict[tuple, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(["games", *stat_fields], 0))
+    for rows, sign in ((removed, -1), (added, 1)):
+        for row in rows:
+            key = (seasons[row.game_id], *(getattr(row, field) for field in key_fields))
+            delta = deltas[key]
+            delta["games"] += sign
+            for field in stat_fields:
+                delta[field] += sign * getattr(row, field)
+    labels = labels_for(set(deltas)) if labels_for and deltas else {}
+    deltas = {key: delta for key, delta in deltas.items() if any(delta.values()) or key in labels}
+    if not deltas:
+        return 0
+
+    lookup = {"season_id__in": {key[0] for key in deltas}, f"{key_fields[0]}__in": {key[1] for key in deltas}}
+    existing = {
+        (total.season_id, *(getattr(total, field) for field in key_fields)): total
+        for total in model.objects.select_for_update().filter(**lookup)
     }
-    if stat not in allowed:
-        return []
-    agg = player_season_stats(season)
-    sorted_list = sorted(agg, key=lambda x: x.get(stat, 0), reverse=True)
-    return sorted_list[:limit]
+    fields = ["games", *stat_fields, *label_fields]
+    to_write, to_delete = [], []
+    for key, delta in deltas.items():
+        current = existing.get(key)
+        values = {field: getattr(current, field) if current else 0 for field in ["games", *stat_fields]}
+        for field, value in delta.items():
+            values[field] += value
+        values.update(labels.get(key) or {field: getattr(current, field) for field in label_fields if current})
+        if current and all(getattr(current, field) == values.get(field) for field in fields):
+            continue
+        if values["games"] <= 0:
+            # Every game line it counted was replaced, e.g. a re-sim without this player
+            if current:
+                to_delete.append(current.pk)
+            continue
+        to_write.append(model(season_id=key[0], **dict(zip(key_fields, key[1:])), **values))
+    if to_write:
+        # One upsert with the new running totals covers both new and existing rows
+        model.objects.bulk_create(
+            to_write,
+            update_conflicts=True,
+            unique_fields=["season", *(field[: -len("_id")] for field in key_fields)],
+            update_fields=[*fields, "updated_at"],
+        )
+    if to_delete:
+        model.objects.filter(pk__in=to_delete).delete()
+    return len(deltas)
 
 
-def team_season_stats(season: Season):
-    stats = (
-        TeamGameStat.objects.filter(game__week__season=season)
-        .values("team_id", "team__abbreviation")
-        .annotate(
-            games=Count("id"),
-            total_yards=Sum("total_yards"),
-            pass_yards=Sum("pass_yards"),
-            rush_yards=Sum("rush_yards"),
-            turnovers=Sum("turnovers"),
+def apply_stat_changes(
+    seasons: Dict[int, int],
+    removed_team: Iterable[TeamGameStat] = (),
+    added_team: Iterable[TeamGameStat] = (),
+    removed_player: Iterable[PlayerGameStat] = (),
+    added_player: Iterable[PlayerGameStat] = (),
+) -> int:
+    """
+    Fold replaced (removed) and newly written (added) game stat lines into the
+    season totals; ``seasons`` maps each line's game id to its season id. Runs
+    a fixed handful of queries per batch. Returns the number of totals touched.
+    """
+    with transaction.atomic(savepoint=False):
+        return _fold(
+            TeamSeasonStat, ("team_id",), TEAM_STAT_FIELDS, seasons, removed_team, added_team
+        ) + _fold(
+            PlayerSeasonStat,
+            ("player_id", "team_id"),
+            PLAYER_STAT_FIELDS,
+            seasons,
+            removed_player,
+            added_player,
+            label_fields=("position",),
+            labels_for=_player_labels,
         )
+
+
+def rebuild_season_stats(season: Season) -> int:
+    """
+    Recompute a season's stat totals from its game lines (repairs drift, e.g.
+    after games are deleted or edited directly in the database).
+    """
+    team_rows = (
+        TeamGameStat.objects.filter(game__week__season=season)
+        .values("team_id")
+        .annotate(games=Count("id"), **{field: Sum(field) for field in TEAM_STAT_FIELDS})
     )
-    results = []
-    for row in stats:
-        results.append(
-            {
-                "team_id": row["team_id"],
-                "team_abbr": row["team__abbreviation"],
-                "games": row.get("games") or 0,
-                "total_yards": row.get("total_yards") or 0,
-                "pass_yards": row.get("pass_yards") or 0,
-                "rush_yards": row.get("rush_yards") or 0,
-                "turnovers": row.get("turnovers") or 0,
-            }
+    player_rows = (
+        PlayerGameStat.objects.filter(game__week__season=season)
+        .values("player_id", "team_id")
+        .annotate(games=Count("id"), **{field: Sum(field) for field in PLAYER_STAT_FIELDS})
+    )
+    positions = _latest_positions([season.id])
+    with transaction.atomic():
+        TeamSeasonStat.objects.filter(season=season).delete()
+        PlayerSeasonStat.objects.filter(season=season).delete()
+        teams = TeamSeasonStat.objects.bulk_create(TeamSeasonStat(season=season, **row) for row in team_rows)
+        players = PlayerSeasonStat.objects.bulk_create(
+            PlayerSeasonStat(
+                season=season, position=positions.get((season.id, row["player_id"], row["team_id"]), ""), **row
+            )
+            for row in player_rows
         )
-    return results
+    return len(teams) + len(players)
+
+
+def _player_row(total: PlayerSeasonStat) -> Dict:
+    return {
+        "player_id": total.player_id,
+        "player_name": f"{total.player.first_name} {total.player.last_name}",
+        "team_abbr": total.team.abbreviation,
+        "position": total.position,
+        "games": total.games,
+        **{field: getattr(total, field) for field in PLAYER_STAT_FIELDS},
+    }
+
+
+def _player_totals(season: Season):
+    return PlayerSeasonStat.objects.filter(season=season).select_related("player", "team")
+
+
+def player_season_stats(season: Season):
+    return [_player_row(total) for total in _player_totals(season)]
+
+
+def player_leaders(season: Season, stat: str, limit: int = 10):
+    if stat not in LEADER_STATS:
+        return []
+    return [_player_row(total) for total in _player_totals(season).order_by(f"-{stat}", "player_id")[:limit]]
+
+
+def team_season_stats(season: Season):
+    return [
+        {
+            "team_id": total.team_id,
+            "team_abbr": total.team.abbreviation,
+            "games": total.games,
+            **{field: getattr(total, field) for field in TEAM_STAT_FIELDS},
+        }
+        for total in TeamSeasonStat.objects.filter(season=season).select_related("team")
+    ]
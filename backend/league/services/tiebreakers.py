@@ -0,0 +1,250 @@
+"""
+NFL tiebreakers.
+
+A season's completed regular-season results are loaded once (two queries) into
+team x team NumPy matrices: wins[i, j] is how often team i beat team j, ties and
+points likewise. Every tiebreaking step (head-to-head, division, common games,
+conference, strength of victory/schedule, net points) is then a masked row sum
+over those matrices, so resolving any tie group costs no further queries.
+
+Ties are resolved one place at a time: the procedure picks the single best team
+of the group, then restarts with the rest. Whenever a step separates some (but
+not all) teams, the procedure restarts at step one with the teams still tied.
+The NFL's coin toss is replaced by abbreviation order so results are stable.
+"""
+from functools import partial
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from league.models import Game, Season, Team
+
+TeamRow = Tuple[int, int, int, str]
+GameRow = Tuple[int, int, int, int]
+
+
+def _pct(wins, losses, ties) -> np.ndarray:
+    games = np.asarray(wins + losses + ties, dtype=float)
+    return np.divide(wins + 0.5 * ties, games, out=np.zeros_like(games), where=games > 0)
+
+
+class SeasonMatrix:
+    """Team x team results of one season."""
+
+    def __init__(self, teams: Sequence[TeamRow], games: Iterable[GameRow]):
+        self.team_ids = [team_id for team_id, _, _, _ in teams]
+        self.index = {team_id: idx for idx, team_id in enumerate(self.team_ids)}
+        self.division = np.array([division for _, division, _, _ in teams])
+        self.conference = np.array([conference for _, _, conference, _ in teams])
+        # Stand-in for the coin toss: alphabetical by abbreviation
+        by_name = sorted(range(len(teams)), key=lambda idx: (teams[idx][3], teams[idx][0]))
+        self.toss = np.empty(len(teams))
+        self.toss[by_name] = -np.arange(len(teams))
+
+        n = len(teams)
+        self.wins = np.zeros((n, n), dtype=np.int32)
+        self.ties = np.zeros((n, n), dtype=np.int32)
+        self.points = np.zeros((n, n), dtype=np.int64)
+        rows = [
+            (self.index[home], self.index[away], home_score, away_score)
+            for home, away, home_score, away_score in games
+            if home in self.index and away in self.index
+        ]
+        if rows:
+            home, away, home_score, away_score = (np.array(column) for column in zip(*rows))
+            np.add.at(self.wins, (home[home_score > away_score], away[home_score > away_score]), 1)
+            np.add.at(self.wins, (away[away_score > home_score], home[away_score > home_score]), 1)
+            tied = home_score == away_score
+            np.add.at(self.ties, (home[tied], away[tied]), 1)
+            np.add.at(self.ties, (away[tied], home[tied]), 1)
+            np.add.at(self.points, (home, away), home_score)
+            np.add.at(self.points, (away, home), away_score)
+        self.played = self.wins + self.wins.T + self.ties
+        self.totals = np.stack([self.wins.sum(axis=1), self.wins.sum(axis=0), self.ties.sum(axis=1)])
+
+    @classmethod
+    def for_season(cls, season: Season) -> "SeasonMatrix":
+        teams = list(
+            Team.objects.filter(league_id=season.league_id)
+            .order_by("id")
+            .values_list("id", "division_id", "conference_id", "abbreviation")
+        )
+        games = Game.objects.filter(
+            week__season=season, week__is_playoffs=False, status="completed"
+        ).values_list("home_team_id", "away_team_id", "home_score", "away_score")
+        return cls(teams, ((home, away, hs or 0, aws or 0) for home, away, hs, aws in games))
+
+    def record(self, group: np.ndarray, mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(wins, losses, ties) of each team in group over the masked opponents."""
+        return (
+            (self.wins[group] * mask).sum(axis=1),
+            (self.wins.T[group] * mask).sum(axis=1),
+            (self.ties[group] * mask).sum(axis=1),
+        )
+
+
+# Steps score each team of a tie group (higher is better), or return None when
+# the step doesn't apply to this group.
+
+
+def _head_to_head(m: SeasonMatrix, group: np.ndarray) -> np.ndarray:
+    mask = np.zeros(len(m.team_ids), dtype=bool)
+    mask[group] = True
+    return _pct(*m.record(group, mask))
+
+
+def _head_to_head_sweep(m: SeasonMatrix, group: np.ndarray) -> Optional[np.ndarray]:
+    # Across divisions head-to-head only counts when one team beat (or lost to) every other
+    beat = m.wins[np.ix_(group, group)]
+    self_pair = np.eye(len(group), dtype=bool)
+    swept = ((beat > 0) & (beat.T == 0) | self_pair).all(axis=1)
+    if swept.any():
+        return swept.astype(float)
+    was_swept = ((beat.T > 0) & (beat == 0) | self_pair).all(axis=1)
+    if was_swept.any():
+        return -was_swept.astype(float)
+    return None
+
+
+def _division_record(m: SeasonMatrix, group: np.ndarray) -> np.ndarray:
+    return _pct(*m.record(group, m.division[None, :] == m.division[group][:, None]))
+
+
+def _conference_record(m: SeasonMatrix, group: np.ndarray) -> np.ndarray:
+    return _pct(*m.record(group, m.conference[None, :] == m.conference[group][:, None]))
+
+
+def _common_games(m: SeasonMatrix, group: np.ndarray, min_games: int = 0) -> Optional[np.ndarray]:
+    common = (m.played[group] > 0).all(axis=0)
+    common[group] = False
+    wins, losses, ties = m.record(group, common)
+    if not common.any() or (wins + losses + ties < min_games).any():
+        return None
+    return _pct(wins, losses, ties)
+
+
+def _strength_of_victory(m: SeasonMatrix, group: np.ndarray) -> np.ndarray:
+    # Combined record of the opponents each team beat, counted once per win
+    return _pct(*(m.wins[group] @ m.totals.T).T)
+
+
+def _strength_of_schedule(m: SeasonMatrix, group: np.ndarray) -> np.ndarray:
+    return _pct(*(m.played[group] @ m.totals.T).T)
+
+
+def _net_conference_points(m: SeasonMatrix, group: np.ndarray) -> np.ndarray:
+    mask = m.conference[None, :] == m.conference[group][:, None]
+    return ((m.points[group] - m.points.T[group]) * mask).sum(axis=1)
+
+
+def _net_points(m: SeasonMatrix, group: np.ndarray) -> np.ndarray:
+    return m.points[group].sum(axis=1) - m.points[:, group].sum(axis=0)
+
+
+def _coin_toss(m: SeasonMatrix, group: np.ndarray) -> np.ndarray:
+    return m.toss[group]
+
+
+DIVISION_STEPS = (
+    _head_to_head,
+    _division_record,
+    _common_games,
+    _conference_record,
+    _strength_of_victory,
+    _strength_of_schedule,
+    _net_conference_points,
+    _net_points,
+    _coin_toss,
+)
+
+WILD_CARD_STEPS = (
+    _head_to_head_sweep,
+    _conference_record,
+    partial(_common_games, min_games=4),
+    _strength_of_victory,
+    _strength_of_schedule,
+    _net_conference_points,
+    _net_points,
+    _coin_toss,
+)
+
+
+def _division_leaders(m: SeasonMatrix, group: np.ndarray) -> np.ndarray:
+    # Only the top team of each division takes part in a tie across divisions
+    leaders = []
+    for division in dict.fromkeys(m.division[group].tolist()):
+        members = group[m.division[group] == division]
+        leaders.append(members[0] if len(members) == 1 else _best(m, members))
+    return np.array(leaders)
+
+
+def _best(m: SeasonMatrix, group: np.ndarray) -> int:
+    """Index of the team that wins the tie among group."""
+    while len(group) > 1:
+        if (m.division[group] == m.division[group[0]]).all():
+            steps = DIVISION_STEPS
+        else:
+            group = _division_leaders(m, group)
+            if len(group) == 1:
+                break
+            steps = WILD_CARD_STEPS
+        for step in steps:
+            scores = step(m, group)
+            if scores is None:
+                continue
+            top = group[np.isclose(scores, scores.max())]
+            if len(top) < len(group):
+                group = top
+                break
+    return int(group[0])
+
+
+def break_tie(matrix: SeasonMatrix, team_ids: Sequence[int]) -> List[int]:
+    """
+    Order teams with the same winning percentage, best first. Teams of one
+    division use the division procedure; anything wider uses the wild-card one.
+    """
+    remaining = [matrix.index[team_id] for team_id in team_ids]
+    ordered = []
+    while remaining:
+        best = remaining[0] if len(remaining) == 1 else _best(matrix, np.array(remaining))
+        ordered.append(matrix.team_ids[best])
+        remaining.remove(best)
+    return ordered
+
+
+def win_pct(row: Dict) -> float:
+    ties = row.get("ties", 0)
+    games = row["wins"] + row["losses"] + ties
+    return (row["wins"] + 0.5 * ties) / games if games else 0.0
+
+
+class Tiebreaker:
+    """
+    Orders standings rows for a season, loading the results matrix only the
+    first time a tie actually needs breaking.
+    """
+
+    def __init__(self, season: Season):
+        self.season = season
+        self._matrix: Optional[SeasonMatrix] = None
+
+    @property
+    def matrix(self) -> SeasonMatrix:
+        if self._matrix is None:
+            self._matrix = SeasonMatrix.for_season(self.season)
+        return self._matrix
+
+    def order(self, rows: List[Dict]) -> List[Dict]:
+        """Rows sorted by winning percentage, ties broken by the NFL procedure."""
+        groups: Dict[float, List[Dict]] = {}
+        for row in rows:
+            groups.setdefault(win_pct(row), []).append(row)
+        ordered = []
+        for pct in sorted(groups, reverse=True):
+            group = groups[pct]
+            if len(group) > 1:
+                by_team = {row["team_id"]: row for row in group}
+                group = [by_team[team_id] for team_id in break_tie(self.matrix, list(by_team))]
+            ordered.extend(group)
+        return ordered
@@ -0,0 +1,76 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Contract, DraftPick, Player, Trade, WaiverClaim
+from .services.depth_charts import DEPTH_FIELDS, mark_depth_charts_stale
+from .services.ratings import SNAPSHOT_FIELDS, mark_snapshots_stale
+
+TRACKED_FIELDS = SNAPSHOT_FIELDS | DEPTH_FIELDS
+
+
+def _column(name):
+    return "team_id" if name == "team" else name
+
+
+@receiver(pre_save, sender=Player)
+def capture_player_ratings(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or not instance.pk:
+        return
+    if update_fields is not None and not TRACKED_FIELDS.intersection(update_fields):
+        return
+    fields = [_column(name) for name in TRACKED_FIELDS]
+    instance._snapshot_before = Player.objects.filter(pk=instance.pk).values(*fields).first()
+
+
+@receiver(post_save, sender=Player)
+def player_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        mark_snapshots_stale([instance.team_id])
+        mark_depth_charts_stale([(instance.team_id, instance.position)])
+        return
+    before = getattr(instance, "_snapshot_before", None)
+    instance._snapshot_before = None
+    if before is None:
+        return
+    changed = {name for name in TRACKED_FIELDS if getattr(instance, _column(name)) != before[_column(name)]}
+    if changed & SNAPSHOT_FIELDS:
+        mark_snapshots_stale([before["team_id"], instance.team_id])
+    if changed & DEPTH_FIELDS:
+        mark_depth_charts_stale([(before["team_id"], before["position"]), (instance.team_id, instance.position)])
+
+
+@receiver(post_delete, sender=Player)
+def player_deleted(sender, instance, **kwargs):
+    mark_snapshots_stale([instance.team_id])
+    mark_depth_charts_stale([(instance.team_id, instance.position)])
+
+
+@receiver(post_save, sender=Contract)
+@receiver(post_delete, sender=Contract)
+def contract_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    mark_snapshots_stale([instance.team_id])
+
+
+@receiver(post_save, sender=Trade)
+def trade_saved(sender, instance, raw=False, **kwargs):
+    if raw or instance.status not in ("accepted", "reversed"):
+        return
+    mark_snapshots_stale([instance.from_team_id, instance.to_team_id])
+
+
+@receiver(post_save, sender=WaiverClaim)
+def waiver_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    mark_snapshots_stale([instance.from_team_id, instance.claimed_by_id])
+
+
+@receiver(post_save, sender=DraftPick)
+def draft_pick_saved(sender, instance, raw=False, **kwargs):
+    if raw or not instance.is_selected:
+        return
+    mark_snapshots_stale([instance.team_id])
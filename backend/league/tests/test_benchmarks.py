@@ -0,0 +1,57 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from league.benchmarks.runner import compare_results, run_benchmarks
+from league.models import League
+
+pytestmark = pytest.mark.django_db
+
+
+def test_run_benchmarks_reports_every_metric():
+    results = run_benchmarks(sizes=[4], repeat=1)
+    metrics = results["results"]["4"]
+    assert metrics["games"] == 2
+    assert metrics["simulate_game_games_per_sec"] > 0
+    assert metrics["persist_batch_queries"] > 0
+    assert metrics["week_view_queries"] > 0
+    assert results["meta"]["database"] == "sqlite"
+
+
+def test_compare_results_flags_regressions_by_direction():
+    baseline = {
+        "results": {"8": {"games": 4, "simulate_games_games_per_sec": 1000, "week_view_ms": 50, "week_view_queries": 10}}
+    }
+    current = {
+        "results": {"8": {"games": 4, "simulate_games_games_per_sec": 700, "week_view_ms": 55, "week_view_queries": 11}}
+    }
+    flagged = {row["metric"]: row["gating"] for row in compare_results(current, baseline, tolerance=0.25)}
+    assert flagged == {"simulate_games_games_per_sec": False, "week_view_queries": True}
+
+
+def test_benchmark_command_rolls_back_and_compares(tmp_path):
+    output = tmp_path / "bench.json"
+    baseline = tmp_path / "baseline.json"
+    args = ["--sizes", "2", "--repeat", "1", "--baseline", str(baseline)]
+    call_command("benchmark_sim", *args, "--update-baseline", stdout=StringIO())
+    assert not League.objects.exists()
+
+    stored = json.loads(baseline.read_text())
+    stored["results"]["2"]["week_view_queries"] = 0
+    baseline.write_text(json.dumps(stored))
+    with pytest.raises(CommandError):
+        call_command("benchmark_sim", *args, "--output", str(output), stdout=StringIO())
+    assert json.loads(output.read_text())["results"]["2"]["games"] == 1
+
+    # Timings measured on another machine are reported, not gated
+    stored["results"]["2"]["week_view_queries"] = 10**6
+    stored["results"]["2"]["week_view_ms"] = 0.001
+    baseline.write_text(json.dumps(stored))
+    out = StringIO()
+    call_command("benchmark_sim", *args, stdout=out)
+    assert "SLOWER 2 teams week_view_ms" in out.getvalue()
+    with pytest.raises(CommandError):
+        call_command("benchmark_sim", *args, "--gate-timings", stdout=StringIO())
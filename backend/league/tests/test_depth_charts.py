@@ -0,0 +1,127 @@
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from league.models import Conference, DepthChart, Division, Game, League, Player, PlayerGameStat, Season, Team
+from league.services.depth_charts import get_depth_charts
+from league.services.simulator import build_matchups
+from users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+def auth_client(email="commish@example.com", is_commissioner=True):
+    user = User.objects.create_user(email=email, password="password123", is_commissioner=is_commissioner)
+    client = APIClient()
+    client.post(reverse("users:login"), {"email": user.email, "password": "password123"}, format="json")
+    return client, user
+
+
+def build_league(user, team_count=2):
+    league = League.objects.create(name="Depth League", created_by=user)
+    conference = Conference.objects.create(league=league, name="Conference 1")
+    division = Division.objects.create(conference=conference, name="Division 1")
+    teams = []
+    for idx in range(team_count):
+        team = Team.objects.create(
+            league=league,
+            conference=conference,
+            division=division,
+            name=f"Team {idx}",
+            city=f"City {idx}",
+            nickname=f"Nick {idx}",
+            abbreviation=f"T{idx}",
+        )
+        for position, ratings in [("QB", [85, 75]), ("RB", [80, 70, 60]), ("WR", [78, 72]), ("TE", [70])]:
+            for slot, rating in enumerate(ratings):
+                Player.objects.create(
+                    league=league,
+                    team=team,
+                    first_name=f"{position}{slot}",
+                    last_name=team.abbreviation,
+                    position=position,
+                    overall_rating=rating,
+                )
+        teams.append(team)
+    return league, teams
+
+
+def test_generated_chart_skips_ir_and_injured_players():
+    _, user = auth_client()
+    _, teams = build_league(user)
+    team = teams[0]
+    rb1, rb2, rb3 = team.players.filter(position="RB").order_by("-overall_rating")
+    rb1.on_ir = True
+    rb1.save(update_fields=["on_ir"])
+    rb2.injury_status = "minor"
+    rb2.save(update_fields=["injury_status"])
+
+    charts = get_depth_charts([team.id])[team.id]
+    assert charts["RB"] == [rb3.id]
+    qbs = team.players.filter(position="QB").order_by("-overall_rating")
+    assert charts["QB"] == [qb.id for qb in qbs]
+    assert charts["K"] == []
+
+
+def test_injury_marks_only_that_position_stale_and_sim_reads_one_query(django_assert_num_queries):
+    client, user = auth_client()
+    league, teams = build_league(user)
+    team = teams[0]
+    get_depth_charts([t.id for t in teams])
+    qb = team.players.get(position="QB", overall_rating=85)
+
+    resp = client.post(
+        reverse("league:injury-list-create", args=[league.id]),
+        {"player": qb.id, "severity": "major", "duration_weeks": 6},
+        format="json",
+    )
+    assert resp.status_code == 201
+    stale = set(DepthChart.objects.filter(is_stale=True).values_list("team_id", "position"))
+    assert stale == {(team.id, "QB")}
+
+    season = Season.objects.create(league=league, year=2025)
+    week = season.weeks.create(number=1, is_playoffs=False)
+    game = Game.objects.create(week=week, home_team=teams[0], away_team=teams[1])
+    get_depth_charts([t.id for t in teams])
+    build_matchups([game])  # warm snapshots
+    # One snapshot read plus one depth chart read for the whole batch
+    with django_assert_num_queries(2):
+        matchup = build_matchups([game])[0]
+    assert [p["id"] for p in matchup["home_groups"]["QB"]] == [team.players.get(position="QB", overall_rating=75).id]
+
+
+def test_owner_can_reorder_depth_chart_and_sim_uses_it():
+    client, commish = auth_client()
+    league, teams = build_league(commish)
+    owner_client, owner = auth_client(email="owner@example.com", is_commissioner=False)
+    team = teams[0]
+    team.owner = owner
+    team.save(update_fields=["owner"])
+    backup = team.players.get(position="QB", overall_rating=75)
+    url = reverse("league:team-depth-chart", args=[league.id, team.id])
+
+    resp = owner_client.put(url, {"position": "QB", "player_ids": [backup.id]}, format="json")
+    assert resp.status_code == 200
+    assert resp.json()["player_ids"][0] == backup.id
+    assert resp.json()["is_custom"] is True
+
+    # A rating change regenerates the chart but keeps the owner's order
+    backup.overall_rating = 50
+    backup.save(update_fields=["overall_rating"])
+    assert get_depth_charts([team.id], ["QB"])[team.id]["QB"][0] == backup.id
+
+    season = Season.objects.create(league=league, year=2025)
+    week = season.weeks.create(number=1, is_playoffs=False)
+    Game.objects.create(week=week, home_team=teams[0], away_team=teams[1])
+    client.post(reverse("league:week-simulate", args=[league.id, 2025, 1]), {}, format="json")
+    assert PlayerGameStat.objects.get(team=team, position="QB", pass_att__gt=0).player_id == backup.id
+
+    other_team_qb = teams[1].players.filter(position="QB").first()
+    assert owner_client.put(url, {"position": "QB", "player_ids": [other_team_qb.id]}, format="json").status_code == 400
+    other_url = reverse("league:team-depth-chart", args=[league.id, teams[1].id])
+    assert owner_client.put(other_url, {"position": "QB", "player_ids": []}, format="json").status_code == 403
+
+    resp = owner_client.put(url, {"position": "QB", "reset": True}, format="json")
+    assert resp.json()["is_custom"] is False
+    assert resp.json()["player_ids"][0] != backup.id
+    assert len(owner_client.get(url).json()) == len(Player.POSITION_CHOICES)
@@ -1,8 +1,17 @@
+from io import StringIO
+
 import pytest
+from django.core.management import call_command
+from django.db.models import F
 from django.urls import reverse
 from rest_framework.test import APIClient
 
-from league.models import Conference, Division, Game, Season, Team
+from league.models import Conference, Division, Game, League, PlayoffSeed, Season, Team, TeamSeasonRecord
+from league.services import season_pipeline
+from league.services.playoff_formats import compile_plan, resolve_format
+from league.services.playoffs import advance_playoff_rounds, playoff_progress, record_playoff_result
+from league.services.standings import RECORD_FIELDS, rebuild_team_records
+from league.services.tiebreakers import SeasonMatrix, break_tie
 from users.models import User
 
 pytestmark = pytest.mark.django_db
@@ -74,3 +83,322 @@ def test_complete_game_and_seedings():
     seeds_url = reverse("league:playoff-seeds", args=[league_id, 2025])
     seeds = client.get(seeds_url).json()
     assert seeds[0]["seed"] == 1
+
+
+def test_team_records_follow_result_changes_and_match_rebuild():
+    client = auth_client()
+    league_id, team_a, team_b = create_league_and_teams(client)
+    season = Season.objects.create(league_id=league_id, year=2025)
+    week_1 = season.weeks.create(number=1, is_playoffs=False)
+    week_2 = season.weeks.create(number=2, is_playoffs=False)
+    playoff_week = season.weeks.create(number=19, is_playoffs=True)
+    first = Game.objects.create(week=week_1, home_team_id=team_a, away_team_id=team_b)
+    second = Game.objects.create(week=week_2, home_team_id=team_b, away_team_id=team_a)
+    playoff = Game.objects.create(week=playoff_week, home_team_id=team_a, away_team_id=team_b)
+
+    def complete(game, home_score, away_score):
+        url = reverse("league:game-complete", args=[game.id])
+        resp = client.put(url, {"home_score": home_score, "away_score": away_score}, format="json")
+        assert resp.status_code == 200
+
+    def records():
+        return {
+            record.team_id: {field: getattr(record, field) for field in RECORD_FIELDS}
+            for record in TeamSeasonRecord.objects.filter(season=season)
+        }
+
+    complete(first, 21, 14)
+    complete(second, 10, 10)
+    complete(playoff, 3, 30)
+    # Re-scoring a game backs out its old result
+    complete(first, 7, 24)
+    incremental = records()
+    alpha = incremental[team_a]
+    assert (alpha["wins"], alpha["losses"], alpha["ties"]) == (0, 1, 1)
+    assert (alpha["home_losses"], alpha["away_ties"], alpha["division_losses"]) == (1, 1, 1)
+    assert alpha["points_for"] == 17 and alpha["points_against"] == 34
+
+    rebuild_team_records(season)
+    assert records() == incremental
+
+    standings = client.get(reverse("league:standings", args=[league_id, 2025])).json()
+    assert [row["team_id"] for row in standings] == [team_b, team_a]
+    assert standings[0]["conference_wins"] == 1 and standings[0]["ties"] == 1
+
+    TeamSeasonRecord.objects.filter(season=season).delete()
+    out = StringIO()
+    call_command("rebuild_standings", league=league_id, stdout=out)
+    assert "Rebuilt 2 team records" in out.getvalue()
+    assert records() == incremental
+
+
+def test_tiebreakers_resolve_division_and_wild_card_ties():
+    # Two conferences (1, 2); conference 1 has divisions 10 (A, B) and 11 (C, D)
+    teams = [(1, 10, 1, "A"), (2, 10, 1, "B"), (3, 11, 1, "C"), (4, 11, 1, "D"), (5, 20, 2, "E"), (6, 20, 2, "F")]
+    games = [
+        (1, 2, 21, 14),  # A beats B: decides their division tie head-to-head
+        (2, 5, 24, 10),
+        (3, 4, 10, 7),
+        (4, 1, 17, 3),
+        (5, 6, 30, 0),
+        (6, 3, 20, 13),
+    ]
+    matrix = SeasonMatrix(teams, games)
+    # Everyone is 1-1
+    assert break_tie(matrix, [2, 1]) == [1, 2]
+    # Across divisions only the division leaders (A, C) compete: C has the better
+    # conference record. Then D, now leading its division, beat A head-to-head.
+    assert break_tie(matrix, [1, 2, 3, 4]) == [3, 4, 1, 2]
+
+    # Three-way wild card tie where one team swept the others
+    teams = [(1, 10, 1, "A"), (2, 11, 1, "B"), (3, 12, 1, "C")]
+    matrix = SeasonMatrix(teams, [(1, 2, 10, 3), (1, 3, 10, 3), (2, 3, 7, 7), (3, 2, 7, 7)])
+    assert break_tie(matrix, [3, 2, 1])[0] == 1
+
+
+def test_standings_and_seeds_apply_tiebreakers():
+    client = auth_client()
+    league_id, team_a, team_b = create_league_and_teams(client)
+    season = Season.objects.create(league_id=league_id, year=2025)
+    for number, (home, away, home_score, away_score) in enumerate(
+        # A split series: every record-based step is level, so net points decide it
+        [(team_a, team_b, 3, 0), (team_b, team_a, 35, 0)],
+        start=1,
+    ):
+        week = season.weeks.create(number=number, is_playoffs=False)
+        game = Game.objects.create(week=week, home_team_id=home, away_team_id=away)
+        resp = client.put(
+            reverse("league:game-complete", args=[game.id]),
+            {"home_score": home_score, "away_score": away_score},
+            format="json",
+        )
+        assert resp.status_code == 200
+
+    standings = client.get(reverse("league:standings", args=[league_id, 2025])).json()
+    assert [row["team_id"] for row in standings] == [team_b, team_a]
+    seeds = client.get(reverse("league:playoff-seeds", args=[league_id, 2025])).json()
+    assert [seed["team_id"] for seed in seeds] == [team_b, team_a]
+
+
+def build_playoff_season(client, team_count=16):
+    """Two conferences with a played regular-season week; returns (league_id, season)."""
+    league_id = client.post(reverse("league:league-list-create"), {"name": "Playoff League"}, format="json").json()["id"]
+    league = League.objects.get(pk=league_id)
+    conferences = []
+    for name in ("East", "West"):
+        conference = Conference.objects.create(league=league, name=name)
+        conferences.append((conference, Division.objects.create(conference=conference, name=f"{name} 1")))
+    teams = []
+    for idx in range(team_count):
+        conference, division = conferences[idx % 2]
+        teams.append(
+            Team.objects.create(
+                league=league,
+                conference=conference,
+                division=division,
+                name=f"Team {idx}",
+                city=f"City {idx}",
+                nickname=f"Nick {idx}",
+                abbreviation=f"P{idx:02d}",
+            )
+        )
+    season = Season.objects.create(league=league, year=2025)
+    week = season.weeks.create(number=1, is_playoffs=False)
+    for idx in range(0, team_count, 2):
+        Game.objects.create(
+            week=week,
+            home_team=teams[idx],
+            away_team=teams[idx + 1],
+            status="completed",
+            home_score=10 + idx,
+            away_score=idx,
+        )
+    rebuild_team_records(season)
+    return league_id, season
+
+
+def test_stored_bracket_advances_one_game_at_a_time(django_assert_max_num_queries):
+    client = auth_client()
+    league_id, season = build_playoff_season(client)
+    bracket_url = reverse("league:playoff-bracket", args=[league_id, 2025])
+
+    created = advance_playoff_rounds(season)
+    assert len(created) == 6
+    assert PlayoffSeed.objects.filter(season=season).count() == 14
+    # Drawing the bracket happens once; rerunning is a no-op
+    assert advance_playoff_rounds(season) == []
+
+    created_per_round = []
+    while created:
+        created_per_round.append(len(created))
+        next_games = []
+        for game in Game.objects.filter(id__in=created).select_related("week"):
+            game.status, game.home_score, game.away_score = "completed", 24, 17
+            game.save()
+            with django_assert_max_num_queries(15):
+                next_games.extend(record_playoff_result(game))
+            # Recording the same result again changes nothing
+            assert record_playoff_result(game) == []
+        created = next_games
+        with django_assert_max_num_queries(3):
+            playoff_progress(season)
+    assert created_per_round == [6, 4, 2, 1]
+
+    rounds = client.get(bracket_url).json()["rounds"]
+    assert [matchup["round"] for matchup in rounds].count("Divisional") == 4
+    assert rounds[-1]["round"] == "Championship"
+    assert rounds[-1]["winner_conference"] in ("East", "West")
+    assert all(matchup["status"] == "completed" for matchup in rounds)
+    # Every divisional round hosts the top seed against the lowest one left
+    divisional = [m for m in rounds if m["round"] == "Divisional" and m["higher_seed"]["seed"] == 1]
+    assert all(m["lower_seed"]["seed"] == 4 for m in divisional)
+
+
+def test_compile_plan_lays_out_byes_reseeding_and_fixed_brackets():
+    plan = compile_plan(resolve_format("conference-6"), ["East", "West"])
+    first = plan["stages"][0]["rounds"][0]
+    assert first["slots"] == [
+        {"home": ["seed", 3], "away": ["seed", 6]},
+        {"home": ["seed", 4], "away": ["seed", 5]},
+        {"home": ["seed", 1], "away": None},
+        {"home": ["seed", 2], "away": None},
+    ]
+    assert [r["name"] for stage in plan["stages"] for r in stage["rounds"]] == [
+        "Wildcard",
+        "Divisional",
+        "Conference",
+        "Championship",
+    ]
+
+    league_wide = compile_plan(resolve_format("league-12"), [""])
+    assert len(league_wide["stages"]) == 1
+    assert [r["name"] for r in league_wide["stages"][0]["rounds"]][-2:] == ["Semifinal", "Championship"]
+
+    fixed = compile_plan(resolve_format("custom", {"seeds": 8, "reseed": False}), [""])
+    rounds = fixed["stages"][0]["rounds"]
+    assert [(slot["home"][1], slot["away"][1]) for slot in rounds[0]["slots"]] == [(1, 8), (4, 5), (2, 7), (3, 6)]
+    assert rounds[1]["slots"][0] == {"home": ["winner", 0], "away": ["winner", 1]}
+
+    with pytest.raises(ValueError):
+        resolve_format("custom", {"seeds": 6, "byes": 1})
+
+
+@pytest.mark.parametrize(
+    "playoff_format, options, expansion, per_round",
+    [
+        ("conference-6", {}, False, [4, 4, 2, 1]),
+        ("conference-7", {}, False, [6, 4, 2, 1]),
+        ("conference-8", {}, True, [8, 4, 2, 1]),
+        # Without expansion a bigger field falls back to the default format
+        ("conference-8", {}, False, [6, 4, 2, 1]),
+        ("league-12", {}, False, [4, 4, 2, 1]),
+        ("custom", {"seeds": 8, "by_conference": False, "reseed": False}, False, [4, 2, 1]),
+    ],
+)
+def test_playoff_formats_play_out_to_a_champion(playoff_format, options, expansion, per_round):
+    client = auth_client()
+    league_id, season = build_playoff_season(client, team_count=24)
+    League.objects.filter(pk=league_id).update(
+        playoff_format=playoff_format, playoff_format_options=options, allow_playoff_expansion=expansion
+    )
+    season.refresh_from_db()
+
+    created = advance_playoff_rounds(season)
+    created_per_round = []
+    while created:
+        created_per_round.append(len(created))
+        next_games = []
+        for game in Game.objects.filter(id__in=created).select_related("week"):
+            game.status, game.home_score, game.away_score = "completed", 24, 17
+            game.save()
+            next_games.extend(record_playoff_result(game))
+        created = next_games
+    assert created_per_round == per_round
+
+    final = playoff_progress(season)["rounds"][-1]
+    assert final["round"] == "Championship"
+    # Higher seeds always won, so the final is between top seeds
+    assert {final["higher_seed"]["seed"], final["lower_seed"]["seed"]} <= {1, 2}
+    assert final["winner_seed"] == final["higher_seed"]["seed"]
+
+
+def test_playoff_simulate_runs_the_postseason_to_a_champion():
+    client = auth_client()
+    league_id, season = build_playoff_season(client)
+    url = reverse("league:playoff-simulate", args=[league_id, 2025])
+
+    fan = User.objects.create_user(email="fan@example.com", password="password123")
+    other = APIClient()
+    other.post(reverse("users:login"), {"email": fan.email, "password": "password123"}, format="json")
+    assert other.post(url, {}, format="json").status_code == 403
+
+    resp = client.post(url, {"detail_level": "score"}, format="json")
+    assert resp.status_code == 200
+    body = resp.json()
+    # 6 wildcard, 4 divisional, 2 conference, 1 championship game
+    assert len(body["simulated"]) == 13
+    assert all(game["status"] == "completed" for game in body["simulated"])
+    assert all(game["home_score"] != game["away_score"] for game in body["simulated"])
+    final = playoff_progress(season)["rounds"][-1]
+    assert final["round"] == "Championship"
+    assert (body["champion"]["seed"], body["champion"]["conference"]) == (
+        final["winner_seed"],
+        final["winner_conference"],
+    )
+    assert not Game.objects.filter(week__season=season, status="scheduled").exists()
+
+
+def test_playoff_games_still_tied_after_resims_get_a_winner(monkeypatch):
+    client = auth_client()
+    league_id, season = build_playoff_season(client)
+    simulate_week = season_pipeline.simulate_week
+
+    def tied_week(week, games, **kwargs):
+        result = simulate_week(week, games, **kwargs)
+        Game.objects.filter(pk__in=[game.pk for game in games]).update(away_score=F("home_score"))
+        for game in games:
+            game.away_score = game.home_score
+        return result
+
+    monkeypatch.setattr(season_pipeline, "simulate_week", tied_week)
+    resp = client.post(reverse("league:playoff-simulate", args=[league_id, 2025]), {"store_plays": True}, format="json")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert len(body["simulated"]) == 13
+    assert body["champion"] is not None
+    for game in Game.objects.filter(week__season=season, week__is_playoffs=True):
+        assert abs(game.home_score - game.away_score) == 3
+        assert game.winner_id == (game.home_team_id if game.home_score > game.away_score else game.away_team_id)
+        # The deciding field goal is in the play-by-play, which ends on the final score
+        overtime = game.plays.last()
+        assert overtime.quarter == 5 and "FG" in overtime.summary
+        assert (overtime.home_score, overtime.away_score) == (game.home_score, game.away_score)
+
+
+def test_playoff_simulate_requires_finished_regular_season():
+    client = auth_client()
+    league_id, season = build_playoff_season(client)
+    week = season.weeks.get(number=1)
+    teams = list(Team.objects.filter(league_id=league_id)[:2])
+    Game.objects.create(week=week, home_team=teams[0], away_team=teams[1], status="scheduled")
+
+    resp = client.post(reverse("league:playoff-simulate", args=[league_id, 2025]), {}, format="json")
+    assert resp.status_code == 400
+    assert not season.playoff_seeds.exists()
+
+
+def test_playoffs_played_without_a_stored_bracket_are_not_redrawn():
+    client = auth_client()
+    league_id, season = build_playoff_season(client)
+    teams = list(Team.objects.filter(league_id=league_id)[:2])
+    playoff_week = season.weeks.create(number=2, is_playoffs=True)
+    Game.objects.create(
+        week=playoff_week, home_team=teams[0], away_team=teams[1], status="completed", home_score=7, away_score=3
+    )
+
+    for name in ("playoff-advance", "playoff-simulate"):
+        resp = client.post(reverse(f"league:{name}", args=[league_id, 2025]), {}, format="json")
+        assert resp.status_code == 409
+        assert "without a stored bracket" in resp.json()["detail"]
+    assert not season.playoff_seeds.exists()
+    assert Game.objects.filter(week__season=season, week__is_playoffs=True).count() == 1
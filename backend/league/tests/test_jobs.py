@@ -0,0 +1,169 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from league.models import Conference, Division, Game, Job, League, Player, Season, Team
+from league.services import rosters
+from league.services.jobs import claim_next, enqueue, requeue_stale, run_pending
+from users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+def auth_client():
+    user = User.objects.create_user(email="commish@example.com", password="password123", is_commissioner=True)
+    client = APIClient()
+    client.post(reverse("users:login"), {"email": user.email, "password": "password123"}, format="json")
+    return client, user
+
+
+def build_league(user, team_count=2):
+    league = League.objects.create(name="Job League", created_by=user)
+    conference = Conference.objects.create(league=league, name="Conference 1")
+    division = Division.objects.create(conference=conference, name="Division 1")
+    teams = []
+    for idx in range(team_count):
+        team = Team.objects.create(
+            league=league,
+            conference=conference,
+            division=division,
+            name=f"Team {idx}",
+            city=f"City {idx}",
+            nickname=f"Nick {idx}",
+            abbreviation=f"T{idx}",
+        )
+        Player.objects.create(league=league, team=team, first_name="QB", last_name=team.abbreviation, position="QB")
+        teams.append(team)
+    return league, teams
+
+
+def test_async_week_sim_is_queued_and_run_by_worker():
+    client, user = auth_client()
+    league, teams = build_league(user)
+    season = Season.objects.create(league=league, year=2025)
+    week = season.weeks.create(number=1, is_playoffs=False)
+    game = Game.objects.create(week=week, home_team=teams[0], away_team=teams[1])
+
+    resp = client.post(reverse("league:week-simulate", args=[league.id, 2025, 1]) + "?async=1", {}, format="json")
+    assert resp.status_code == 202
+    job_id = resp.json()["id"]
+    assert resp.json()["status"] == "queued"
+    game.refresh_from_db()
+    assert game.status == "scheduled"
+
+    out = StringIO()
+    call_command("run_jobs", "--once", stdout=out)
+    assert "ran 1 jobs" in out.getvalue()
+    game.refresh_from_db()
+    assert game.status == "completed"
+
+    detail = client.get(reverse("league:job-detail", args=[job_id])).json()
+    assert detail["status"] == "completed"
+    assert detail["attempts"] == 1
+    assert detail["result"]["simulated"][0]["game_id"] == game.id
+    jobs = client.get(reverse("league:job-list", args=[league.id])).json()
+    assert [job["id"] for job in jobs] == [job_id]
+
+
+def test_async_roster_seed_and_season_sim_report_progress():
+    client, user = auth_client()
+    league, _ = build_league(user)
+    resp = client.post(reverse("league:roster-seed", args=[league.id]), {"async": True}, format="json")
+    assert resp.status_code == 202
+    client.post(reverse("league:season-generate", args=[league.id]), {"year": 2025}, format="json")
+    resp = client.post(reverse("league:season-simulate", args=[league.id, 2025]), {"async": True}, format="json")
+    assert resp.status_code == 202
+    season_job = Job.objects.get(pk=resp.json()["id"])
+
+    assert run_pending() == 2
+    assert Player.objects.filter(league=league).count() > 2
+    season_job.refresh_from_db()
+    assert season_job.status == "completed"
+    assert season_job.progress_done == season_job.progress_total > 0
+    assert not Game.objects.filter(week__season__league=league, status="scheduled").exists()
+
+
+def test_failed_job_is_retried_then_marked_failed():
+    job = enqueue("fa.resolve", {"league_id": 999999}, max_attempts=2)
+    assert run_pending() == 1
+    job.refresh_from_db()
+    assert job.status == "queued"
+    assert job.attempts == 1
+    assert "DoesNotExist" in job.error
+    # Backoff keeps it out of the queue until run_after
+    assert claim_next("worker-a") is None
+
+    Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+    assert run_pending() == 1
+    job.refresh_from_db()
+    assert job.status == "failed"
+    assert job.attempts == 2
+
+
+def test_failed_rookie_pool_job_rolls_back_and_is_not_retried(monkeypatch):
+    _, user = auth_client()
+    league = League.objects.create(name="Rookie League", created_by=user)
+    made = []
+    create_generated_player = rosters.create_generated_player
+
+    def fail_late(*args, **kwargs):
+        if len(made) == 10:
+            raise RuntimeError("name generator broke")
+        made.append(create_generated_player(*args, **kwargs))
+        return made[-1]
+
+    monkeypatch.setattr(rosters, "create_generated_player", fail_late)
+    job = enqueue("rookies.generate", {"league_id": league.id})
+    assert job.max_attempts == 1
+    assert run_pending() == 1
+    job.refresh_from_db()
+    assert job.status == "failed"
+    assert not Player.objects.filter(league=league).exists()
+
+
+def test_claim_next_hands_each_job_to_one_worker():
+    first = enqueue("rookies.generate", {"league_id": 1})
+    second = enqueue("rookies.generate", {"league_id": 1})
+    claimed_a = claim_next("worker-a")
+    claimed_b = claim_next("worker-b")
+    assert {claimed_a.id, claimed_b.id} == {first.id, second.id}
+    assert claimed_a.locked_by == "worker-a" and claimed_a.status == "running"
+    assert claim_next("worker-c") is None
+
+
+def test_requeue_stale_only_releases_jobs_of_dead_workers():
+    live = enqueue("rookies.generate", {"league_id": 1}, max_attempts=3)
+    dead = enqueue("rookies.generate", {"league_id": 1}, max_attempts=3)
+    exhausted = enqueue("rookies.generate", {"league_id": 1}, max_attempts=1)
+    for worker in ("worker-a", "worker-b", "worker-c"):
+        claim_next(worker)
+    long_ago = timezone.now() - timedelta(hours=2)
+    # A long-running job keeps its heartbeat fresh however old its lock is
+    Job.objects.filter(pk=live.pk).update(locked_at=long_ago)
+    Job.objects.filter(pk__in=[dead.pk, exhausted.pk]).update(locked_at=long_ago, heartbeat_at=long_ago)
+
+    assert requeue_stale() == 2
+    live.refresh_from_db()
+    dead.refresh_from_db()
+    exhausted.refresh_from_db()
+    assert live.status == "running"
+    assert dead.status == "queued" and dead.locked_by == "" and dead.attempts == 1
+    assert exhausted.status == "failed" and "stopped responding" in exhausted.error
+
+
+def test_jobs_are_only_visible_to_their_requester_and_league_owner():
+    client, user = auth_client()
+    league, _ = build_league(user)
+    job = enqueue("rookies.generate", {"league_id": league.id}, league=league, user=user)
+    outsider = User.objects.create_user(email="other@example.com", password="password123")
+    other = APIClient()
+    other.post(reverse("users:login"), {"email": outsider.email, "password": "password123"}, format="json")
+
+    assert client.get(reverse("league:job-detail", args=[job.id])).status_code == 200
+    assert other.get(reverse("league:job-detail", args=[job.id])).status_code == 404
+    assert other.get(reverse("league:job-list", args=[league.id])).json() == []
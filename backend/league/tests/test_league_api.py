@@ -57,3 +57,22 @@ def test_list_leagues_scoped_to_owner():
     assert resp.status_code == 200
     names = [item["name"] for item in resp.json()]
     assert names == ["Mine"]
+
+
+def test_playoff_format_expansion_requires_league_flag():
+    client, _ = authenticated_client()
+    league_id = client.post(reverse("league:league-list-create"), {"name": "Formats"}, format="json").json()["id"]
+    url = reverse("league:league-update", args=[league_id])
+
+    resp = client.patch(url, {"playoff_format": "conference-8"}, format="json")
+    assert resp.status_code == 400
+    assert "playoff_format" in resp.json()
+
+    resp = client.patch(url, {"playoff_format": "conference-8", "allow_playoff_expansion": True}, format="json")
+    assert resp.status_code == 200
+    assert resp.json()["playoff_format"] == "conference-8"
+
+    resp = client.patch(url, {"playoff_format": "custom", "playoff_format_options": {"seeds": 5}}, format="json")
+    assert resp.status_code == 200
+    resp = client.patch(url, {"playoff_format_options": {"seeds": 6, "byes": 1}}, format="json")
+    assert resp.status_code == 400
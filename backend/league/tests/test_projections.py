@@ -0,0 +1,149 @@
+import numpy as np
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from league.models import Conference, Division, Game, League, Player, Season, Team
+from league.services import sim_engine
+from league.services.projections import play_probabilities, project_season
+from users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+def auth_client():
+    user = User.objects.create_user(email="commish@example.com", password="password123", is_commissioner=True)
+    client = APIClient()
+    client.post(reverse("users:login"), {"email": user.email, "password": "password123"}, format="json")
+    return client, user
+
+
+def build_league(user, team_count=4):
+    league = League.objects.create(name="Projection League", created_by=user)
+    conference = Conference.objects.create(league=league, name="Conference 1")
+    division = Division.objects.create(conference=conference, name="Division 1")
+    teams = []
+    for idx in range(team_count):
+        team = Team.objects.create(
+            league=league,
+            conference=conference,
+            division=division,
+            name=f"Team {idx}",
+            city=f"City {idx}",
+            nickname=f"Nick {idx}",
+            abbreviation=f"T{idx}",
+        )
+        Player.objects.create(
+            league=league,
+            team=team,
+            first_name="QB",
+            last_name=team.abbreviation,
+            position="QB",
+            overall_rating=60 + idx * 10,
+        )
+        teams.append(team)
+    return league, teams
+
+
+def test_play_probabilities_match_engine_scoring_rates():
+    arrays = sim_engine.simulate_matchups([80] * 4000, [60] * 4000, rng=np.random.default_rng(5))
+    home_points = arrays["home_score"][:, -1].mean()
+    pvals = play_probabilities(np.array([80.0]), np.array([60.0]))[0]
+    expected = sim_engine.PLAYS_PER_GAME * (pvals[0] * sim_engine.TD_POINTS + pvals[1] * sim_engine.FG_POINTS)
+    assert pvals.sum() == pytest.approx(1.0)
+    assert home_points == pytest.approx(expected, rel=0.05)
+
+
+def test_project_season_odds_and_seeds():
+    _, user = auth_client()
+    league, teams = build_league(user)
+    season = Season.objects.create(league=league, year=2025)
+    week1 = season.weeks.create(number=1, is_playoffs=False)
+    week2 = season.weeks.create(number=2, is_playoffs=False)
+    Game.objects.create(
+        week=week1,
+        home_team=teams[3],
+        away_team=teams[0],
+        status="completed",
+        home_score=21,
+        away_score=3,
+        winner=teams[3],
+        loser=teams[0],
+    )
+    Game.objects.create(week=week1, home_team=teams[1], away_team=teams[2])
+    Game.objects.create(week=week2, home_team=teams[0], away_team=teams[3])
+
+    rows = project_season(season, iterations=3000, seeds=2, rng=np.random.default_rng(1))
+    by_team = {row["team_id"]: row for row in rows}
+    assert sum(row["playoff_odds"] for row in rows) == pytest.approx(2.0)
+    strongest = by_team[teams[3].id]
+    assert strongest["wins"] == 1
+    assert 1.5 < strongest["projected_wins"] <= 2.0
+    assert strongest["playoff_odds"] > by_team[teams[0].id]["playoff_odds"]
+    # Both are rounded to four places separately
+    assert sum(strongest["seed_odds"].values()) == pytest.approx(strongest["playoff_odds"], abs=1e-3)
+
+
+def test_projected_seeds_break_ties_head_to_head_before_points():
+    _, user = auth_client()
+    league, teams = build_league(user)
+    season = Season.objects.create(league=league, year=2025)
+    week = season.weeks.create(number=1, is_playoffs=False)
+    for home, away, home_score, away_score in ((2, 0, 60, 0), (3, 2, 7, 6), (1, 3, 3, 0)):
+        Game.objects.create(
+            week=week,
+            home_team=teams[home],
+            away_team=teams[away],
+            status="completed",
+            home_score=home_score,
+            away_score=away_score,
+        )
+
+    rows = project_season(season, iterations=10, seeds=3, rng=np.random.default_rng(1))
+    seeds = {row["team_id"]: max(row["seed_odds"], key=row["seed_odds"].get) for row in rows if row["playoff_odds"]}
+    # T2 and T3 are both 1-1; T3 won their meeting even though T2 scored far more
+    assert seeds == {teams[1].id: "1", teams[3].id: "2", teams[2].id: "3"}
+
+
+def test_projections_follow_the_league_playoff_format():
+    _, user = auth_client()
+    league, teams = build_league(user, team_count=16)
+    league.playoff_format, league.allow_playoff_expansion = "league-12", True
+    league.save()
+    other = Conference.objects.create(league=league, name="Conference 2")
+    division = Division.objects.create(conference=other, name="Division 2")
+    Team.objects.filter(pk__in=[team.pk for team in teams[8:]]).update(conference=other, division=division)
+    season = Season.objects.create(league=league, year=2025)
+    week = season.weeks.create(number=1, is_playoffs=False)
+    for idx in range(0, 16, 2):
+        Game.objects.create(week=week, home_team=teams[idx], away_team=teams[idx + 1])
+
+    rows = project_season(season, iterations=200, rng=np.random.default_rng(3))
+    # One league-wide bracket of 12, not 7 per conference
+    assert sum(row["playoff_odds"] for row in rows) == pytest.approx(12.0)
+    assert {seed for row in rows for seed in row["seed_odds"]} == {str(seed) for seed in range(1, 13)}
+
+
+def test_projection_endpoint_caches_until_a_game_completes():
+    client, user = auth_client()
+    league, teams = build_league(user)
+    season = Season.objects.create(league=league, year=2025)
+    week = season.weeks.create(number=1, is_playoffs=False)
+    game = Game.objects.create(week=week, home_team=teams[0], away_team=teams[1])
+    Game.objects.create(week=week, home_team=teams[2], away_team=teams[3])
+
+    url = reverse("league:season-projections", args=[league.id, 2025])
+    first = client.get(url, {"iterations": 500}).json()
+    assert first["iterations"] == 500
+    assert len(first["teams"]) == 4
+    assert client.get(url, {"iterations": 500}).json() == first
+
+    game.status = "completed"
+    game.home_score, game.away_score = 10, 0
+    game.winner, game.loser = teams[0], teams[1]
+    game.save()
+    updated = client.get(url, {"iterations": 500}).json()
+    assert updated["version"] != first["version"]
+    assert {row["team_id"]: row["wins"] for row in updated["teams"]}[teams[0].id] == 1
+
+    assert client.get(url, {"iterations": "lots"}).status_code == 400
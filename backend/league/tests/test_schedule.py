@@ -1,8 +1,11 @@
+from collections import Counter
+
 import pytest
 from django.urls import reverse
 from rest_framework.test import APIClient
 
-from league.models import Conference, Division, Game, Season
+from league.models import AuditLog, ByeWeek, Conference, Division, Game, League, Season, Team, TeamGameStat
+from league.services.schedule_generator import generate_regular_season_schedule
 from users.models import User
 
 pytestmark = pytest.mark.django_db
@@ -63,6 +66,27 @@ def test_generate_schedule_round_robin():
     assert all("games" in week for week in data["weeks"])
 
 
+def test_generate_schedule_failure_keeps_the_existing_season(monkeypatch):
+    client, _ = auth_client()
+    league_id = create_league(client)
+    conference = Conference.objects.filter(league_id=league_id).first()
+    division = Division.objects.filter(conference=conference).first()
+    for idx, abbr in enumerate(["T1", "T2", "T3", "T4"], start=1):
+        scaffold_team(client, league_id, conference, division, abbr, f"Team {idx}")
+    url = reverse("league:season-generate", args=[league_id])
+    client.post(url, {"year": 2025}, format="json")
+    season = Season.objects.get(league_id=league_id, year=2025)
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("bulk insert failed")
+
+    monkeypatch.setattr(Game.objects, "bulk_create", fail)
+    with pytest.raises(RuntimeError):
+        generate_regular_season_schedule(League.objects.get(pk=league_id), 2025)
+    assert season.weeks.count() == 3
+    assert Game.objects.filter(week__season=season).count() == 6
+
+
 def test_generate_schedule_requires_two_teams():
     client, _ = auth_client()
     league_id = create_league(client)
@@ -70,3 +94,185 @@ def test_generate_schedule_requires_two_teams():
     resp = client.post(url, {"year": 2025}, format="json")
     assert resp.status_code == 400
     assert "At least two teams" in resp.json()["detail"]
+
+
+def build_nfl_teams(league_id):
+    conferences = list(Conference.objects.filter(league_id=league_id).order_by("order"))
+    assert len(conferences) == 2
+    teams = []
+    for conference in conferences:
+        divisions = list(Division.objects.filter(conference=conference).order_by("order"))
+        assert len(divisions) == 4
+        for division in divisions:
+            for slot in range(4):
+                teams.append(
+                    Team.objects.create(
+                        league_id=league_id,
+                        conference=conference,
+                        division=division,
+                        name=f"Team {len(teams)}",
+                        city=f"City {len(teams)}",
+                        nickname=f"Nick {len(teams)}",
+                        abbreviation=f"N{len(teams)}",
+                    )
+                )
+    return teams
+
+
+def test_generate_nfl_formula_schedule_for_32_teams():
+    client, _ = auth_client()
+    league_id = create_league(client)
+    teams = build_nfl_teams(league_id)
+    season = Season.objects.create(league_id=league_id, year=2025)
+    division_teams = [t for t in teams if t.division_id == teams[0].division_id]
+    for team in division_teams:
+        ByeWeek.objects.create(season=season, team=team, week_number=9)
+
+    resp = client.post(reverse("league:season-generate", args=[league_id]), {"year": 2025}, format="json")
+    assert resp.status_code == 201
+    assert season.weeks.count() == 18
+    games = list(Game.objects.filter(week__season=season).select_related("week"))
+    assert len(games) == 272
+
+    played = Counter()
+    home = Counter()
+    weeks_played = {team.id: set() for team in teams}
+    meetings = Counter()
+    for game in games:
+        for team_id in (game.home_team_id, game.away_team_id):
+            played[team_id] += 1
+            assert game.week.number not in weeks_played[team_id]
+            weeks_played[team_id].add(game.week.number)
+        home[game.home_team_id] += 1
+        meetings[frozenset((game.home_team_id, game.away_team_id))] += 1
+    division_of = {team.id: team.division_id for team in teams}
+    for team in teams:
+        assert played[team.id] == 17
+        assert home[team.id] in (8, 9)
+        rivals = [t for t in teams if t.division_id == team.division_id and t.id != team.id]
+        assert all(meetings[frozenset((team.id, rival.id))] == 2 for rival in rivals)
+    assert all(count == 1 for pair, count in meetings.items() if len({division_of[t] for t in pair}) == 2)
+    for team in division_teams:
+        assert set(range(1, 19)) - weeks_played[team.id] == {9}
+
+
+def test_nfl_schedule_honours_per_team_byes_within_a_division():
+    client, _ = auth_client()
+    league_id = create_league(client)
+    teams = build_nfl_teams(league_id)
+    season = Season.objects.create(league_id=league_id, year=2025)
+    ByeWeek.objects.create(season=season, team=teams[0], week_number=6)
+    ByeWeek.objects.create(season=season, team=teams[1], week_number=9)
+    resp = client.post(reverse("league:season-generate", args=[league_id]), {"year": 2025}, format="json")
+    assert resp.status_code == 201
+
+    games = list(Game.objects.filter(week__season=season).select_related("week"))
+    assert len(games) == 272
+    weeks_played = {team.id: Counter() for team in teams}
+    for game in games:
+        weeks_played[game.home_team_id][game.week.number] += 1
+        weeks_played[game.away_team_id][game.week.number] += 1
+    assert all(max(weeks.values()) == 1 and len(weeks) == 17 for weeks in weeks_played.values())
+    assert set(range(1, 19)) - set(weeks_played[teams[0].id]) == {6}
+    assert set(range(1, 19)) - set(weeks_played[teams[1].id]) == {9}
+
+
+def test_nfl_schedule_rejects_byes_that_leave_a_team_idle_alone():
+    client, _ = auth_client()
+    league_id = create_league(client)
+    teams = build_nfl_teams(league_id)
+    season = Season.objects.create(league_id=league_id, year=2025)
+    for idx, team in enumerate(teams):
+        ByeWeek.objects.create(season=season, team=team, week_number=10 if idx == 0 else 5 + idx // 4)
+    resp = client.post(reverse("league:season-generate", args=[league_id]), {"year": 2025}, format="json")
+    assert resp.status_code == 400
+    assert "can't all be honoured" in resp.json()["detail"]
+
+
+def test_incremental_regenerate_keeps_played_games_and_reports_diff():
+    client, _ = auth_client()
+    league_id = create_league(client)
+    conference = Conference.objects.filter(league_id=league_id).first()
+    division = Division.objects.filter(conference=conference).first()
+    for idx, abbr in enumerate(["T1", "T2", "T3", "T4"], start=1):
+        scaffold_team(client, league_id, conference, division, abbr, f"Team {idx}")
+    url = reverse("league:season-generate", args=[league_id])
+    client.post(url, {"year": 2025}, format="json")
+    season = Season.objects.get(league_id=league_id, year=2025)
+
+    played = Game.objects.filter(week__season=season, week__number=1).first()
+    Game.objects.filter(pk=played.pk).update(status="completed", home_score=21, away_score=14)
+    TeamGameStat.objects.create(game=played, team_id=played.home_team_id, total_yards=300)
+    flipped, removed = Game.objects.filter(week__season=season, week__number=2)
+    Game.objects.filter(pk=flipped.pk).update(home_team=flipped.away_team, away_team=flipped.home_team)
+    removed.delete()
+    Game.objects.create(week=season.weeks.get(number=3), home_team=played.home_team, away_team=played.away_team)
+
+    resp = client.post(url, {"year": 2025, "mode": "incremental"}, format="json")
+    assert resp.status_code == 200
+    diff = resp.json()["diff"]
+    assert (diff["kept"], diff["unchanged"], diff["updated"], diff["inserted"], diff["deleted"]) == (1, 3, 1, 1, 1)
+    assert diff["skipped"] == []
+    played.refresh_from_db()
+    assert (played.status, played.home_score) == ("completed", 21)
+    assert TeamGameStat.objects.filter(game=played).exists()
+    assert Game.objects.filter(week__season=season).count() == 6
+
+    resp = client.post(url, {"year": 2025, "mode": "incremental"}, format="json")
+    diff = resp.json()["diff"]
+    assert (diff["unchanged"], diff["updated"], diff["inserted"], diff["deleted"]) == (5, 0, 0, 0)
+
+
+def test_bulk_game_update_validates_in_one_pass_and_applies_atomically():
+    client, _ = auth_client()
+    league_id = create_league(client)
+    conference = Conference.objects.filter(league_id=league_id).first()
+    division = Division.objects.filter(conference=conference).first()
+    for idx, abbr in enumerate(["T1", "T2", "T3", "T4"], start=1):
+        scaffold_team(client, league_id, conference, division, abbr, f"Team {idx}")
+    client.post(reverse("league:season-generate", args=[league_id]), {"year": 2025}, format="json")
+    season = Season.objects.get(league_id=league_id, year=2025)
+    week2, week3 = season.weeks.get(number=2), season.weeks.get(number=3)
+    week2_games, week3_games = list(week2.games.all()), list(week3.games.all())
+    url = reverse("league:game-bulk-update", args=[league_id])
+
+    other_league = create_league(client)
+    outsider = scaffold_team(
+        client,
+        other_league,
+        Conference.objects.filter(league_id=other_league).first(),
+        Division.objects.filter(conference__league_id=other_league).first(),
+        "X1",
+        "Outsider",
+    )
+    resp = client.post(
+        url,
+        {
+            "games": [
+                {"id": week2_games[0].id, "week": week3.id},
+                {"id": week3_games[0].id, "home_team": outsider},
+            ]
+        },
+        format="json",
+    )
+    assert resp.status_code == 400
+    assert [error["index"] for error in resp.json()["errors"]] == [1]
+
+    resp = client.post(url, {"games": [{"id": week2_games[0].id, "week": week3.id}]}, format="json")
+    assert resp.status_code == 400
+    assert "double-booked" in resp.json()["errors"][0]["detail"]
+    assert Game.objects.get(pk=week2_games[0].pk).week_id == week2.id
+
+    edits = [{"id": game.id, "week": week3.id} for game in week2_games]
+    edits += [{"id": game.id, "week": week2.id} for game in week3_games]
+    flipped = week3_games[0]
+    original_away = flipped.away_team_id
+    edits[-len(week3_games)]["home_team"] = flipped.away_team_id
+    edits[-len(week3_games)]["away_team"] = flipped.home_team_id
+    resp = client.post(url, {"games": edits}, format="json")
+    assert resp.status_code == 200
+    assert len(resp.json()["updated"]) == 4
+    assert set(week3.games.values_list("id", flat=True)) == {game.id for game in week2_games}
+    flipped.refresh_from_db()
+    assert (flipped.week_id, flipped.home_team_id) == (week2.id, original_away)
+    assert AuditLog.objects.filter(action="game.bulk_update").count() == 1
@@ -0,0 +1,173 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from league.models import Conference, Division, Game, Injury, League, Player, Season, SimCheckpoint, SimRun, Team
+from league.services import season_pipeline, season_sim
+from users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+def auth_client():
+    user = User.objects.create_user(email="commish@example.com", password="password123", is_commissioner=True)
+    client = APIClient()
+    client.post(reverse("users:login"), {"email": user.email, "password": "password123"}, format="json")
+    return client, user
+
+
+def build_league(user, team_count=4, conference_count=1):
+    league = League.objects.create(name="Season League", created_by=user)
+    divisions = []
+    for conf_index in range(conference_count):
+        conference = Conference.objects.create(league=league, name=f"Conference {conf_index + 1}")
+        divisions.append(Division.objects.create(conference=conference, name="Division 1"))
+    for idx in range(team_count):
+        division = divisions[idx % conference_count]
+        conference = division.conference
+        team = Team.objects.create(
+            league=league,
+            conference=conference,
+            division=division,
+            name=f"Team {idx}",
+            city=f"City {idx}",
+            nickname=f"Nick {idx}",
+            abbreviation=f"T{idx}",
+        )
+        for position in ["QB", "RB", "WR", "TE"]:
+            Player.objects.create(
+                league=league, team=team, first_name=position, last_name=team.abbreviation, position=position
+            )
+    return league
+
+
+def test_simulate_season_through_week_records_progress():
+    client, user = auth_client()
+    league = build_league(user)
+    resp = client.post(reverse("league:season-generate", args=[league.id]), {"year": 2025}, format="json")
+    assert resp.status_code == 201
+    season = Season.objects.get(league=league, year=2025)
+
+    url = reverse("league:season-simulate", args=[league.id, 2025])
+    resp = client.post(url, {"through_week": 2}, format="json")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["status"] == "completed"
+    assert data["weeks_done"] == 2
+    assert data["games_done"] == 4
+    assert data["current_week"] == 2
+    assert Game.objects.filter(week__season=season, week__number=3, status="scheduled").count() == 2
+    # One SimRun for the whole call, not one per week
+    run = SimRun.objects.get(season=season)
+    assert (run.scope, run.games) == ("season", 4)
+
+    # Second run only picks up the remaining week
+    resp = client.post(url, {}, format="json")
+    assert resp.json()["weeks_done"] == 1
+    assert not Game.objects.filter(week__season=season, status="scheduled").exists()
+
+    runs = client.get(url).json()
+    assert [run["games_done"] for run in runs] == [2, 4]
+    detail = client.get(reverse("league:season-simulation-detail", args=[league.id, 2025, data["id"]]))
+    assert detail.status_code == 200
+    assert detail.json()["weeks_total"] == 2
+
+
+def test_simulate_season_requires_commissioner():
+    _, commish = auth_client()
+    league = build_league(commish)
+    Season.objects.create(league=league, year=2025)
+    owner = User.objects.create_user(email="owner@example.com", password="password123")
+    client = APIClient()
+    client.post(reverse("users:login"), {"email": owner.email, "password": "password123"}, format="json")
+    resp = client.post(reverse("league:season-simulate", args=[league.id, 2025]), {}, format="json")
+    assert resp.status_code == 403
+
+
+def test_simulate_seasons_command_runs_playoffs_and_rolls_over():
+    _, user = auth_client()
+    league = build_league(user, team_count=12, conference_count=2)
+    Season.objects.create(league=league, year=2024)
+    hurt = Player.objects.filter(league=league, position="QB").first()
+    hurt.injury_status = "injured"
+    hurt.on_ir = True
+    hurt.save()
+    Injury.objects.create(player=hurt, league=league)
+
+    out = StringIO()
+    call_command("simulate_seasons", "--league", str(league.id), "--seasons", "2", stdout=out)
+    assert "seasons/min" in out.getvalue()
+
+    seasons = Season.objects.filter(league=league, year__gt=2024).order_by("year")
+    assert [season.year for season in seasons] == [2025, 2026]
+    for season in seasons:
+        assert not Game.objects.filter(week__season=season, status="scheduled").exists()
+        playoff_games = Game.objects.filter(week__season=season, week__is_playoffs=True)
+        assert playoff_games.exists()
+        assert all(game.home_score != game.away_score for game in playoff_games)
+    assert SimRun.objects.filter(league=league, scope="season").count() == 2
+
+    hurt.refresh_from_db()
+    assert (hurt.age, hurt.on_ir, hurt.injury_status) == (23, False, "healthy")
+    assert not Injury.objects.filter(player=hurt, status="active").exists()
+
+
+def test_failed_season_in_simulate_seasons_keeps_its_sim_run(monkeypatch):
+    _, user = auth_client()
+    league = build_league(user, team_count=4)
+
+    def broken_playoffs(*args, **kwargs):
+        raise RuntimeError("bracket exploded")
+
+    monkeypatch.setattr(season_pipeline, "simulate_playoffs", broken_playoffs)
+    with pytest.raises(RuntimeError):
+        season_pipeline.simulate_seasons(league, 1, start_year=2025)
+    assert not Season.objects.filter(league=league, year=2025).exists()
+    run = SimRun.objects.get(league=league, scope="season")
+    assert (run.status, run.season_id, run.error) == ("failed", None, "RuntimeError: bracket exploded")
+    assert run.games > 0 and run.simulate_ms > 0
+
+
+def test_week_sim_resumes_from_checkpoint_after_failed_chunk(monkeypatch):
+    _, user = auth_client()
+    league = build_league(user)
+    teams = list(Team.objects.filter(league=league).order_by("id"))
+    season = Season.objects.create(league=league, year=2025)
+    week = season.weeks.create(number=1, is_playoffs=False)
+    first = Game.objects.create(week=week, home_team=teams[0], away_team=teams[1])
+    second = Game.objects.create(week=week, home_team=teams[2], away_team=teams[3])
+
+    real_persist = season_sim.persist_sim_results
+    calls = []
+
+    def flaky_persist(pairs, **kwargs):
+        calls.append([game.id for game, _ in pairs])
+        if len(calls) == 2:
+            raise RuntimeError("connection lost")
+        return real_persist(pairs, **kwargs)
+
+    monkeypatch.setattr(season_sim, "persist_sim_results", flaky_persist)
+    with pytest.raises(RuntimeError):
+        season_sim.simulate_week(week, chunk_size=1)
+    first.refresh_from_db()
+    second.refresh_from_db()
+    assert (first.status, second.status) == ("completed", "scheduled")
+    checkpoint = SimCheckpoint.objects.get(week=week)
+    assert (checkpoint.status, checkpoint.done_game_ids, checkpoint.error) == ("failed", [first.id], "connection lost")
+    # The failed sim still records its run, with the phases it reached
+    failed_run = SimRun.objects.get(season=season, scope="week")
+    assert (failed_run.status, failed_run.error, failed_run.games) == ("failed", "RuntimeError: connection lost", 1)
+    assert failed_run.persist_queries > 0
+    first_score = (first.home_score, first.away_score, first.sim_seed)
+
+    simulated = season_sim.simulate_week(week, chunk_size=1)
+    assert [game.id for game in simulated] == [second.id]
+    assert calls[-1] == [second.id]
+    first.refresh_from_db()
+    assert (first.home_score, first.away_score, first.sim_seed) == first_score
+    checkpoint.refresh_from_db()
+    assert (checkpoint.status, checkpoint.games_done, checkpoint.attempts) == ("completed", 2, 2)
+    assert not Game.objects.filter(week=week, status="scheduled").exists()
@@ -0,0 +1,444 @@
+from io import StringIO
+
+import numpy as np
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from league.models import (
+    Conference,
+    Division,
+    Game,
+    League,
+    PackedPlayLog,
+    PlayLog,
+    Player,
+    PlayerGameStat,
+    Season,
+    SimRun,
+    Team,
+    TeamGameStat,
+)
+from league.services import play_codec, sim_engine
+from league.services.ratings import get_team_snapshots
+from league.services.simulator import (
+    game_play_log,
+    persist_sim_results,
+    run_matchups,
+    settle_tied_games,
+    simulate_games,
+)
+from league.services.standings import compute_standings
+from league.services.stats import player_leaders, player_season_stats, team_season_stats
+from users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+def auth_client():
+    user = User.objects.create_user(email="commish@example.com", password="password123", is_commissioner=True)
+    client = APIClient()
+    client.post(reverse("users:login"), {"email": user.email, "password": "password123"}, format="json")
+    return client, user
+
+
+def build_league(user, team_count=4):
+    league = League.objects.create(name="Sim League", created_by=user)
+    conference = Conference.objects.create(league=league, name="Conference 1")
+    division = Division.objects.create(conference=conference, name="Division 1")
+    teams = []
+    for idx in range(team_count):
+        team = Team.objects.create(
+            league=league,
+            conference=conference,
+            division=division,
+            name=f"Team {idx}",
+            city=f"City {idx}",
+            nickname=f"Nick {idx}",
+            abbreviation=f"T{idx}",
+        )
+        for position, rating in [("QB", 80), ("RB", 70), ("WR", 75), ("TE", 65), ("OL", 70)]:
+            Player.objects.create(
+                league=league,
+                team=team,
+                first_name=position,
+                last_name=team.abbreviation,
+                position=position,
+                overall_rating=rating + idx,
+            )
+        teams.append(team)
+    return league, teams
+
+
+def test_engine_batch_shapes_and_scores():
+    arrays = sim_engine.simulate_matchups([70, 80, 65], [75, 60, 65], rng=np.random.default_rng(7))
+    assert arrays["yards"].shape == (3, sim_engine.PLAYS_PER_GAME)
+    assert (np.diff(arrays["home_score"], axis=1) >= 0).all()
+    assert (np.diff(arrays["away_score"], axis=1) >= 0).all()
+    assert arrays["yards"].min() >= -10 and arrays["yards"].max() <= 80
+    plays = sim_engine.game_plays(arrays, 1)
+    assert len(plays) == sim_engine.PLAYS_PER_GAME
+    assert plays[-1]["home_score"] == int(arrays["home_score"][1, -1])
+    assert [p["quarter"] for p in plays[::12]] == [1, 2, 3, 4]
+
+
+def test_simulate_games_batch_matches_game_shape():
+    _, user = auth_client()
+    league, teams = build_league(user)
+    season = Season.objects.create(league=league, year=2025)
+    week = season.weeks.create(number=1, is_playoffs=False)
+    games = [
+        Game.objects.create(week=week, home_team=teams[0], away_team=teams[1]),
+        Game.objects.create(week=week, home_team=teams[2], away_team=teams[3]),
+    ]
+    results = simulate_games(games)
+    assert len(results) == 2
+    for game, result in zip(games, results):
+        assert result["status"] == "completed"
+        assert result["plays"][-1]["home_score"] == result["home_score"]
+        if result["home_score"] > result["away_score"]:
+            assert result["winner"] == game.home_team
+        elif result["away_score"] > result["home_score"]:
+            assert result["winner"] == game.away_team
+        else:
+            assert result["winner"] is None
+
+
+def test_week_simulate_endpoint_persists_batch():
+    client, user = auth_client()
+    league, teams = build_league(user)
+    season = Season.objects.create(league=league, year=2025)
+    week = season.weeks.create(number=1, is_playoffs=False)
+    Game.objects.create(week=week, home_team=teams[0], away_team=teams[1])
+    Game.objects.create(week=week, home_team=teams[2], away_team=teams[3])
+
+    url = reverse("league:week-simulate", args=[league.id, 2025, 1])
+    resp = client.post(url, {}, format="json")
+    assert resp.status_code == 200
+    assert len(resp.json()["simulated"]) == 2
+    assert Game.objects.filter(week=week, status="completed").count() == 2
+    assert PlayLog.objects.filter(game__week=week).count() == 2 * sim_engine.PLAYS_PER_GAME
+
+
+def test_team_rating_snapshot_rebuilds_only_on_roster_change():
+    _, user = auth_client()
+    _, teams = build_league(user, team_count=2)
+    team = teams[0]
+    snapshot = get_team_snapshots([team.id])[team.id]
+    assert snapshot.version == 1
+    assert len(snapshot.player_ratings) == 5
+
+    qb = team.players.get(position="QB")
+    rating = snapshot.player_ratings[str(qb.id)]
+    qb.age = 30
+    qb.save(update_fields=["age"])
+    assert get_team_snapshots([team.id])[team.id].version == 1
+
+    qb.overall_rating = 95
+    qb.save()
+    snapshot = get_team_snapshots([team.id])[team.id]
+    assert snapshot.version == 2
+    assert snapshot.player_ratings[str(qb.id)] > rating
+
+    qb.team = teams[1]
+    qb.save(update_fields=["team"])
+    snapshots = get_team_snapshots([team.id, teams[1].id])
+    assert str(qb.id) not in snapshots[team.id].player_ratings
+    assert str(qb.id) in snapshots[teams[1].id].player_ratings
+
+
+def test_persist_sim_results_writes_batch_in_few_queries(django_assert_max_num_queries):
+    _, user = auth_client()
+    league, teams = build_league(user)
+    season = Season.objects.create(league=league, year=2025)
+    week = season.weeks.create(number=1, is_playoffs=False)
+    games = [
+        Game.objects.create(week=week, home_team=teams[0], away_team=teams[1]),
+        Game.objects.create(week=week, home_team=teams[2], away_team=teams[3]),
+    ]
+    results = simulate_games(games)
+    # Batch writes plus fixed queries to fold the results into the standings and season stat totals
+    with django_assert_max_num_queries(18):
+        written = persist_sim_results(list(zip(games, results)))
+    assert written["plays"] == 2 * sim_engine.PLAYS_PER_GAME
+    assert TeamGameStat.objects.filter(game__week=week).count() == 4
+    qb_stat = PlayerGameStat.objects.get(game=games[0], team=teams[0], position="QB")
+    # One RB on the roster, so the QB also picks up carries on the same stat line
+    assert qb_stat.pass_att == 25 and qb_stat.rush_att == 4
+
+    # Re-simulating replaces plays/team stats and upserts player lines in place
+    player_stat_count = PlayerGameStat.objects.count()
+    persist_sim_results(list(zip(games, simulate_games(games))))
+    assert PlayLog.objects.filter(game__week=week).count() == 2 * sim_engine.PLAYS_PER_GAME
+    assert TeamGameStat.objects.filter(game__week=week).count() == 4
+    assert PlayerGameStat.objects.count() == player_stat_count
+    games[0].refresh_from_db()
+    assert games[0].status == "completed"
+    # The re-sim swapped the old results out of the standings rather than adding to them
+    assert sum(row["wins"] + row["losses"] + row["ties"] for row in compute_standings(season)) == 4
+
+
+
+def _season_totals(season):
+    return (
+        sorted(
+            (row["player_id"], row["games"], row["pass_yds"], row["tackles"]) for row in player_season_stats(season)
+        ),
+        sorted((row["team_id"], row["games"], row["total_yards"]) for row in team_season_stats(season)),
+    )
+
+
+def test_season_stat_totals_follow_resims_and_rebuild():
+    _, user = auth_client()
+    league, teams = build_league(user)
+    season = Season.objects.create(league=league, year=2025)
+    week = season.weeks.create(number=1, is_playoffs=False)
+    games = [
+        Game.objects.create(week=week, home_team=teams[0], away_team=teams[1]),
+        Game.objects.create(week=week, home_team=teams[2], away_team=teams[3]),
+    ]
+    persist_sim_results(list(zip(games, simulate_games(games))))
+    first = _season_totals(season)
+    assert len(first[1]) == 4 and all(played == 1 for _, played, _ in first[1])
+    qb_line = PlayerGameStat.objects.get(game=games[0], team=teams[0], position="QB")
+    leader = player_leaders(season, "pass_yds", limit=1)[0]
+    assert leader["pass_yds"] == PlayerGameStat.objects.order_by("-pass_yds").first().pass_yds
+
+    # A re-sim swaps the game's old lines out of the totals instead of adding to them
+    persist_sim_results(list(zip(games, simulate_games(games))))
+    resimmed = _season_totals(season)
+    assert all(played == 1 for _, played, _ in resimmed[1])
+    qb_line.refresh_from_db()
+    assert (qb_line.player_id, 1, qb_line.pass_yds, qb_line.tackles) in resimmed[0]
+
+    # A score-only re-sim drops that game's lines, and their totals with them
+    persist_sim_results([(games[0], simulate_games([games[0]], detail_level="score")[0])])
+    assert not any(player_id == qb_line.player_id for player_id, *_ in _season_totals(season)[0])
+    totals = _season_totals(season)
+    assert sorted(team_id for team_id, *_ in totals[1]) == [teams[2].id, teams[3].id]
+
+    call_command("rebuild_season_stats", league=league.id, stdout=StringIO())
+    assert _season_totals(season) == totals
+
+
+def test_season_stat_positions_come_from_the_latest_game_in_both_paths():
+    _, user = auth_client()
+    league, teams = build_league(user)
+    season = Season.objects.create(league=league, year=2025)
+    week1 = season.weeks.create(number=1, is_playoffs=False)
+    week2 = season.weeks.create(number=2, is_playoffs=False)
+    early = Game.objects.create(week=week1, home_team=teams[0], away_team=teams[1])
+    late = Game.objects.create(week=week2, home_team=teams[0], away_team=teams[1])
+    persist_sim_results(list(zip([early], simulate_games([early]))))
+    persist_sim_results(list(zip([late], simulate_games([late]))))
+    te = Player.objects.get(team=teams[0], position="TE")
+    PlayerGameStat.objects.filter(game=late, player=te).update(position="WR")
+    # Re-simming the earlier game (as a TE) relabels the total from the latest game's line
+    persist_sim_results(list(zip([early], simulate_games([early]))))
+
+    def positions():
+        return {row["player_id"]: row["position"] for row in player_season_stats(season)}
+
+    assert positions()[te.id] == "WR"
+    live = positions()
+    call_command("rebuild_season_stats", league=league.id, stdout=StringIO())
+    assert positions() == live
+
+
+def test_settled_tie_shows_the_overtime_field_goal_in_replayed_plays():
+    _, user = auth_client()
+    league, teams = build_league(user, team_count=2)
+    season = Season.objects.create(league=league, year=2025)
+    week = season.weeks.create(number=1, is_playoffs=True)
+    # A seed whose regulation ends tied
+    for seed in range(1000):
+        final = sim_engine.replay_plays(seed, 70.0, 70.0)[-1]
+        if final["home_score"] == final["away_score"]:
+            break
+    game = Game.objects.create(
+        week=week,
+        home_team=teams[0],
+        away_team=teams[1],
+        status="completed",
+        home_score=final["home_score"],
+        away_score=final["away_score"],
+        sim_seed=seed,
+        sim_home_power=70.0,
+        sim_away_power=70.0,
+    )
+    settle_tied_games([game])
+    game.refresh_from_db()
+    assert abs(game.home_score - game.away_score) == sim_engine.FG_POINTS
+    assert game.winner_id in (teams[0].id, teams[1].id)
+    plays = game_play_log(game)
+    assert len(plays) == sim_engine.PLAYS_PER_GAME + 1
+    assert plays[-1]["quarter"] == sim_engine.QUARTERS + 1
+    assert (plays[-1]["home_score"], plays[-1]["away_score"]) == (game.home_score, game.away_score)
+
+
+def test_run_matchups_fans_out_across_processes_in_order():
+    matchups = [
+        {
+            "game_id": idx,
+            "home_team_id": 100 + idx,
+            "away_team_id": 200 + idx,
+            "home_power": 70.0,
+            "away_power": 65.0,
+            "home_groups": {"QB": [{"id": 1000 + idx, "position": "QB"}]},
+            "away_groups": {},
+        }
+        for idx in range(12)
+    ]
+    results = run_matchups(matchups, max_workers=3, min_parallel=1)
+    assert [r["game_id"] for r in results] == list(range(12))
+    for result in results:
+        assert len(result["plays"]) == sim_engine.PLAYS_PER_GAME
+        assert len(result["team_stats"]) == 2
+        assert result["player_stats"][0]["position"] == "QB"
+
+
+def test_simulate_next_week_command_batches_leagues():
+    _, user = auth_client()
+    seasons = []
+    for _ in range(2):
+        league, teams = build_league(user, team_count=2)
+        season = Season.objects.create(league=league, year=2025)
+        for number in (1, 2):
+            week = season.weeks.create(number=number, is_playoffs=False)
+            Game.objects.create(week=week, home_team=teams[0], away_team=teams[1])
+        seasons.append(season)
+    call_command("simulate_next_week", stdout=StringIO())
+    for season in seasons:
+        assert Game.objects.get(week__season=season, week__number=1).status == "completed"
+        assert Game.objects.get(week__season=season, week__number=2).status == "scheduled"
+
+
+def test_seeded_sim_is_reproducible_per_game():
+    _, user = auth_client()
+    league, teams = build_league(user)
+    season = Season.objects.create(league=league, year=2025)
+    week = season.weeks.create(number=1, is_playoffs=False)
+    games = [
+        Game.objects.create(week=week, home_team=teams[0], away_team=teams[1]),
+        Game.objects.create(week=week, home_team=teams[2], away_team=teams[3]),
+    ]
+    first = simulate_games(games, seeds=[11, 22])
+    # Each game has its own stream, so batch composition doesn't change a game's result
+    again = simulate_games(games[1:], seeds=[22])
+    assert again[0]["plays"] == first[1]["plays"]
+    assert again[0]["team_stats"] == first[1]["team_stats"]
+    assert first[0]["seed"] == 11
+
+
+def test_detail_levels_share_scores_and_skip_writes():
+    client, user = auth_client()
+    league, teams = build_league(user, team_count=2)
+    season = Season.objects.create(league=league, year=2025)
+    week = season.weeks.create(number=1, is_playoffs=False)
+    game = Game.objects.create(week=week, home_team=teams[0], away_team=teams[1])
+    full, stats, score = (simulate_games([game], seeds=[5], detail_level=level)[0] for level in sim_engine.DETAIL_LEVELS)
+    assert full["home_score"] == stats["home_score"] == score["home_score"]
+    assert full["away_score"] == stats["away_score"] == score["away_score"]
+    assert "plays" not in stats and stats["team_stats"] == full["team_stats"]
+    assert score["team_stats"] == [] and score["player_stats"] == []
+
+    persist_sim_results([(game, full)])
+    persist_sim_results([(game, score)])
+    assert not PlayLog.objects.filter(game=game).exists()
+    assert not TeamGameStat.objects.filter(game=game).exists()
+    assert not PlayerGameStat.objects.filter(game=game).exists()
+
+    url = reverse("league:game-simulate", args=[game.id])
+    resp = client.post(url, {"detail_level": "stats"}, format="json")
+    assert resp.status_code == 200
+    assert "plays" not in resp.json() and len(resp.json()["team_stats"]) == 2
+    assert not PlayLog.objects.filter(game=game).exists()
+    assert PlayerGameStat.objects.filter(game=game).exists()
+    assert client.post(url, {"detail_level": "plays"}, format="json").status_code == 400
+
+    Game.objects.filter(pk=game.pk).update(status="scheduled")
+    resp = client.post(reverse("league:week-simulate", args=[league.id, 2025, 1]), {"detail_level": "score"}, format="json")
+    assert resp.status_code == 200
+    assert resp.json()["simulated"][0]["status"] == "completed"
+    assert not TeamGameStat.objects.filter(game=game).exists()
+
+
+def test_play_log_replayed_from_seed_when_not_stored():
+    client, user = auth_client()
+    league, teams = build_league(user, team_count=2)
+    season = Season.objects.create(league=league, year=2025)
+    week = season.weeks.create(number=1, is_playoffs=False)
+    game = Game.objects.create(week=week, home_team=teams[0], away_team=teams[1])
+    result = simulate_games([game])[0]
+    persist_sim_results([(game, result)], store_plays=False)
+    assert not PlayLog.objects.filter(game=game).exists()
+    game.refresh_from_db()
+    assert game.sim_seed == result["seed"]
+
+    resp = client.get(reverse("league:game-playlog", args=[game.id]))
+    assert resp.status_code == 200
+    plays = resp.json()
+    assert len(plays) == sim_engine.PLAYS_PER_GAME
+    assert [p["summary"] for p in plays] == [p["summary"] for p in result["plays"]]
+    assert (plays[-1]["home_score"], plays[-1]["away_score"]) == (game.home_score, game.away_score)
+
+
+def test_packed_play_codec_round_trip():
+    arrays = sim_engine.simulate_matchups([72], [68], rng=np.random.default_rng(3))
+    blob = play_codec.pack_plays(sim_engine.game_codes(arrays, 0))
+    assert play_codec.unpack_plays(blob) == sim_engine.game_plays(arrays, 0)
+    assert len(blob) < 600
+
+
+def test_packed_league_stores_one_blob_per_game():
+    client, user = auth_client()
+    league, teams = build_league(user)
+    league.play_log_format = "packed"
+    league.save(update_fields=["play_log_format"])
+    season = Season.objects.create(league=league, year=2025)
+    week = season.weeks.create(number=1, is_playoffs=False)
+    game = Game.objects.create(week=week, home_team=teams[0], away_team=teams[1])
+    Game.objects.create(week=week, home_team=teams[2], away_team=teams[3])
+
+    resp = client.post(reverse("league:week-simulate", args=[league.id, 2025, 1]), {}, format="json")
+    assert resp.status_code == 200
+    assert not PlayLog.objects.filter(game__week=week).exists()
+    assert PackedPlayLog.objects.filter(game__week=week).count() == 2
+
+    game.refresh_from_db()
+    plays = client.get(reverse("league:game-playlog", args=[game.id])).json()
+    assert len(plays) == sim_engine.PLAYS_PER_GAME
+    assert (plays[-1]["home_score"], plays[-1]["away_score"]) == (game.home_score, game.away_score)
+
+    resp = client.post(reverse("league:game-simulate", args=[game.id]), {}, format="json")
+    assert len(resp.json()["plays"]) == sim_engine.PLAYS_PER_GAME
+    assert PackedPlayLog.objects.filter(game__week=week).count() == 2
+
+
+def test_week_sim_records_sim_run_phases():
+    client, user = auth_client()
+    league, teams = build_league(user)
+    season = Season.objects.create(league=league, year=2025)
+    week = season.weeks.create(number=1, is_playoffs=False)
+    Game.objects.create(week=week, home_team=teams[0], away_team=teams[1])
+    Game.objects.create(week=week, home_team=teams[2], away_team=teams[3])
+    client.post(reverse("league:week-simulate", args=[league.id, 2025, 1]), {}, format="json")
+
+    run = SimRun.objects.get(league=league)
+    assert (run.scope, run.season_id, run.games) == ("week", season.id, 2)
+    assert run.requested_by == user
+    assert run.load_queries > 0 and run.persist_queries > 0 and run.simulate_queries == 0
+    assert run.total_queries >= run.load_queries + run.persist_queries
+    assert run.total_ms >= run.load_ms + run.simulate_ms + run.persist_ms
+    expected_rows = 2 + 2 * sim_engine.PLAYS_PER_GAME + 4 + PlayerGameStat.objects.filter(game__week=week).count()
+    assert run.rows_written == expected_rows
+
+    resp = client.get(reverse("league:sim-run-list", args=[league.id]), {"scope": "week"})
+    assert resp.status_code == 200
+    assert resp.json()[0]["persist_queries"] == run.persist_queries
+
+    owner = User.objects.create_user(email="owner@example.com", password="password123")
+    other = APIClient()
+    other.force_authenticate(owner)
+    assert other.get(reverse("league:sim-run-list", args=[league.id])).status_code == 403
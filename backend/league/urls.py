@@ -10,6 +10,7 @@ from .views import (
     PlayoffSeedingView,
     PlayoffBracketView,
     PlayoffAdvanceView,
+    PlayoffSimulateView,
     RookiePoolGenerateView,
     RookiePoolListView,
     FreeAgentListView,
@@ -22,6 +23,7 @@ from .views import (
     NotificationPreferenceView,
     AuditLogListView,
     GameUpdateView,
+    GameBulkUpdateView,
     ByeWeekListCreateView,
     ByeWeekDeleteView,
     LeagueDetailView,
@@ -50,6 +52,13 @@ from .views import (
     PlayLogListView,
     GameSimulateView,
     WeekSimulateView,
+    SeasonProjectionView,
+    JobListView,
+    JobDetailView,
+    SimRunListView,
+    TeamDepthChartView,
+    SeasonSimulateView,
+    SeasonSimulationDetailView,
     PlayerSeasonStatsView,
     PlayerLeadersView,
     TeamSeasonStatsView,
@@ -86,8 +95,18 @@ urlpatterns = [
     ),
     path("leagues/<int:league_id>/seasons/<int:year>/standings/", StandingsView.as_view(), name="standings"),
     path("leagues/<int:league_id>/seasons/<int:year>/seeds/", PlayoffSeedingView.as_view(), name="playoff-seeds"),
+    path(
+        "leagues/<int:league_id>/seasons/<int:year>/projections/",
+        SeasonProjectionView.as_view(),
+        name="season-projections",
+    ),
     path("leagues/<int:league_id>/seasons/<int:year>/bracket/", PlayoffBracketView.as_view(), name="playoff-bracket"),
     path("leagues/<int:league_id>/seasons/<int:year>/playoffs/advance/", PlayoffAdvanceView.as_view(), name="playoff-advance"),
+    path(
+        "leagues/<int:league_id>/seasons/<int:year>/playoffs/simulate/",
+        PlayoffSimulateView.as_view(),
+        name="playoff-simulate",
+    ),
     path("leagues/<int:league_id>/drafts/rookies/generate/", RookiePoolGenerateView.as_view(), name="rookie-generate"),
     path("leagues/<int:league_id>/drafts/rookies/", RookiePoolListView.as_view(), name="rookie-list"),
     path("leagues/<int:league_id>/rosters/seed/", SeedDefaultRostersView.as_view(), name="roster-seed"),
@@ -107,6 +126,16 @@ urlpatterns = [
         WeekSimulateView.as_view(),
         name="week-simulate",
     ),
+    path(
+        "leagues/<int:league_id>/seasons/<int:year>/simulate/",
+        SeasonSimulateView.as_view(),
+        name="season-simulate",
+    ),
+    path(
+        "leagues/<int:league_id>/seasons/<int:year>/simulations/<int:pk>/",
+        SeasonSimulationDetailView.as_view(),
+        name="season-simulation-detail",
+    ),
     path(
         "leagues/<int:league_id>/seasons/<int:year>/player_stats/",
         PlayerSeasonStatsView.as_view(),
@@ -125,6 +154,7 @@ urlpatterns = [
     path("players/<int:pk>/detail/", PlayerDetailView.as_view(), name="player-detail"),
     path("players/compare/", PlayerCompareView.as_view(), name="player-compare"),
     path("games/<int:pk>/update/", GameUpdateView.as_view(), name="game-update"),
+    path("leagues/<int:league_id>/games/bulk-update/", GameBulkUpdateView.as_view(), name="game-bulk-update"),
     path("leagues/<int:league_id>/seasons/<int:year>/byes/", ByeWeekListCreateView.as_view(), name="bye-list-create"),
     path("byes/<int:pk>/delete/", ByeWeekDeleteView.as_view(), name="bye-delete"),
     path("games/<int:pk>/complete/", GameCompleteView.as_view(), name="game-complete"),
@@ -150,4 +180,12 @@ urlpatterns = [
         name="team-roster-release",
     ),
     path("leagues/<int:league_id>/teams/<int:team_id>/delete/", TeamDeleteView.as_view(), name="team-delete"),
+    path(
+        "leagues/<int:league_id>/teams/<int:team_id>/depth-chart/",
+        TeamDepthChartView.as_view(),
+        name="team-depth-chart",
+    ),
+    path("leagues/<int:league_id>/jobs/", JobListView.as_view(), name="job-list"),
+    path("jobs/<int:pk>/", JobDetailView.as_view(), name="job-detail"),
+    path("leagues/<int:league_id>/sim-runs/", SimRunListView.as_view(), name="sim-run-list"),
 ]
@@ -1,8 +1,8 @@
-from typing import Any, Dict
+from typing import Any, Dict, Iterable
 
 from django.http import HttpRequest
 
-from .models import AuditLog
+from .models import AuditLog, Notification, NotificationPreference
 
 
 def log_action(*, user, action: str, entity_type: str, entity_id: str, details: Dict[str, Any] | None = None, request: HttpRequest | None = None):
@@ -17,3 +17,37 @@ def log_action(*, user, action: str, entity_type: str, entity_id: str, details:
         details=details or {},
         ip_address=ip,
     )
+
+
+def log_actions(*, user, action: str, entity_type: str, entries: Iterable[tuple], request: HttpRequest | None = None):
+    """
+    Bulk variant of log_action; entries are (entity_id, details) pairs.
+    """
+    ip = None
+    if request:
+        ip = request.META.get("REMOTE_ADDR")
+    user = user if getattr(user, "is_authenticated", False) else None
+    AuditLog.objects.bulk_create(
+        [
+            AuditLog(
+                user=user,
+                action=action,
+                entity_type=entity_type,
+                entity_id=str(entity_id),
+                details=details or {},
+                ip_address=ip,
+            )
+            for entity_id, details in entries
+        ]
+    )
+
+
+def notify_user(user, message: str, category: str = "general"):
+    """
+    Send an in-app notification if preferences allow. Email is stubbed for now.
+    """
+    pref, _ = NotificationPreference.objects.get_or_create(user=user)
+    if pref.in_app_enabled:
+        Notification.objects.create(user=user, category=category, message=message)
+    # email_enabled is a future stub; place holder for SMTP hook
+    return True
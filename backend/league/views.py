@@ -1,6 +1,4 @@
 from django.utils import timezone
-import random
-from typing import Optional
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 
@@ -25,6 +23,10 @@ from .models import (
     Division,
     Contract,
     ByeWeek,
+    SeasonSimulation,
+    Job,
+    SimRun,
+    DepthChart,
 )
 from .serializers import (
     ContractSerializer,
@@ -54,128 +56,64 @@ from .serializers import (
     PlayerGameStatSerializer,
     PlayerSeasonStatSerializer,
     InjurySerializer,
+    SeasonSimulationSerializer,
+    JobSerializer,
+    SimRunSerializer,
+    DepthChartSerializer,
 )
-from .services.schedule_generator import generate_regular_season_schedule
-from .services.standings import compute_standings
-from .services.playoffs import generate_playoff_seeds, generate_bracket, playoff_progress, advance_playoff_rounds
-from .services.simulator import simulate_game, persist_sim_result
+from .services.schedule_generator import generate_regular_season_schedule, regenerate_schedule
+from .services.standings import apply_game_changes, compute_standings, game_state
+from .services.playoffs import (
+    generate_playoff_seeds,
+    generate_bracket,
+    playoff_progress,
+    advance_playoff_rounds,
+    bracket_ready,
+    record_playoff_result,
+    unbracketed_playoff_games,
+    UNBRACKETED_PLAYOFFS_DETAIL,
+)
+from .services.sim_engine import DETAIL_LEVELS
+from .services.simulator import game_play_log, simulate_game, persist_sim_result
+from .services.season_sim import simulate_season, simulate_week
+from .services.season_pipeline import playoff_simulation_summary, simulate_playoffs
+from .services.projections import cached_projections
+from .services.sim_metrics import record_sim_run
+from .services.depth_charts import POSITIONS, get_depth_charts, mark_depth_charts_stale, set_depth_chart
+from .services.free_agency import resolve_free_agency
+from .services.game_overrides import apply_game_overrides
+from .services.jobs import enqueue
+from .services.rosters import generate_rookie_pool, seed_default_rosters
 from .services.stats import player_season_stats, player_leaders, team_season_stats
-from .utils import log_action
+from .utils import log_action, log_actions, notify_user
 from django.db import transaction
 from django.db import models
 
 
-def notify_user(user, message: str, category: str = "general"):
+def wants_async(request) -> bool:
+    value = request.query_params.get("async", request.data.get("async", ""))
+    return str(value).lower() in ("1", "true", "yes")
+
+
+def detail_level_param(request) -> str:
     """
-    Send an in-app notification if preferences allow. Email is stubbed for now.
+    The requested sim detail level; raises ValueError for unknown levels.
     """
-    pref, _ = NotificationPreference.objects.get_or_create(user=user)
-    if pref.in_app_enabled:
-        Notification.objects.create(user=user, category=category, message=message)
-    # email_enabled is a future stub; place holder for SMTP hook
-    return True
-
-
-FIRST_NAMES = [
-    "Alex",
-    "Jordan",
-    "Chris",
-    "Taylor",
-    "Casey",
-    "Sam",
-    "Devin",
-    "Riley",
-    "Quinn",
-    "Shawn",
-    "Marcus",
-    "Evan",
-    "Noah",
-    "Liam",
-    "Mason",
-    "Logan",
-    "Caleb",
-    "Isaiah",
-    "Dylan",
-    "Micah",
-]
-
-LAST_NAMES = [
-    "Johnson",
-    "Miller",
-    "Davis",
-    "Thompson",
-    "Lewis",
-    "Walker",
-    "Robinson",
-    "Young",
-    "Allen",
-    "Parker",
-    "Anderson",
-    "Bennett",
-    "Campbell",
-    "Cooper",
-    "Edwards",
-    "Foster",
-    "Griffin",
-    "Hayes",
-    "Mitchell",
-    "Reed",
-]
-
-POSITION_BANDS = {
-    "QB": (68, 90),
-    "RB": (62, 86),
-    "WR": (62, 88),
-    "TE": (58, 85),
-    "OL": (62, 85),
-    "DL": (62, 86),
-    "LB": (62, 85),
-    "CB": (62, 87),
-    "S": (62, 85),
-    "K": (60, 80),
-    "P": (60, 80),
-}
-
-ROSTER_TEMPLATE = [
-    ("QB", 3),
-    ("RB", 4),
-    ("WR", 6),
-    ("TE", 3),
-    ("OL", 9),
-    ("DL", 8),
-    ("LB", 6),
-    ("CB", 6),
-    ("S", 4),
-    ("K", 1),
-    ("P", 1),
-]
-
-
-def _random_name():
-    return random.choice(FIRST_NAMES), random.choice(LAST_NAMES)
-
-
-def _random_rating(position: str):
-    low, high = POSITION_BANDS.get(position, (60, 80))
-    return random.randint(low, high)
-
-
-def create_generated_player(league: League, position: str, is_rookie_pool: bool, team: Optional[Team] = None):
-    first, last = _random_name()
-    overall = _random_rating(position)
-    player = Player.objects.create(
-        league=league,
-        team=team,
-        first_name=first,
-        last_name=last,
-        position=position,
-        age=22 if is_rookie_pool else random.randint(22, 32),
-        overall_rating=overall,
-        potential_rating=min(95, overall + random.randint(5, 18)),
-        injury_status="healthy",
-        is_rookie_pool=is_rookie_pool,
-    )
-    return player
+    value = str(request.query_params.get("detail_level", request.data.get("detail_level", "full"))).lower()
+    if value not in DETAIL_LEVELS:
+        raise ValueError(f"detail_level must be one of {', '.join(DETAIL_LEVELS)}.")
+    return value
+
+
+def visible_jobs(user):
+    """Jobs the user requested or that belong to leagues they run; staff see every job."""
+    if user.is_staff or user.is_superuser:
+        return Job.objects.all()
+    return Job.objects.filter(models.Q(requested_by=user) | models.Q(league__created_by=user))
+
+
+def job_accepted(job: Job) -> Response:
+    return Response(JobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
 
 
 class LeagueListCreateView(generics.ListCreateAPIView):
@@ -496,8 +434,16 @@ class SeasonGenerateView(generics.GenericAPIView):
         year = request.data.get("year")
         if year is None:
             return Response({"detail": "year is required"}, status=status.HTTP_400_BAD_REQUEST)
+        # "incremental" keeps played games and only writes the changed scheduled ones
+        mode = str(request.data.get("mode", "full")).lower()
+        if mode not in ("full", "incremental"):
+            return Response({"detail": "mode must be full or incremental."}, status=status.HTTP_400_BAD_REQUEST)
+        diff = None
         try:
-            season = generate_regular_season_schedule(league, int(year))
+            if mode == "incremental":
+                season, diff = regenerate_schedule(league, int(year))
+            else:
+                season = generate_regular_season_schedule(league, int(year))
         except ValueError as exc:
             return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -506,10 +452,14 @@ class SeasonGenerateView(generics.GenericAPIView):
             action="league.schedule.generate",
             entity_type="season",
             entity_id=season.id,
-            details={"league_id": league.id, "year": year},
+            details={"league_id": league.id, "year": year, "mode": mode, "diff": diff},
             request=request,
         )
-        return Response({"season_id": season.id, "year": season.year}, status=status.HTTP_201_CREATED)
+        data = {"season_id": season.id, "year": season.year}
+        if diff is not None:
+            data["diff"] = diff
+            return Response(data)
+        return Response(data, status=status.HTTP_201_CREATED)
 
 
 class SeasonScheduleView(generics.RetrieveAPIView):
@@ -774,13 +724,9 @@ class RookiePoolGenerateView(generics.GenericAPIView):
 
     def post(self, request, league_id):
         league = generics.get_object_or_404(League, pk=league_id)
-        created = []
-        # Two copies of the roster template to make ~50-60 rookies
-        for _ in range(2):
-            for pos, count in ROSTER_TEMPLATE:
-                for _ in range(count):
-                    player = create_generated_player(league, pos, is_rookie_pool=True)
-                    created.append(player.id)
+        if wants_async(request):
+            return job_accepted(enqueue("rookies.generate", {"league_id": league.id}, league=league, user=request.user))
+        created = generate_rookie_pool(league)
         return Response({"created": created}, status=status.HTTP_201_CREATED)
 
 
@@ -799,25 +745,9 @@ class SeedDefaultRostersView(generics.GenericAPIView):
 
     def post(self, request, league_id):
         league = generics.get_object_or_404(League, pk=league_id)
-        created = []
-        for team in league.teams.all():
-            active_count = team.players.filter(on_ir=False).count()
-            if active_count >= league.roster_size_limit:
-                continue
-            for pos, count in ROSTER_TEMPLATE:
-                current_at_pos = team.players.filter(position=pos).count()
-                needed = max(0, count - current_at_pos)
-                for _ in range(needed):
-                    player = create_generated_player(league, pos, is_rookie_pool=False, team=team)
-                    Contract.objects.create(
-                        player=player,
-                        team=team,
-                        salary=max(500000, player.overall_rating * 20000),
-                        bonus=0,
-                        years=1,
-                        start_year=timezone.now().year,
-                    )
-                    created.append(player.id)
+        if wants_async(request):
+            return job_accepted(enqueue("rosters.seed", {"league_id": league.id}, league=league, user=request.user))
+        created = seed_default_rosters(league)
         return Response({"created": created}, status=status.HTTP_201_CREATED)
 
 
@@ -911,6 +841,24 @@ class StandingsView(generics.GenericAPIView):
         return Response(serializer.data)
 
 
+class SeasonProjectionView(generics.GenericAPIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, league_id, year):
+        season = generics.get_object_or_404(Season, league_id=league_id, year=year)
+        iterations = request.query_params.get("iterations")
+        if iterations is not None:
+            try:
+                iterations = int(iterations)
+            except (TypeError, ValueError):
+                return Response({"detail": "iterations must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+            if not 1 <= iterations <= 100000:
+                return Response(
+                    {"detail": "iterations must be between 1 and 100000."}, status=status.HTTP_400_BAD_REQUEST
+                )
+        return Response(cached_projections(season, iterations=iterations))
+
+
 class GameCompleteView(generics.UpdateAPIView):
     serializer_class = GameSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -922,6 +870,7 @@ class GameCompleteView(generics.UpdateAPIView):
         away_score = request.data.get("away_score")
         if home_score is None or away_score is None:
             return Response({"detail": "Scores required."}, status=status.HTTP_400_BAD_REQUEST)
+        before = game_state(game, game.week.season_id, game.week.is_playoffs)
         game.home_score = int(home_score)
         game.away_score = int(away_score)
         if game.home_score > game.away_score:
@@ -934,7 +883,9 @@ class GameCompleteView(generics.UpdateAPIView):
             game.winner = None
             game.loser = None
         game.status = "completed"
-        game.save(update_fields=["home_score", "away_score", "winner", "loser", "status"])
+        with transaction.atomic():
+            game.save(update_fields=["home_score", "away_score", "winner", "loser", "status"])
+            apply_game_changes([(before, game_state(game, game.week.season_id, game.week.is_playoffs))])
 
         log_action(
             user=request.user,
@@ -944,9 +895,9 @@ class GameCompleteView(generics.UpdateAPIView):
             details={"week_id": game.week_id, "home": game.home_score, "away": game.away_score},
             request=request,
         )
-        # Auto-advance playoff rounds by creating the next slate when playoff games finish
+        # Advance the stored bracket, creating the next slate when a round finishes
         if game.week.is_playoffs:
-            advance_playoff_rounds(game.week.season, seeds=7)
+            record_playoff_result(game)
         return Response(self.get_serializer(game).data)
 
 
@@ -975,7 +926,10 @@ class GameUpdateView(generics.UpdateAPIView):
         week = serializer.validated_data.get("week", game.week)
         if home.league_id != league.id or away.league_id != league.id or week.season.league_id != league.id:
             return Response({"detail": "Teams and week must belong to this league."}, status=status.HTTP_400_BAD_REQUEST)
-        serializer.save()
+        before = game_state(game, season.id, game.week.is_playoffs)
+        with transaction.atomic():
+            serializer.save()
+            apply_game_changes([(before, game_state(game, week.season_id, week.is_playoffs))])
         log_action(
             user=user,
             action="league.update",
@@ -987,6 +941,39 @@ class GameUpdateView(generics.UpdateAPIView):
         return Response(GameSerializer(game).data)
 
 
+class GameBulkUpdateView(generics.GenericAPIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, league_id):
+        league = generics.get_object_or_404(League, pk=league_id)
+        user = request.user
+        if not (
+            getattr(user, "is_commissioner", False)
+            or user.is_staff
+            or user.is_superuser
+            or league.created_by_id == user.id
+        ):
+            return Response({"detail": "Not authorized to edit games."}, status=status.HTTP_403_FORBIDDEN)
+        games, errors = apply_game_overrides(league, request.data.get("games"))
+        if errors:
+            return Response({"detail": "No games were updated.", "errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+        log_action(
+            user=user,
+            action="game.bulk_update",
+            entity_type="league",
+            entity_id=league.id,
+            details={
+                "games": [
+                    {"id": game.id, "week_id": game.week_id, "home": game.home_team_id, "away": game.away_team_id}
+                    for game in games
+                ]
+            },
+            request=request,
+        )
+        games = Game.objects.filter(id__in=[game.id for game in games]).select_related("home_team", "away_team")
+        return Response({"updated": GameSerializer(games, many=True).data})
+
+
 class PlayoffSeedingView(generics.GenericAPIView):
     serializer_class = PlayoffSeedSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -1007,7 +994,7 @@ class PlayoffBracketView(generics.GenericAPIView):
 
     def get(self, request, league_id, year):
         season = generics.get_object_or_404(Season, league_id=league_id, year=year)
-        data = playoff_progress(season, seeds=7)
+        data = playoff_progress(season)
         return Response(data)
 
 
@@ -1025,10 +1012,58 @@ class PlayoffAdvanceView(generics.GenericAPIView):
             or league.created_by_id == user.id
         ):
             return Response({"detail": "Not authorized."}, status=status.HTTP_403_FORBIDDEN)
-        created = advance_playoff_rounds(season, seeds=7)
+        try:
+            created = advance_playoff_rounds(season)
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_409_CONFLICT)
         return Response({"created_game_ids": created})
 
 
+class PlayoffSimulateView(generics.GenericAPIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, league_id, year):
+        season = generics.get_object_or_404(Season.objects.select_related("league"), league_id=league_id, year=year)
+        league = season.league
+        user = request.user
+        if not (
+            getattr(user, "is_commissioner", False)
+            or user.is_staff
+            or user.is_superuser
+            or league.created_by_id == user.id
+        ):
+            return Response({"detail": "Not authorized to simulate this season."}, status=status.HTTP_403_FORBIDDEN)
+        try:
+            detail_level = detail_level_param(request)
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        store_plays = str(request.data.get("store_plays", "")).lower() in ("1", "true", "yes")
+        if not bracket_ready(season):
+            return Response({"detail": "The regular season isn't finished yet."}, status=status.HTTP_400_BAD_REQUEST)
+        if unbracketed_playoff_games(season):
+            return Response({"detail": UNBRACKETED_PLAYOFFS_DETAIL}, status=status.HTTP_409_CONFLICT)
+        if wants_async(request):
+            job = enqueue(
+                "playoffs.simulate",
+                {"season_id": season.id, "store_plays": store_plays, "detail_level": detail_level},
+                league=league,
+                user=user,
+            )
+            return job_accepted(job)
+        games = simulate_playoffs(season, store_plays=store_plays, detail_level=detail_level, user=user)
+        log_actions(
+            user=user,
+            action="game.simulate",
+            entity_type="game",
+            entries=[
+                (game.id, {"home": game.home_team_id, "away": game.away_team_id, "week": game.week.number})
+                for game in games
+            ],
+            request=request,
+        )
+        return Response(playoff_simulation_summary(season, games))
+
+
 class FreeAgentListView(generics.ListAPIView):
     serializer_class = PlayerSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -1111,61 +1146,9 @@ class FreeAgencyResolveView(generics.GenericAPIView):
 
     def post(self, request, league_id):
         league = generics.get_object_or_404(League, pk=league_id)
-        now = timezone.now()
-        pending = FreeAgencyBid.objects.filter(league=league, status="pending").select_related("player", "team")
-        # filter out expired auctions
-        if league.free_agency_mode == "auction":
-            pending = pending.filter(models.Q(expires_at__lte=now) | models.Q(expires_at__isnull=True))
-        awarded = []
-        for player_id in pending.values_list("player_id", flat=True).distinct():
-            if league.free_agency_mode == "rounds":
-                bids = pending.filter(player_id=player_id).order_by("round_number", "created_at")
-            else:
-                bids = pending.filter(player_id=player_id).order_by("-amount", "created_at")
-            if not bids:
-                continue
-            bid = bids.first()
-            team = bid.team
-            # cap/roster re-check
-            roster_count = team.players.filter(on_ir=False).count()
-            if roster_count >= league.roster_size_limit:
-                continue
-            current_cap = sum(c.cap_hit for c in team.contracts.all())
-            if current_cap + float(bid.amount) > float(league.salary_cap):
-                continue
-            # award
-            with transaction.atomic():
-                bid.status = "awarded"
-                bid.awarded_at = timezone.now()
-                bid.save(update_fields=["status", "awarded_at"])
-                # reject other bids on this player
-                pending.filter(player_id=player_id, status="pending").exclude(id=bid.id).update(status="rejected")
-                player = bid.player
-                player.team = team
-                player.save(update_fields=["team"])
-                Contract.objects.create(
-                    player=player,
-                    team=team,
-                    salary=bid.amount,
-                    bonus=0,
-                    years=1,
-                    start_year=timezone.now().year,
-                )
-            awarded.append(bid.id)
-            log_action(
-                user=request.user,
-                action="fa.award",
-                entity_type="fa_bid",
-                entity_id=bid.id,
-                details={"league_id": league.id, "player_id": player.id, "team_id": team.id, "amount": bid.amount},
-                request=request,
-            )
-            if team.owner_id:
-                notify_user(
-                    user=team.owner,
-                    category="free_agency",
-                    message=f"Free agent {player} awarded to {team.abbreviation} for ${bid.amount}",
-                )
+        if wants_async(request):
+            return job_accepted(enqueue("fa.resolve", {"league_id": league.id}, league=league, user=request.user))
+        awarded = resolve_free_agency(league, user=request.user, request=request)
         return Response({"awarded": awarded}, status=status.HTTP_200_OK)
 
 
@@ -1274,8 +1257,11 @@ class PlayLogListView(generics.ListAPIView):
 
     def get_queryset(self):
         game_id = self.kwargs.get("pk")
-        game = generics.get_object_or_404(Game, pk=game_id)
-        return game.plays.all()
+        return generics.get_object_or_404(Game, pk=game_id)
+
+    def list(self, request, *args, **kwargs):
+        plays = game_play_log(self.get_queryset())
+        return Response(self.get_serializer(plays, many=True).data)
 
 
 class GameSimulateView(generics.GenericAPIView):
@@ -1292,55 +1278,138 @@ class GameSimulateView(generics.GenericAPIView):
             or league.created_by_id == user.id
         ):
             return Response({"detail": "Not authorized to simulate this game."}, status=status.HTTP_403_FORBIDDEN)
-        result = simulate_game(game)
-        persist_sim_result(game, result)
+        try:
+            detail_level = detail_level_param(request)
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        with record_sim_run("game", league_id=league.id, season_id=game.week.season_id, user=user):
+            persist_sim_result(game, simulate_game(game, detail_level=detail_level))
         log_action(
             user=user,
             action="game.simulate",
             entity_type="game",
             entity_id=game.id,
-            details={"home": game.home_team_id, "away": game.away_team_id},
+            details={"home": game.home_team_id, "away": game.away_team_id, "detail_level": detail_level},
             request=request,
         )
-        return Response(
+        data = {
+            "game_id": game.id,
+            "home_score": game.home_score,
+            "away_score": game.away_score,
+            "status": game.status,
+            "detail_level": detail_level,
+        }
+        if detail_level == "full":
+            data["plays"] = PlayLogSerializer(game_play_log(game), many=True).data
+        if detail_level != "score":
+            data["team_stats"] = TeamGameStatSerializer(game.team_stats.all(), many=True).data
+        return Response(data)
+
+
+class WeekSimulateView(generics.GenericAPIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, league_id, year, week_number):
+        season = generics.get_object_or_404(Season, league_id=league_id, year=year)
+        try:
+            detail_level = detail_level_param(request)
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        if wants_async(request):
+            job = enqueue(
+                "week.simulate",
+                {"season_id": season.id, "week_number": week_number, "detail_level": detail_level},
+                league=season.league,
+                user=request.user,
+            )
+            return job_accepted(job)
+        week = season.weeks.filter(number=week_number, is_playoffs=False).first()
+        games = simulate_week(week, user=request.user, detail_level=detail_level) if week else []
+        log_actions(
+            user=request.user,
+            action="game.simulate",
+            entity_type="game",
+            entries=[
+                (game.id, {"home": game.home_team_id, "away": game.away_team_id, "week": week_number})
+                for game in games
+            ],
+            request=request,
+        )
+        results = [
             {
                 "game_id": game.id,
                 "home_score": game.home_score,
                 "away_score": game.away_score,
                 "status": game.status,
-                "plays": PlayLogSerializer(game.plays.all(), many=True).data,
-                "team_stats": TeamGameStatSerializer(game.team_stats.all(), many=True).data,
             }
-        )
+            for game in games
+        ]
+        return Response({"simulated": results})
 
 
-class WeekSimulateView(generics.GenericAPIView):
+class SeasonSimulateView(generics.ListAPIView):
+    serializer_class = SeasonSimulationSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def post(self, request, league_id, year, week_number):
-        season = generics.get_object_or_404(Season, league_id=league_id, year=year)
-        games = Game.objects.filter(week__season=season, week__number=week_number, week__is_playoffs=False)
-        results = []
-        for game in games:
-            res = simulate_game(game)
-            persist_sim_result(game, res)
-            log_action(
-                user=request.user,
-                action="game.simulate",
-                entity_type="game",
-                entity_id=game.id,
-                details={"home": game.home_team_id, "away": game.away_team_id, "week": week_number},
-                request=request,
-            )
-            results.append(
-                {
-                    "game_id": game.id,
-                    "home_score": game.home_score,
-                    "away_score": game.away_score,
-                    "status": game.status,
-                }
+    def get_queryset(self):
+        season = generics.get_object_or_404(Season, league_id=self.kwargs.get("league_id"), year=self.kwargs.get("year"))
+        return SeasonSimulation.objects.filter(season=season)
+
+    def post(self, request, league_id, year):
+        season = generics.get_object_or_404(Season.objects.select_related("league"), league_id=league_id, year=year)
+        league = season.league
+        user = request.user
+        if not (
+            getattr(user, "is_commissioner", False)
+            or user.is_staff
+            or user.is_superuser
+            or league.created_by_id == user.id
+        ):
+            return Response({"detail": "Not authorized to simulate this season."}, status=status.HTTP_403_FORBIDDEN)
+        through_week = request.data.get("through_week")
+        if through_week is not None:
+            try:
+                through_week = int(through_week)
+            except (TypeError, ValueError):
+                return Response({"detail": "through_week must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+        # Play-by-play is replayed from each game's seed unless explicitly stored
+        store_plays = str(request.data.get("store_plays", "")).lower() in ("1", "true", "yes")
+        if wants_async(request):
+            job = enqueue(
+                "season.simulate",
+                {"season_id": season.id, "through_week": through_week, "store_plays": store_plays},
+                league=league,
+                user=user,
             )
-        return Response({"simulated": results})
+            return job_accepted(job)
+        progress = simulate_season(season, through_week=through_week, user=user, store_plays=store_plays)
+        log_action(
+            user=user,
+            action="season.simulate",
+            entity_type="season",
+            entity_id=season.id,
+            details={
+                "league_id": league.id,
+                "year": season.year,
+                "through_week": through_week,
+                "weeks": progress.weeks_done,
+                "games": progress.games_done,
+                "status": progress.status,
+            },
+            request=request,
+        )
+        code = status.HTTP_200_OK if progress.status == "completed" else status.HTTP_500_INTERNAL_SERVER_ERROR
+        return Response(self.get_serializer(progress).data, status=code)
+
+
+class SeasonSimulationDetailView(generics.RetrieveAPIView):
+    serializer_class = SeasonSimulationSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return SeasonSimulation.objects.filter(
+            season__league_id=self.kwargs.get("league_id"), season__year=self.kwargs.get("year")
+        )
 
 
 class PlayerSeasonStatsView(generics.GenericAPIView):
@@ -1452,6 +1521,7 @@ class GameCompleteView(generics.UpdateAPIView):
         away_score = request.data.get("away_score")
         if home_score is None or away_score is None:
             return Response({"detail": "Scores required."}, status=status.HTTP_400_BAD_REQUEST)
+        before = game_state(game, game.week.season_id, game.week.is_playoffs)
         game.home_score = int(home_score)
         game.away_score = int(away_score)
         if game.home_score > game.away_score:
@@ -1464,7 +1534,9 @@ class GameCompleteView(generics.UpdateAPIView):
             game.winner = None
             game.loser = None
         game.status = "completed"
-        game.save(update_fields=["home_score", "away_score", "winner", "loser", "status"])
+        with transaction.atomic():
+            game.save(update_fields=["home_score", "away_score", "winner", "loser", "status"])
+            apply_game_changes([(before, game_state(game, game.week.season_id, game.week.is_playoffs))])
 
         log_action(
             user=request.user,
@@ -1474,6 +1546,9 @@ class GameCompleteView(generics.UpdateAPIView):
             details={"week_id": game.week_id, "home": game.home_score, "away": game.away_score},
             request=request,
         )
+        # Advance the stored bracket, creating the next slate when a round finishes
+        if game.week.is_playoffs:
+            record_playoff_result(game)
         return Response(self.get_serializer(game).data)
 
 
@@ -1509,3 +1584,97 @@ class ContractUpdateView(generics.UpdateAPIView):
             request=request,
         )
         return Response(self.get_serializer(contract).data)
+
+
+class JobListView(generics.ListAPIView):
+    serializer_class = JobSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        league = generics.get_object_or_404(League, pk=self.kwargs.get("league_id"))
+        return visible_jobs(self.request.user).filter(league=league)
+
+
+class JobDetailView(generics.RetrieveAPIView):
+    serializer_class = JobSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return visible_jobs(self.request.user)
+
+
+class SimRunListView(generics.ListAPIView):
+    serializer_class = SimRunSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        runs = SimRun.objects.filter(league_id=self.kwargs.get("league_id")).select_related("season")
+        scope = self.request.query_params.get("scope")
+        if scope:
+            runs = runs.filter(scope=scope)
+        return runs
+
+    def list(self, request, *args, **kwargs):
+        league = generics.get_object_or_404(League, pk=kwargs.get("league_id"))
+        user = request.user
+        if not (
+            getattr(user, "is_commissioner", False)
+            or user.is_staff
+            or user.is_superuser
+            or league.created_by_id == user.id
+        ):
+            return Response({"detail": "Not authorized to view sim runs."}, status=status.HTTP_403_FORBIDDEN)
+        return super().list(request, *args, **kwargs)
+
+
+class TeamDepthChartView(generics.GenericAPIView):
+    serializer_class = DepthChartSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def _get_team(self):
+        league = generics.get_object_or_404(League, pk=self.kwargs.get("league_id"))
+        return generics.get_object_or_404(league.teams, pk=self.kwargs.get("team_id"))
+
+    def get(self, request, league_id, team_id):
+        team = self._get_team()
+        get_depth_charts([team.id])
+        charts = DepthChart.objects.filter(team=team)
+        return Response(self.get_serializer(charts, many=True).data)
+
+    def put(self, request, league_id, team_id):
+        team = self._get_team()
+        user = request.user
+        if not (
+            getattr(user, "is_commissioner", False)
+            or user.is_staff
+            or user.is_superuser
+            or team.league.created_by_id == user.id
+            or team.owner_id == user.id
+        ):
+            return Response({"detail": "Not authorized to edit this depth chart."}, status=status.HTTP_403_FORBIDDEN)
+        position = request.data.get("position")
+        if position not in POSITIONS:
+            return Response({"detail": "Valid position required."}, status=status.HTTP_400_BAD_REQUEST)
+        if request.data.get("reset"):
+            # Back to the generated order
+            DepthChart.objects.filter(team=team, position=position).update(is_custom=False)
+            mark_depth_charts_stale([(team.id, position)])
+            get_depth_charts([team.id], [position])
+            chart = DepthChart.objects.get(team=team, position=position)
+        else:
+            player_ids = request.data.get("player_ids")
+            if not isinstance(player_ids, list):
+                return Response({"detail": "player_ids must be a list."}, status=status.HTTP_400_BAD_REQUEST)
+            try:
+                chart = set_depth_chart(team, position, [int(pid) for pid in player_ids])
+            except (TypeError, ValueError) as exc:
+                return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        log_action(
+            user=user,
+            action="depth_chart.update",
+            entity_type="team",
+            entity_id=team.id,
+            details={"position": position, "player_ids": chart.player_ids, "custom": chart.is_custom},
+            request=request,
+        )
+        return Response(self.get_serializer(chart).data)